@@ -3,14 +3,25 @@ Configuration loader and validator.
 Loads settings from .env file and validates required values.
 """
 
+import importlib.util
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
 
 
+# Supported report output formats
+REPORT_FORMATS = ("xlsx", "parquet", "csv")
+
+# Supported report modes
+REPORT_MODES = ("run", "incremental")
+
+# Claude fallback modes: background requests per email, or one Message Batch per run
+CLAUDE_MODES = ("realtime", "batch")
+
+
 class ConfigError(Exception):
     """Configuration error."""
     pass
@@ -47,6 +58,41 @@ class Config:
     # Logging
     log_level: str
 
+    # Report outputs: always "xlsx", optionally "parquet" and "csv" copies
+    report_formats: list[str] = field(default_factory=lambda: ["xlsx"])
+
+    # "run": one report per run; "incremental": one rolling report per period
+    # rebuilt from the local case store
+    report_mode: str = "run"
+    case_store_path: str = ""
+
+    # Claude response cache (TTL 0 disables it)
+    claude_cache_path: str = ""
+    claude_cache_ttl_hours: float = 720.0
+    claude_cache_max_entries: int = 5000
+
+    # Claude fallback executor
+    claude_max_concurrency: int = 4
+    claude_deadline_seconds: float = 60.0
+    claude_failure_threshold: int = 3  # Consecutive failures that disable the fallback for the run
+    claude_mode: str = "realtime"
+    claude_batch_poll_seconds: float = 30.0
+    claude_batch_timeout_seconds: float = 3600.0
+    anthropic_base_url: Optional[str] = None  # API gateway or local stand-in server
+
+    # Estimated tokens of source text per Claude prompt; longer texts keep only
+    # their most relevant lines (0 disables trimming)
+    claude_input_token_budget: int = 4000
+
+    # Directory for the JSON timing profile of each run (None: not written)
+    timing_profile_dir: Optional[str] = None
+
+    # Directory for the JSON-lines event log of each run (written during the run)
+    event_log_dir: str = ""
+
+    # Prometheus textfile (.prom) updated at the end of each run (None: disabled)
+    metrics_textfile: Optional[str] = None
+
 
 def load_config() -> Config:
     """
@@ -105,6 +151,91 @@ def load_config() -> Config:
     ocr_langs_str = os.getenv("OCR_LANGUAGES", "eng,slv").strip()
     config_dict["ocr_languages"] = [lang.strip() for lang in ocr_langs_str.split(",") if lang.strip()]
 
+    # Report formats (comma-separated; the Excel report is always written)
+    formats_str = os.getenv("REPORT_FORMATS", "xlsx").strip().lower()
+    report_formats = ["xlsx"]
+    for output_format in (f.strip() for f in formats_str.split(",")):
+        if not output_format or output_format in report_formats:
+            continue
+        if output_format not in REPORT_FORMATS:
+            raise ConfigError(
+                f"Invalid REPORT_FORMATS entry: {output_format}. "
+                f"Expected any of: {', '.join(REPORT_FORMATS)}"
+            )
+        if output_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            raise ConfigError("REPORT_FORMATS includes parquet, but pyarrow is not installed")
+        report_formats.append(output_format)
+    config_dict["report_formats"] = report_formats
+
+    # Report mode and local case store
+    report_mode = os.getenv("REPORT_MODE", "run").strip().lower()
+    if report_mode not in REPORT_MODES:
+        raise ConfigError(
+            f"Invalid REPORT_MODE: {report_mode}. Expected any of: {', '.join(REPORT_MODES)}"
+        )
+    config_dict["report_mode"] = report_mode
+    config_dict["case_store_path"] = (
+        os.getenv("CASE_STORE_PATH", "").strip()
+        or str(project_root / "data" / "case_store.sqlite3")
+    )
+
+    # Claude response cache
+    config_dict["claude_cache_path"] = (
+        os.getenv("CLAUDE_CACHE_PATH", "").strip()
+        or str(project_root / "data" / "claude_cache.sqlite3")
+    )
+    try:
+        config_dict["claude_cache_ttl_hours"] = float(os.getenv("CLAUDE_CACHE_TTL_HOURS", "720").strip())
+        config_dict["claude_cache_max_entries"] = int(os.getenv("CLAUDE_CACHE_MAX_ENTRIES", "5000").strip())
+    except ValueError as e:
+        raise ConfigError(f"Invalid Claude cache setting: {e}") from e
+    if config_dict["claude_cache_ttl_hours"] < 0 or config_dict["claude_cache_max_entries"] < 1:
+        raise ConfigError("CLAUDE_CACHE_TTL_HOURS must be >= 0 and CLAUDE_CACHE_MAX_ENTRIES >= 1")
+
+    # Claude fallback executor
+    try:
+        config_dict["claude_max_concurrency"] = int(os.getenv("CLAUDE_MAX_CONCURRENCY", "4").strip())
+        config_dict["claude_deadline_seconds"] = float(os.getenv("CLAUDE_DEADLINE_SECONDS", "60").strip())
+        config_dict["claude_failure_threshold"] = int(os.getenv("CLAUDE_FAILURE_THRESHOLD", "3").strip())
+        config_dict["claude_batch_poll_seconds"] = float(os.getenv("CLAUDE_BATCH_POLL_SECONDS", "30").strip())
+        config_dict["claude_batch_timeout_seconds"] = float(os.getenv("CLAUDE_BATCH_TIMEOUT_SECONDS", "3600").strip())
+    except ValueError as e:
+        raise ConfigError(f"Invalid Claude fallback setting: {e}") from e
+    if (
+        config_dict["claude_max_concurrency"] < 1
+        or config_dict["claude_deadline_seconds"] <= 0
+        or config_dict["claude_failure_threshold"] < 1
+    ):
+        raise ConfigError(
+            "CLAUDE_MAX_CONCURRENCY and CLAUDE_FAILURE_THRESHOLD must be >= 1, "
+            "CLAUDE_DEADLINE_SECONDS must be > 0"
+        )
+
+    claude_mode = os.getenv("CLAUDE_MODE", "realtime").strip().lower()
+    if claude_mode not in CLAUDE_MODES:
+        raise ConfigError(
+            f"Invalid CLAUDE_MODE: {claude_mode}. Expected any of: {', '.join(CLAUDE_MODES)}"
+        )
+    config_dict["claude_mode"] = claude_mode
+    config_dict["anthropic_base_url"] = os.getenv("ANTHROPIC_BASE_URL", "").strip() or None
+
+    try:
+        config_dict["claude_input_token_budget"] = int(os.getenv("CLAUDE_INPUT_TOKEN_BUDGET", "4000").strip())
+    except ValueError as e:
+        raise ConfigError(f"Invalid CLAUDE_INPUT_TOKEN_BUDGET: {e}") from e
+    if config_dict["claude_input_token_budget"] < 0:
+        raise ConfigError("CLAUDE_INPUT_TOKEN_BUDGET must be >= 0")
+
+    config_dict["timing_profile_dir"] = os.getenv("TIMING_PROFILE_DIR", "").strip() or None
+    config_dict["event_log_dir"] = (
+        os.getenv("EVENT_LOG_DIR", "").strip()
+        or str(project_root / "data" / "run_logs")
+    )
+    metrics_textfile = os.getenv("METRICS_TEXTFILE", "").strip() or None
+    if metrics_textfile and not metrics_textfile.endswith(".prom"):
+        raise ConfigError(f"METRICS_TEXTFILE must end with .prom (textfile collector): {metrics_textfile}")
+    config_dict["metrics_textfile"] = metrics_textfile
+
     # Validate paths
     tesseract_path = Path(config_dict["tesseract_path"])
     if not tesseract_path.exists():
@@ -0,0 +1,116 @@
+"""
+Email body reduction — extract only the content that is new to a message.
+
+Order of preference:
+1. Graph uniqueBody (no quoted history by definition), minus the signature
+2. Full body with quoted history and signature detected and removed
+3. Full body, if the reduced content has no EAN candidates but the full body
+   does (forwarded supplier lists live entirely in the quoted part)
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.core.models import EmailItem
+from src.utils.html import parse_html_body
+from src.utils.quoting import strip_quoted_text
+from src.utils.text import EAN_PATTERN
+
+
+@dataclass
+class ReducedBody:
+    """Body content selected for extraction."""
+    text: str  # Plain text (HTML bodies: visible text)
+    tables: list[list[list[str]]] = field(default_factory=list)  # HTML tables (rows of cells)
+    source: str = "full"  # "unique", "trimmed" or "full"
+    original_length: int = 0  # Characters of the full body text (quoted history included)
+
+    @property
+    def reduced_length(self) -> int:
+        """Characters of text passed on to extraction."""
+        return len(self.text)
+
+
+def _parse_body(
+    body_html: Optional[str],
+    body_text: Optional[str],
+    trim: bool,
+) -> tuple[str, list[list[list[str]]], bool, int]:
+    """
+    Turn a body into (text, tables, trimmed, full text length).
+
+    Plain text is preferred for text extraction when both forms exist;
+    tables always come from the HTML form. The full text length counts the
+    text before quoted history is removed.
+    """
+    tables: list[list[list[str]]] = []
+    trimmed = False
+    text = body_text or ""
+    full_length = len(text)
+
+    if body_html:
+        html_body = parse_html_body(body_html, skip_quoted=trim)
+        tables = html_body.tables
+        trimmed = html_body.quoted_skipped
+        if not body_text:
+            text = html_body.text
+            full_length = html_body.full_text_length
+
+    if trim:
+        text, text_trimmed = strip_quoted_text(text)
+        trimmed = trimmed or text_trimmed
+
+    return text, tables, trimmed, full_length
+
+
+def _has_ean_candidates(text: str, tables: list[list[list[str]]]) -> bool:
+    """Check whether text or table cells contain EAN-shaped numbers."""
+    if EAN_PATTERN.search(text):
+        return True
+    return any(EAN_PATTERN.search(cell) for table in tables for row in table for cell in row)
+
+
+def reduce_email_body(email: EmailItem) -> Optional[ReducedBody]:
+    """
+    Select the part of an email body that should be extracted.
+
+    Args:
+        email: Email item.
+
+    Returns:
+        ReducedBody, or None if the email has no body.
+    """
+    if not (email.body_text or email.body_html):
+        return None
+
+    full = None  # Untrimmed parse of the body, when one was needed anyway
+    if email.unique_body_html or email.unique_body_text:
+        source = "unique"
+        text, tables, _, _ = _parse_body(email.unique_body_html, email.unique_body_text, trim=True)
+        reduced = True
+        if email.body_text:
+            full_length = len(email.body_text)
+        else:
+            # The full HTML is parsed for its length; the fallback below reuses it
+            full = _parse_body(email.body_html, None, trim=False)
+            full_length = full[3]
+    else:
+        source = "trimmed"
+        text, tables, reduced, full_length = _parse_body(email.body_html, email.body_text, trim=True)
+
+    if reduced and not _has_ean_candidates(text, tables):
+        full_text, full_tables, _, _ = full or _parse_body(email.body_html, email.body_text, trim=False)
+        if _has_ean_candidates(full_text, full_tables):
+            return ReducedBody(
+                text=full_text,
+                tables=full_tables,
+                source="full",
+                original_length=len(full_text),
+            )
+
+    return ReducedBody(
+        text=text,
+        tables=tables,
+        source=source if reduced else "full",
+        original_length=full_length,
+    )
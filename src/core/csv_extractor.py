@@ -0,0 +1,151 @@
+"""
+Structured CSV/TSV extraction — row-level EAN↔price↔store associations.
+
+The header row is located with the shared header matcher on the first rows;
+data rows are then parsed by pandas in fixed-size chunks, so memory stays
+bounded and EAN/price cleanup runs vectorized per chunk.
+"""
+
+import csv
+import io
+from itertools import islice
+from typing import Optional
+
+import pandas as pd
+
+from src.core.excel_structured_extractor import HEADER_SCAN_ROWS, apply_metadata_rows
+from src.core.header_matcher import HEADER_MATCHER
+from src.core.models import DataSource, ExtractedData
+from src.integrations.excel.readers import sniff_csv_format
+from src.utils.blob import Blob, BlobLike, as_blob
+from src.utils.text import validate_ean_batch
+
+
+# Data rows parsed per pandas chunk
+CSV_CHUNK_ROWS = 50_000
+
+
+def _clean_ean_series(values: pd.Series) -> pd.Series:
+    """Vectorized counterpart of _ean_candidate_from_cell for text columns."""
+    return (
+        values.str.strip()
+        .str.replace(r'^(?:ean|code|koda)\s*:?\s*', '', regex=True, case=False)
+        .str.replace(r'[^\d]', '', regex=True)
+    )
+
+
+def _parse_price_series(values: pd.Series) -> pd.Series:
+    """Vectorized counterpart of _extract_price_from_cell; NaN where no positive price."""
+    text = (
+        values.str.replace(r'[€$£\s]', '', regex=True)
+        .str.replace('EUR', '', regex=False)
+        .str.replace('USD', '', regex=False)
+    )
+
+    # 1.234,56 → 1234.56; 10,50 → 10.50
+    both = text.str.contains(',', regex=False) & text.str.contains('.', regex=False)
+    text = text.where(~both, text.str.replace('.', '', regex=False))
+    text = text.str.replace(',', '.', regex=False)
+
+    prices = pd.to_numeric(text, errors="coerce")
+    return prices.where(prices > 0)
+
+
+def _read_head(content: Blob, encoding: str, dialect: type[csv.Dialect]) -> list[list[str]]:
+    """Parse the first HEADER_SCAN_ROWS records (none if the content is not valid CSV)."""
+    with io.TextIOWrapper(content.open(), encoding=encoding, errors="replace", newline="") as stream:
+        try:
+            return list(islice(csv.reader(stream, dialect), HEADER_SCAN_ROWS))
+        except csv.Error:
+            return []
+
+
+def extract_structured_from_csv(
+    content: BlobLike,
+    filename: str = "unknown.csv",
+) -> Optional[ExtractedData]:
+    """
+    Extract structured data from CSV/TSV content, preserving row-level associations.
+
+    Args:
+        content: File content (bytes or blob).
+        filename: Original filename for source_details.
+
+    Returns:
+        ExtractedData with properly associated EAN↔price↔store data, or None.
+    """
+    content = as_blob(content)
+    encoding, dialect = sniff_csv_format(content)
+    head = _read_head(content, encoding, dialect)
+
+    result = HEADER_MATCHER.find_header_row(head, scan_limit=HEADER_SCAN_ROWS, min_fields=2)
+    if result is None:
+        return None
+
+    header_row_idx, column_map = result
+
+    extracted = ExtractedData(
+        source=DataSource.ATTACHMENT,
+        source_details=f"Attachment: {filename} (structured)",
+    )
+
+    # Metadata from rows above the header
+    apply_metadata_rows(extracted, head[:header_row_idx])
+
+    ean_col = column_map["ean"]
+    supplier_price_col = column_map.get("supplier_price")
+    internal_price_col = column_map.get("internal_price")
+    store_col = column_map.get("store")
+
+    # header_row_idx counts csv records; the C parser's integer skiprows also
+    # counts records (a quoted cell with line breaks is one), so both agree
+    try:
+        with content.open() as stream:
+            chunks = pd.read_csv(
+                stream,
+                encoding=encoding,
+                encoding_errors="replace",
+                sep=dialect.delimiter,
+                quotechar=dialect.quotechar or '"',
+                skipinitialspace=dialect.skipinitialspace,
+                header=None,
+                skiprows=header_row_idx + 1,
+                usecols=sorted(set(column_map.values())),
+                dtype=str,
+                keep_default_na=False,
+                chunksize=CSV_CHUNK_ROWS,
+                on_bad_lines="skip",
+            )
+
+            for chunk in chunks:
+                chunk = chunk.fillna("")
+                eans = _clean_ean_series(chunk[ean_col])
+                valid = validate_ean_batch(eans.tolist())
+                if not valid.any():
+                    continue
+
+                rows = chunk[valid]
+                row_eans = eans[valid].tolist()
+                extracted.eans.extend(row_eans)
+
+                if supplier_price_col is not None:
+                    prices = _parse_price_series(rows[supplier_price_col])
+                    for ean, price in zip(row_eans, prices.tolist()):
+                        if price == price:  # Not NaN
+                            extracted.supplier_prices[ean] = price
+
+                if internal_price_col is not None:
+                    prices = _parse_price_series(rows[internal_price_col])
+                    for ean, price in zip(row_eans, prices.tolist()):
+                        if price == price:
+                            extracted.internal_prices[ean] = price
+
+                if store_col is not None:
+                    for ean, store in zip(row_eans, rows[store_col].str.strip().tolist()):
+                        if store:
+                            extracted.stores[ean] = store
+    except (ValueError, pd.errors.ParserError):
+        # Malformed content; keep whatever was parsed so far
+        pass
+
+    return extracted if extracted.eans else None
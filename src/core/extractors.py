@@ -2,42 +2,66 @@
 Data extractors from various sources.
 """
 
+from dataclasses import dataclass
 from typing import Optional
 
 from src.config import Config
-from src.core.excel_structured_extractor import extract_structured_from_excel
+from src.core.body_reduction import ReducedBody, reduce_email_body
+from src.core.csv_extractor import extract_structured_from_csv
+from src.core.excel_structured_extractor import extract_structured_from_sheets
+from src.core.header_matcher import HEADER_MATCHER
 from src.core.models import DataSource, EmailAttachment, EmailItem, ExtractedData
-from src.integrations.excel.parser import ExcelParser
+from src.integrations.anthropic.fallback import ClaudeFallback, PendingRequest
+from src.integrations.excel.readers import (
+    CsvReader,
+    SpreadsheetReader,
+    SpreadsheetReaderError,
+    get_spreadsheet_reader,
+    sheets_to_text,
+)
 from src.integrations.ocr.ocr_pipeline import OCRPipeline
 from src.utils.text import (
-    extract_dates,
+    associate_by_position,
     extract_eans,
     extract_invoice_numbers,
-    extract_prices,
-    extract_stores,
     extract_suppliers,
-    find_date_by_keyword,
+    find_dates_by_role,
     is_valid_ean,
+    scan_text,
+    validate_ean_batch,
 )
+from src.utils.timing import span
+
+
+@dataclass
+class OcrExtraction:
+    """OCR extraction, possibly still waiting on the Claude fallback."""
+    extracted: ExtractedData  # Regex result
+    text: str  # Combined OCR text
+    claude_request: Optional[PendingRequest] = None
 
 
 class DataExtractor:
     """Extracts structured data from email sources."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, claude_fallback: Optional[ClaudeFallback] = None):
         """
         Initialize extractor.
 
         Args:
             config: Application configuration.
+            claude_fallback: Run-wide Claude fallback executor (optional). Without
+                it, Claude is called inline when an API key is configured.
         """
         self.config = config
         self.ocr_pipeline = OCRPipeline(config)
-        self.excel_parser = ExcelParser()
+        self.claude_fallback = claude_fallback
 
         # Initialize Claude client if API key is available (used as smart fallback)
         self.claude_client = None
-        if config.anthropic_api_key:
+        if claude_fallback is not None:
+            self.claude_client = claude_fallback.client
+        elif config.anthropic_api_key:
             try:
                 from src.integrations.anthropic.client import ClaudeClient
                 self.claude_client = ClaudeClient(config)
@@ -60,6 +84,22 @@ class DataExtractor:
         Returns:
             ExtractedData or None if no images.
         """
+        ocr = self.start_ocr_extraction(email)
+        return self.finish_ocr_extraction(ocr) if ocr else None
+
+    def start_ocr_extraction(self, email: EmailItem) -> Optional[OcrExtraction]:
+        """
+        Run OCR and regex extraction, and submit the Claude fallback if needed.
+
+        With a fallback executor the Claude request runs in the background;
+        call finish_ocr_extraction once the other sources are extracted.
+
+        Args:
+            email: Email item.
+
+        Returns:
+            OcrExtraction, or None if no images.
+        """
         # Get combined OCR text
         ocr_text = self.ocr_pipeline.get_combined_ocr_text(email)
 
@@ -67,37 +107,41 @@ class DataExtractor:
             return None
 
         # 1. Regex-based extraction
-        extracted = ExtractedData(
-            source=DataSource.OCR,
-            source_details="OCR from images",
-            eans=extract_eans(ocr_text),
+        extracted = self._extract_from_plain_text(
+            ocr_text, DataSource.OCR, "OCR from images"
         )
 
-        extracted.delivery_date = find_date_by_keyword(ocr_text, "delivery")
-        extracted.order_creation_date = find_date_by_keyword(ocr_text, "order")
-        extracted.document_creation_date = find_date_by_keyword(ocr_text, "document|created|date")
+        # 2. Claude smart fallback: if regex found few results, ask Claude
+        claude_request = None
+        if self.claude_fallback is not None and len(extracted.eans) == 0:
+            claude_request = self.claude_fallback.submit(ocr_text)
 
-        suppliers = extract_suppliers(ocr_text)
-        extracted.supplier_name = suppliers[0] if suppliers else None
+        return OcrExtraction(extracted=extracted, text=ocr_text, claude_request=claude_request)
 
-        invoices = extract_invoice_numbers(ocr_text)
-        extracted.supplier_invoice_number = invoices[0] if invoices else None
+    def finish_ocr_extraction(self, ocr: OcrExtraction) -> ExtractedData:
+        """
+        Wait for the Claude fallback (if any) and merge it into the OCR extraction.
 
-        prices = extract_prices(ocr_text)
-        for i, ean in enumerate(extracted.eans):
-            if i < len(prices):
-                extracted.supplier_prices[ean] = prices[i]
+        Args:
+            ocr: Result of start_ocr_extraction.
 
-        stores = extract_stores(ocr_text)
-        for i, ean in enumerate(extracted.eans):
-            if i < len(stores):
-                extracted.stores[ean] = stores[i]
+        Returns:
+            ExtractedData (Claude enriches regex).
+        """
+        extracted = ocr.extracted
+        if len(extracted.eans) > 0:
+            return extracted
 
-        # 2. Claude smart fallback: if regex found few results, ask Claude
-        if self.claude_client and len(extracted.eans) == 0:
-            claude_data = self._claude_extract_structured(ocr_text)
-            if claude_data:
-                extracted = self._merge_claude_into_extracted(extracted, claude_data)
+        with span("claude.wait"):
+            if self.claude_fallback is not None:
+                claude_data = self.claude_fallback.result(ocr.claude_request)
+            elif self.claude_client:
+                claude_data = self._claude_extract_structured(ocr.text)
+            else:
+                claude_data = None
+
+        if claude_data:
+            extracted = self._merge_claude_into_extracted(extracted, claude_data)
 
         return extracted
 
@@ -168,9 +212,44 @@ class DataExtractor:
 
         return extracted
 
+    @staticmethod
+    def _extract_from_plain_text(
+        text: str,
+        source: DataSource,
+        source_details: str,
+    ) -> ExtractedData:
+        """Extract all fields from unstructured text.
+
+        Prices and stores are linked to EANs by position (same line/row),
+        not by list index.
+        """
+        scan = scan_text(text)
+
+        extracted = ExtractedData(
+            source=source,
+            source_details=source_details,
+            eans=extract_eans(text),
+        )
+
+        dates = find_dates_by_role(text)
+        extracted.delivery_date = dates["delivery"]
+        extracted.order_creation_date = dates["order"]
+        extracted.document_creation_date = dates["document"]
+
+        suppliers = extract_suppliers(text)
+        extracted.supplier_name = suppliers[0] if suppliers else None
+
+        invoices = extract_invoice_numbers(text)
+        extracted.supplier_invoice_number = invoices[0] if invoices else None
+
+        extracted.supplier_prices = associate_by_position(scan, scan.valid_eans, scan.prices)
+        extracted.stores = associate_by_position(scan, scan.valid_eans, scan.stores)
+
+        return extracted
+
     def extract_from_attachments(self, email: EmailItem) -> list[ExtractedData]:
         """
-        Extract data from attachments (Excel, PDF).
+        Extract data from attachments (spreadsheets, PDF).
 
         Args:
             email: Email item.
@@ -187,24 +266,31 @@ class DataExtractor:
 
             extracted = None
 
-            # Excel files
-            if att.content_type in (
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                "application/vnd.ms-excel",
-            ) or att.filename.lower().endswith((".xlsx", ".xls")):
-                extracted = self._extract_from_excel(att)
+            # Spreadsheets (xlsx, xls, xlsb, ods, csv)
+            reader = get_spreadsheet_reader(att.filename, att.content_type)
+            if isinstance(reader, CsvReader):
+                with span("extract.csv"):
+                    extracted = self._extract_from_csv(att)
+            elif reader is not None:
+                with span("extract.spreadsheet"):
+                    extracted = self._extract_from_excel(att, reader)
 
             # PDF files (text extraction)
             elif att.content_type == "application/pdf" or att.filename.lower().endswith(".pdf"):
-                extracted = self._extract_from_pdf_text(att)
+                with span("extract.pdf"):
+                    extracted = self._extract_from_pdf_text(att)
 
             if extracted:
                 extractions.append(extracted)
 
         return extractions
 
-    def _extract_from_excel(self, attachment: EmailAttachment) -> Optional[ExtractedData]:
-        """Extract data from Excel attachment.
+    def _extract_from_excel(
+        self,
+        attachment: EmailAttachment,
+        reader: SpreadsheetReader,
+    ) -> Optional[ExtractedData]:
+        """Extract data from a spreadsheet attachment.
 
         Strategy:
         1. Try structured extraction (header-based, row-level association)
@@ -212,22 +298,35 @@ class DataExtractor:
         3. If structured returns None, fallback to plain-text method
         """
         # 1. Try structured extraction first
-        structured = extract_structured_from_excel(attachment.content, attachment.filename)
+        try:
+            structured = extract_structured_from_sheets(
+                reader.iter_sheets(attachment.content), attachment.filename
+            )
+        except SpreadsheetReaderError:
+            structured = None
 
         if structured and structured.eans:
             # Enrich with dates/supplier from plain text if structured missed them
+            missing = not all((
+                structured.delivery_date,
+                structured.order_creation_date,
+                structured.document_creation_date,
+                structured.supplier_name,
+                structured.supplier_invoice_number,
+            ))
             try:
-                text = self.excel_parser.extract_text_from_xlsx(attachment.content)
+                text = self._spreadsheet_text(attachment, reader) if missing else ""
             except Exception:
                 text = ""
 
             if text:
+                dates = find_dates_by_role(text)
                 if not structured.delivery_date:
-                    structured.delivery_date = find_date_by_keyword(text, "delivery")
+                    structured.delivery_date = dates["delivery"]
                 if not structured.order_creation_date:
-                    structured.order_creation_date = find_date_by_keyword(text, "order")
+                    structured.order_creation_date = dates["order"]
                 if not structured.document_creation_date:
-                    structured.document_creation_date = find_date_by_keyword(text, "document|created|date")
+                    structured.document_creation_date = dates["document"]
                 if not structured.supplier_name:
                     suppliers = extract_suppliers(text)
                     structured.supplier_name = suppliers[0] if suppliers else None
@@ -239,37 +338,39 @@ class DataExtractor:
 
         # 2. Fallback: plain-text extraction
         try:
-            text = self.excel_parser.extract_text_from_xlsx(attachment.content)
+            text = self._spreadsheet_text(attachment, reader)
         except Exception:
             return None
 
-        extracted = ExtractedData(
-            source=DataSource.ATTACHMENT,
-            source_details=f"Attachment: {attachment.filename}",
-            eans=extract_eans(text),
+        return self._extract_from_plain_text(
+            text, DataSource.ATTACHMENT, f"Attachment: {attachment.filename}"
         )
 
-        extracted.delivery_date = find_date_by_keyword(text, "delivery")
-        extracted.order_creation_date = find_date_by_keyword(text, "order")
-        extracted.document_creation_date = find_date_by_keyword(text, "document|created|date")
+    def _extract_from_csv(self, attachment: EmailAttachment) -> Optional[ExtractedData]:
+        """Extract data from a CSV/TSV attachment.
 
-        suppliers = extract_suppliers(text)
-        extracted.supplier_name = suppliers[0] if suppliers else None
-
-        invoices = extract_invoice_numbers(text)
-        extracted.supplier_invoice_number = invoices[0] if invoices else None
+        Strategy:
+        1. Try structured extraction (chunked, header-based)
+        2. If structured returns None, fallback to plain-text method
+        """
+        # 1. Structured; the rows above the header already provide the metadata
+        structured = extract_structured_from_csv(attachment.content, attachment.filename)
+        if structured and structured.eans:
+            return structured
 
-        prices = extract_prices(text)
-        for i, ean in enumerate(extracted.eans):
-            if i < len(prices):
-                extracted.supplier_prices[ean] = prices[i]
+        # 2. Fallback: plain-text extraction
+        try:
+            text = sheets_to_text(CsvReader().iter_sheets(attachment.content))
+        except Exception:
+            return None
 
-        stores = extract_stores(text)
-        for i, ean in enumerate(extracted.eans):
-            if i < len(stores):
-                extracted.stores[ean] = stores[i]
+        return self._extract_from_plain_text(
+            text, DataSource.ATTACHMENT, f"Attachment: {attachment.filename}"
+        )
 
-        return extracted
+    def _spreadsheet_text(self, attachment: EmailAttachment, reader: SpreadsheetReader) -> str:
+        """Render all sheets of a spreadsheet attachment as plain text (rows streamed, never a full workbook)."""
+        return sheets_to_text(reader.iter_sheets(attachment.content))
 
     def _extract_from_pdf_text(self, attachment: EmailAttachment) -> Optional[ExtractedData]:
         """Extract data from PDF text.
@@ -281,14 +382,11 @@ class DataExtractor:
         """
         try:
             import pdfplumber
-            import io
-
-            pdf_file = io.BytesIO(attachment.content)
         except Exception:
             return None
 
         try:
-            with pdfplumber.open(pdf_file) as pdf:
+            with attachment.content.open() as pdf_file, pdfplumber.open(pdf_file) as pdf:
                 # 1. Try structured table extraction first
                 table_extracted = self._extract_from_pdf_tables(pdf, attachment.filename)
 
@@ -301,12 +399,13 @@ class DataExtractor:
                 if table_extracted and table_extracted.eans:
                     # Enrich table data with text-based metadata
                     if text:
+                        dates = find_dates_by_role(text)
                         if not table_extracted.delivery_date:
-                            table_extracted.delivery_date = find_date_by_keyword(text, "delivery")
+                            table_extracted.delivery_date = dates["delivery"]
                         if not table_extracted.order_creation_date:
-                            table_extracted.order_creation_date = find_date_by_keyword(text, "order")
+                            table_extracted.order_creation_date = dates["order"]
                         if not table_extracted.document_creation_date:
-                            table_extracted.document_creation_date = find_date_by_keyword(text, "document|created|date")
+                            table_extracted.document_creation_date = dates["document"]
                         if not table_extracted.supplier_name:
                             suppliers = extract_suppliers(text)
                             table_extracted.supplier_name = suppliers[0] if suppliers else None
@@ -319,34 +418,10 @@ class DataExtractor:
                 if not text:
                     return None
 
-                extracted = ExtractedData(
-                    source=DataSource.ATTACHMENT,
-                    source_details=f"Attachment: {attachment.filename}",
-                    eans=extract_eans(text),
+                return self._extract_from_plain_text(
+                    text, DataSource.ATTACHMENT, f"Attachment: {attachment.filename}"
                 )
 
-                extracted.delivery_date = find_date_by_keyword(text, "delivery")
-                extracted.order_creation_date = find_date_by_keyword(text, "order")
-                extracted.document_creation_date = find_date_by_keyword(text, "document|created|date")
-
-                suppliers = extract_suppliers(text)
-                extracted.supplier_name = suppliers[0] if suppliers else None
-
-                invoices = extract_invoice_numbers(text)
-                extracted.supplier_invoice_number = invoices[0] if invoices else None
-
-                prices = extract_prices(text)
-                for i, ean in enumerate(extracted.eans):
-                    if i < len(prices):
-                        extracted.supplier_prices[ean] = prices[i]
-
-                stores = extract_stores(text)
-                for i, ean in enumerate(extracted.eans):
-                    if i < len(stores):
-                        extracted.stores[ean] = stores[i]
-
-                return extracted
-
         except Exception:
             return None
 
@@ -362,18 +437,6 @@ class DataExtractor:
         """
         import re as _re
 
-        # Header keywords (similar to Excel structured extractor)
-        ean_headers = {"ean", "ean code", "barcode", "bar code", "ean koda", "črtna koda", "barkoda"}
-        supplier_price_headers = {
-            "supplier price", "purchase price", "cost price", "cena", "vpc", "nc",
-            "dobaviteljeva cena", "cena dobavitelja", "nabavna cena", "nab. cena",
-        }
-        internal_price_headers = {
-            "internal price", "our price", "selling price", "retail price", "mpc",
-            "naša cena", "prodajna cena", "maloprodajna cena", "prod. cena",
-        }
-        store_headers = {"store", "unit", "enota", "trgovina", "poslovalnica", "lokacija"}
-
         for page in pdf.pages:
             tables = page.extract_tables()
             if not tables:
@@ -383,67 +446,37 @@ class DataExtractor:
                 if not table or len(table) < 2:
                     continue
 
-                # Detect header row
-                header_row = None
-                header_idx = -1
-                for idx, row in enumerate(table[:10]):  # Scan first 10 rows
-                    if row is None:
-                        continue
-                    normalized = [
-                        _re.sub(r'\s+', ' ', str(c).strip().lower()) if c else ""
-                        for c in row
-                    ]
-                    # Check if any cell matches EAN header
-                    has_ean_header = any(
-                        any(h in cell or cell in h for h in ean_headers)
-                        for cell in normalized if cell
-                    )
-                    if has_ean_header:
-                        header_row = normalized
-                        header_idx = idx
-                        break
-
-                if header_row is None:
+                # Detect header row (scan first 10 rows)
+                header = HEADER_MATCHER.find_header_row(table, scan_limit=10, min_fields=1)
+                if header is None:
                     continue
 
-                # Map columns
-                ean_col = None
-                sp_col = None
-                ip_col = None
-                st_col = None
-
-                for ci, cell in enumerate(header_row):
-                    if not cell:
-                        continue
-                    if any(h in cell or cell in h for h in ean_headers):
-                        ean_col = ci
-                    elif any(h in cell or cell in h for h in supplier_price_headers):
-                        sp_col = ci
-                    elif any(h in cell or cell in h for h in internal_price_headers):
-                        ip_col = ci
-                    elif any(h in cell or cell in h for h in store_headers):
-                        st_col = ci
-
-                if ean_col is None:
-                    continue
+                header_idx, column_map = header
+                ean_col = column_map["ean"]
+                sp_col = column_map.get("supplier_price")
+                ip_col = column_map.get("internal_price")
+                st_col = column_map.get("store")
 
                 extracted = ExtractedData(
                     source=DataSource.ATTACHMENT,
                     source_details=f"Attachment: {filename} (structured PDF table)",
                 )
 
+                # Validate the whole EAN column at once
+                data_rows = [row for row in table[header_idx + 1:] if row is not None]
+                ean_candidates = [
+                    _re.sub(r'[^\d]', '', str(row[ean_col]).strip())
+                    if ean_col < len(row) and row[ean_col] is not None else None
+                    for row in data_rows
+                ]
+                ean_mask = validate_ean_batch(ean_candidates)
+
                 # Parse data rows
-                for row in table[header_idx + 1:]:
-                    if row is None:
-                        continue
+                for row, ean_text, ean_valid in zip(data_rows, ean_candidates, ean_mask):
                     if all(c is None or str(c).strip() == "" for c in row):
                         continue
 
-                    # Extract EAN
-                    if ean_col >= len(row) or row[ean_col] is None:
-                        continue
-                    ean_text = _re.sub(r'[^\d]', '', str(row[ean_col]).strip())
-                    if len(ean_text) not in (8, 13) or not is_valid_ean(ean_text):
+                    if not ean_valid:
                         continue
 
                     extracted.eans.append(ean_text)
@@ -500,8 +533,10 @@ class DataExtractor:
         Extract data from email body.
 
         Strategy:
-        1. If HTML body with tables → parse tables structurally (BeautifulSoup)
-        2. For remaining text / plain bodies → regex extraction
+        1. Reduce the body to the content new to this message
+           (uniqueBody, or quoted history and signature removed)
+        2. If it has HTML tables → parse tables structurally
+        3. For remaining text / plain bodies → regex extraction
 
         Args:
             email: Email item.
@@ -509,27 +544,37 @@ class DataExtractor:
         Returns:
             ExtractedData or None.
         """
-        body_text = email.body_text or email.body_html or ""
+        body = reduce_email_body(email)
 
-        if not body_text:
+        if body is None:
             return None
 
-        # 1. Try HTML table extraction if body_html contains <table>
-        if email.body_html and "<table" in email.body_html.lower():
-            table_extracted = self._extract_from_html_tables(email.body_html)
+        return self.extract_from_reduced_body(body)
+
+    def extract_from_reduced_body(self, body: ReducedBody) -> Optional[ExtractedData]:
+        """
+        Extract data from an already reduced email body (see extract_from_body).
+
+        Args:
+            body: Result of reduce_email_body.
+
+        Returns:
+            ExtractedData or None.
+        """
+        # 1. Try HTML table extraction
+        if body.tables:
+            table_extracted = self._extract_from_html_tables(body.tables)
             if table_extracted and table_extracted.eans:
                 # Enrich from full text
-                plain_text = email.body_text or ""
-                if not plain_text:
-                    import re
-                    plain_text = re.sub(r'<[^>]+>', ' ', email.body_html)
+                plain_text = body.text
 
+                dates = find_dates_by_role(plain_text)
                 if not table_extracted.delivery_date:
-                    table_extracted.delivery_date = find_date_by_keyword(plain_text, "delivery")
+                    table_extracted.delivery_date = dates["delivery"]
                 if not table_extracted.order_creation_date:
-                    table_extracted.order_creation_date = find_date_by_keyword(plain_text, "order")
+                    table_extracted.order_creation_date = dates["order"]
                 if not table_extracted.document_creation_date:
-                    table_extracted.document_creation_date = find_date_by_keyword(plain_text, "document|created|date")
+                    table_extracted.document_creation_date = dates["document"]
                 if not table_extracted.supplier_name:
                     suppliers = extract_suppliers(plain_text)
                     table_extracted.supplier_name = suppliers[0] if suppliers else None
@@ -540,136 +585,55 @@ class DataExtractor:
                 return table_extracted
 
         # 2. Fallback: plain text extraction
-        if email.body_html and not email.body_text:
-            import re
-            body_text = re.sub(r'<[^>]+>', ' ', body_text)
-
-        extracted = ExtractedData(
-            source=DataSource.BODY,
-            source_details="Email body",
-            eans=extract_eans(body_text),
+        return self._extract_from_plain_text(
+            body.text, DataSource.BODY, "Email body"
         )
 
-        extracted.delivery_date = find_date_by_keyword(body_text, "delivery")
-        extracted.order_creation_date = find_date_by_keyword(body_text, "order")
-        extracted.document_creation_date = find_date_by_keyword(body_text, "document|created|date")
-
-        suppliers = extract_suppliers(body_text)
-        extracted.supplier_name = suppliers[0] if suppliers else None
-
-        invoices = extract_invoice_numbers(body_text)
-        extracted.supplier_invoice_number = invoices[0] if invoices else None
-
-        prices = extract_prices(body_text)
-        for i, ean in enumerate(extracted.eans):
-            if i < len(prices):
-                extracted.supplier_prices[ean] = prices[i]
-
-        stores = extract_stores(body_text)
-        for i, ean in enumerate(extracted.eans):
-            if i < len(stores):
-                extracted.stores[ean] = stores[i]
-
-        return extracted
-
-    def _extract_from_html_tables(self, html: str) -> Optional[ExtractedData]:
-        """Extract structured data from HTML tables using BeautifulSoup.
+    def _extract_from_html_tables(self, tables: list[list[list[str]]]) -> Optional[ExtractedData]:
+        """Extract structured data from HTML tables.
 
         Args:
-            html: HTML body content.
+            tables: Tables of the body, as rows of cell texts.
 
         Returns:
             ExtractedData with row-level associations, or None.
         """
         import re as _re
 
-        try:
-            from bs4 import BeautifulSoup
-        except ImportError:
-            return None
-
-        soup = BeautifulSoup(html, "html.parser")
-        tables = soup.find_all("table")
-
-        if not tables:
-            return None
-
-        ean_headers = {"ean", "ean code", "barcode", "ean koda", "črtna koda", "barkoda"}
-        supplier_price_headers = {
-            "supplier price", "purchase price", "cost price", "cena", "vpc", "nc",
-            "dobaviteljeva cena", "cena dobavitelja", "nabavna cena",
-        }
-        internal_price_headers = {
-            "internal price", "our price", "selling price", "retail price", "mpc",
-            "naša cena", "prodajna cena", "maloprodajna cena",
-        }
-        store_headers = {"store", "unit", "enota", "trgovina", "poslovalnica", "lokacija"}
-
-        for table in tables:
-            rows = table.find_all("tr")
+        for rows in tables:
             if len(rows) < 2:
                 continue
 
             # Find header row
-            header_row = None
-            header_idx = -1
-            for idx, row in enumerate(rows[:10]):
-                cells = row.find_all(["th", "td"])
-                normalized = [
-                    _re.sub(r'\s+', ' ', c.get_text().strip().lower())
-                    for c in cells
-                ]
-                has_ean = any(
-                    any(h in cell or cell in h for h in ean_headers)
-                    for cell in normalized if cell
-                )
-                if has_ean:
-                    header_row = normalized
-                    header_idx = idx
-                    break
-
-            if header_row is None:
+            header = HEADER_MATCHER.find_header_row(rows, scan_limit=10, min_fields=1)
+            if header is None:
                 continue
 
-            # Map columns
-            ean_col = None
-            sp_col = None
-            ip_col = None
-            st_col = None
-
-            for ci, cell in enumerate(header_row):
-                if not cell:
-                    continue
-                if any(h in cell or cell in h for h in ean_headers):
-                    ean_col = ci
-                elif any(h in cell or cell in h for h in supplier_price_headers):
-                    sp_col = ci
-                elif any(h in cell or cell in h for h in internal_price_headers):
-                    ip_col = ci
-                elif any(h in cell or cell in h for h in store_headers):
-                    st_col = ci
-
-            if ean_col is None:
-                continue
+            header_idx, column_map = header
+            ean_col = column_map["ean"]
+            sp_col = column_map.get("supplier_price")
+            ip_col = column_map.get("internal_price")
+            st_col = column_map.get("store")
 
             extracted = ExtractedData(
                 source=DataSource.BODY,
                 source_details="Email body (HTML table)",
             )
 
-            # Parse data rows
-            for row in rows[header_idx + 1:]:
-                cells = row.find_all(["th", "td"])
-                cell_texts = [c.get_text().strip() for c in cells]
+            # Validate the whole EAN column at once
+            data_rows = rows[header_idx + 1:]
+            ean_candidates = [
+                _re.sub(r'[^\d]', '', cell_texts[ean_col]) if ean_col < len(cell_texts) else None
+                for cell_texts in data_rows
+            ]
+            ean_mask = validate_ean_batch(ean_candidates)
 
+            # Parse data rows
+            for cell_texts, ean_text, ean_valid in zip(data_rows, ean_candidates, ean_mask):
                 if all(not t for t in cell_texts):
                     continue
 
-                # Extract EAN
-                if ean_col >= len(cell_texts):
-                    continue
-                ean_text = _re.sub(r'[^\d]', '', cell_texts[ean_col])
-                if len(ean_text) not in (8, 13) or not is_valid_ean(ean_text):
+                if not ean_valid:
                     continue
 
                 extracted.eans.append(ean_text)
@@ -0,0 +1,237 @@
+"""
+Table header matching shared by all structured extractors (Excel, PDF, HTML).
+
+Header variants are compiled once into an Aho-Corasick automaton, so resolving
+a header row costs one pass over each cell instead of a substring check per
+cell × variant. Every candidate (field, column) pair is scored and columns are
+assigned greedily from the best score down.
+"""
+
+import re
+from collections import deque
+from typing import Any, Iterator, Optional, Sequence
+
+
+# Header mappings: internal field name → list of possible column header strings
+# Supports Slovenian and English variants
+HEADER_MAPPINGS: dict[str, list[str]] = {
+    "ean": [
+        "ean", "ean code", "ean koda", "ean-koda", "ean šifra",
+        "črtna koda", "barcode", "bar code", "barkoda",
+    ],
+    "supplier_price": [
+        "dobaviteljeva cena", "cena dobavitelja", "nabavna cena",
+        "supplier price", "purchase price", "cost price", "cena",
+        "vpc", "nc", "nab. cena", "nab cena",
+    ],
+    "internal_price": [
+        "naša cena", "prodajna cena", "mpc", "maloprodajna cena",
+        "internal price", "our price", "selling price", "retail price",
+        "pc", "prod. cena", "prod cena",
+    ],
+    "store": [
+        "enota", "trgovina", "poslovalnica", "unit", "store",
+        "lokacija", "location", "poslovni prostor",
+    ],
+    "article_code": [
+        "šifra", "šifra artikla", "artikel šifra", "article code",
+        "item code", "product code", "art. šifra", "art šifra",
+        "šifra izdelka", "code",
+    ],
+    "article_name": [
+        "artikel", "naziv artikla", "ime artikla", "article name",
+        "item name", "product name", "naziv", "opis", "description",
+        "art. naziv", "art naziv",
+    ],
+    "quantity": [
+        "količina", "kol", "qty", "quantity", "kol.",
+    ],
+    "unit_of_measure": [
+        "enota mere", "em", "uom", "unit of measure", "me",
+    ],
+}
+
+# Match kinds, strongest first
+EXACT_MATCH = 2  # cell equals a variant
+VARIANT_IN_CELL = 1  # variant occurs inside the cell ("nabavna cena eur")
+CELL_IN_VARIANT = 0  # cell is a fragment of a variant ("bar" of "barcode")
+
+# Shortest cell accepted as a fragment of a variant
+MIN_FRAGMENT_LENGTH = 3
+
+
+def normalize_header(cell_value: Any) -> str:
+    """Normalize a header cell value for matching."""
+    if cell_value is None:
+        return ""
+    text = str(cell_value).strip().lower()
+    # Remove extra whitespace
+    text = re.sub(r'\s+', ' ', text)
+    return text
+
+
+class _AhoCorasick:
+    """Multi-pattern substring automaton."""
+
+    def __init__(self, patterns: Sequence[str]):
+        """
+        Build the automaton.
+
+        Args:
+            patterns: Strings to search for.
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append(pattern)
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[str]:
+        """Yield every pattern occurring in text (with repeats)."""
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            yield from self._out[state]
+
+
+class HeaderMatcher:
+    """Resolves table header rows to internal field names."""
+
+    def __init__(self, mappings: dict[str, list[str]] = HEADER_MAPPINGS):
+        """
+        Compile header variants.
+
+        Args:
+            mappings: Field name → header variants.
+        """
+        self._fields_by_variant: dict[str, list[str]] = {}
+        for field_name, variants in mappings.items():
+            for variant in variants:
+                self._fields_by_variant.setdefault(normalize_header(variant), []).append(field_name)
+
+        self._automaton = _AhoCorasick(list(self._fields_by_variant))
+
+        # Every fragment of every variant, for cells that abbreviate a header
+        self._fields_by_fragment: dict[str, set[str]] = {}
+        for variant, fields in self._fields_by_variant.items():
+            for start in range(len(variant)):
+                for end in range(start + MIN_FRAGMENT_LENGTH, len(variant) + 1):
+                    self._fields_by_fragment.setdefault(variant[start:end], set()).update(fields)
+
+    def score_cell(self, cell: str) -> dict[str, tuple[int, int]]:
+        """
+        Score how well a normalized cell matches each field.
+
+        Args:
+            cell: Normalized header cell text.
+
+        Returns:
+            Field name → (match kind, matched length); higher is better.
+        """
+        scores: dict[str, tuple[int, int]] = {}
+
+        if not cell:
+            return scores
+
+        for field_name in self._fields_by_variant.get(cell, ()):
+            scores[field_name] = (EXACT_MATCH, len(cell))
+
+        for variant in self._automaton.iter_matches(cell):
+            score = (VARIANT_IN_CELL, len(variant))
+            for field_name in self._fields_by_variant[variant]:
+                if score > scores.get(field_name, (-1, 0)):
+                    scores[field_name] = score
+
+        for field_name in self._fields_by_fragment.get(cell, ()):
+            scores.setdefault(field_name, (CELL_IN_VARIANT, len(cell)))
+
+        return scores
+
+    def map_columns(self, cells: Sequence[Any]) -> dict[str, int]:
+        """
+        Map a header row to field columns.
+
+        Each column and each field is used at most once; the best-scoring
+        pairs are assigned first, ties go to the leftmost column.
+
+        Args:
+            cells: Raw header row cells.
+
+        Returns:
+            Field name → column index.
+        """
+        candidates = []
+        for col_idx, cell in enumerate(cells):
+            for field_name, score in self.score_cell(normalize_header(cell)).items():
+                candidates.append((score, col_idx, field_name))
+
+        candidates.sort(key=lambda c: (-c[0][0], -c[0][1], c[1]))
+
+        column_map: dict[str, int] = {}
+        used_columns: set[int] = set()
+        for _, col_idx, field_name in candidates:
+            if field_name in column_map or col_idx in used_columns:
+                continue
+            column_map[field_name] = col_idx
+            used_columns.add(col_idx)
+
+        return column_map
+
+    def find_header_row(
+        self,
+        rows: Sequence[Optional[Sequence[Any]]],
+        scan_limit: int = 20,
+        min_fields: int = 2,
+    ) -> Optional[tuple[int, dict[str, int]]]:
+        """
+        Find the header row among the first rows of a table.
+
+        A row qualifies when it maps an EAN column and at least min_fields
+        fields in total.
+
+        Args:
+            rows: Table rows (None rows are skipped).
+            scan_limit: Number of leading rows to inspect.
+            min_fields: Minimum number of mapped fields, EAN included.
+
+        Returns:
+            Tuple of (header_row_index, {field_name: column_index}) or None.
+        """
+        for row_idx, row in enumerate(rows):
+            if row_idx >= scan_limit:
+                break
+            if row is None:
+                continue
+
+            column_map = self.map_columns(row)
+            if "ean" in column_map and len(column_map) >= min_fields:
+                return row_idx, column_map
+
+        return None
+
+
+# Shared matcher over HEADER_MAPPINGS
+HEADER_MATCHER = HeaderMatcher()
@@ -2,10 +2,13 @@
 Data models for email processing.
 """
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
+
+from src.utils.blob import Blob, as_blob
 
 
 class ProcessStatus(Enum):
@@ -29,16 +32,19 @@ class DataSource(Enum):
     BODY = "BODY"  # Email body text
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailAttachment:
     """Email attachment metadata."""
     filename: str
     content_type: str
-    content: bytes
+    content: Blob  # Raw bytes are wrapped on construction
     size: int
 
+    def __post_init__(self):
+        self.content = as_blob(self.content)
 
-@dataclass
+
+@dataclass(slots=True)
 class EmailItem:
     """Represents a single email message."""
     message_id: str
@@ -50,9 +56,24 @@ class EmailItem:
     attachments: list[EmailAttachment] = field(default_factory=list)
     inline_images: list[EmailAttachment] = field(default_factory=list)
     web_link: Optional[str] = None
+    # Graph uniqueBody: only the content new to this message (no quoted history)
+    unique_body_html: Optional[str] = None
+    unique_body_text: Optional[str] = None
 
+    def release_payloads(self) -> None:
+        """Free attachment and inline image content (memory and temp files)."""
+        for attachment in (*self.attachments, *self.inline_images):
+            attachment.content.close()
 
-@dataclass
+    def release_bodies(self) -> None:
+        """Drop bodies and attachment lists, keeping the header fields used in logs."""
+        self.body_html = self.body_text = None
+        self.unique_body_html = self.unique_body_text = None
+        self.attachments = []
+        self.inline_images = []
+
+
+@dataclass(slots=True)
 class ExtractedData:
     """Data extracted from a single source (OCR/attachment/body)."""
     source: DataSource
@@ -70,25 +91,154 @@ class ExtractedData:
     stores: dict[str, str] = field(default_factory=dict)  # EAN -> store/unit
 
 
-@dataclass
-class CaseRow:
+@dataclass(frozen=True, slots=True)
+class MergeConflict:
+    """A value that lost to a higher-priority source during merging."""
+    field_name: str  # e.g., "delivery_date", "supplier_prices"
+    key: Optional[str]  # EAN for per-EAN fields, None for scalar fields
+    winning_source: str  # source_details of the kept value
+    winning_value: Any
+    losing_source: str  # source_details of the overridden value
+    losing_value: Any
+
+    def __str__(self) -> str:
+        """Human-readable description (used in case comments)."""
+        if self.key is None:
+            return f"{self.losing_source}: {self.losing_value} (overridden by {self.winning_source})"
+        return (
+            f"{self.field_name}[{self.key}]: {self.winning_value} (from {self.winning_source}) "
+            f"vs {self.losing_value} (from {self.losing_source})"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CaseMetadata:
     """
-    Single row in the output Excel file (one EAN).
-    Column order must match README requirements.
+    Per-email values shared by all case rows of that email.
+
+    One instance is created per email and referenced from every row, instead
+    of copying dates, supplier, sender, link and comments into each row.
     """
-    unit_store: str  # 1. Unit (Store)
-    ean_code: str  # 2. EAN Code
     document_creation_date: Optional[date]  # 3. Document Creation Date
     delivery_date: Optional[date]  # 4. Delivery Date
     order_creation_date: Optional[date]  # 5. Order Creation Date
-    supplier_price: Optional[float]  # 6. Supplier Price
-    internal_price: Optional[float]  # 7. Internal (Own) Price
     supplier_name: Optional[str]  # 8. Supplier Name
     supplier_invoice_number: Optional[str]  # 9. Supplier Invoice Number
     email_sender_address: str  # 10. Email Sender Address
     email_link: Optional[str]  # 11. Email Link / Stable Reference
     comments: str  # 12. Comments (conflicts, notes)
 
+    @classmethod
+    def interned(cls, **values: Any) -> "CaseMetadata":
+        """Create metadata with its strings interned (senders and suppliers repeat across emails)."""
+        return cls(**{
+            name: sys.intern(value) if isinstance(value, str) else value
+            for name, value in values.items()
+        })
+
+
+# Per-email CaseRow columns held in CaseMetadata
+_SHARED_COLUMNS = (
+    "document_creation_date",
+    "delivery_date",
+    "order_creation_date",
+    "supplier_name",
+    "supplier_invoice_number",
+    "email_sender_address",
+    "email_link",
+    "comments",
+)
+
+
+def _shared(name: str) -> property:
+    """CaseRow attribute served from its CaseMetadata; assignment gives the row its own copy."""
+    def set_value(row: "CaseRow", value: Any) -> None:
+        row.meta = replace(row.meta, **{name: value})
+
+    return property(lambda row: getattr(row.meta, name), set_value, doc=f"Shared per-email {name}.")
+
+
+@dataclass(init=False, slots=True)
+class CaseRow:
+    """
+    Single row in the output Excel file (one EAN).
+    Column order must match README requirements; per-email columns live in meta.
+    """
+    unit_store: str  # 1. Unit (Store)
+    ean_code: str  # 2. EAN Code
+    supplier_price: Optional[float]  # 6. Supplier Price
+    internal_price: Optional[float]  # 7. Internal (Own) Price
+    meta: CaseMetadata  # 3-5, 8-12: shared with the other rows of the email
+
+    def __init__(
+        self,
+        unit_store: str,
+        ean_code: str,
+        document_creation_date: Optional[date] = None,
+        delivery_date: Optional[date] = None,
+        order_creation_date: Optional[date] = None,
+        supplier_price: Optional[float] = None,
+        internal_price: Optional[float] = None,
+        supplier_name: Optional[str] = None,
+        supplier_invoice_number: Optional[str] = None,
+        email_sender_address: str = "",
+        email_link: Optional[str] = None,
+        comments: str = "",
+        *,
+        meta: Optional[CaseMetadata] = None,
+    ):
+        """
+        Create a row from shared metadata, or from the per-email columns.
+
+        Positional order is the report column order (as before metadata was
+        shared), so existing keyword and positional calls keep working.
+
+        Args:
+            unit_store: Unit (store).
+            ean_code: EAN code.
+            supplier_price: Supplier price.
+            internal_price: Internal (own) price.
+            document_creation_date, delivery_date, order_creation_date,
+            supplier_name, supplier_invoice_number, email_sender_address,
+            email_link, comments: Per-email columns; only accepted without
+                meta, they form a new CaseMetadata for this row.
+            meta: Metadata shared with the other rows of the email.
+
+        Raises:
+            TypeError: If meta is given together with per-email columns.
+        """
+        if meta is None:
+            meta = CaseMetadata.interned(
+                document_creation_date=document_creation_date,
+                delivery_date=delivery_date,
+                order_creation_date=order_creation_date,
+                supplier_name=supplier_name,
+                supplier_invoice_number=supplier_invoice_number,
+                email_sender_address=email_sender_address,
+                email_link=email_link,
+                comments=comments,
+            )
+        elif (
+            document_creation_date, delivery_date, order_creation_date, supplier_name,
+            supplier_invoice_number, email_sender_address, email_link, comments,
+        ) != (None, None, None, None, None, "", None, ""):
+            raise TypeError(f"CaseRow takes either meta or the per-email columns ({', '.join(_SHARED_COLUMNS)})")
+
+        self.unit_store = unit_store
+        self.ean_code = ean_code
+        self.supplier_price = supplier_price
+        self.internal_price = internal_price
+        self.meta = meta
+
+    document_creation_date = _shared("document_creation_date")
+    delivery_date = _shared("delivery_date")
+    order_creation_date = _shared("order_creation_date")
+    supplier_name = _shared("supplier_name")
+    supplier_invoice_number = _shared("supplier_invoice_number")
+    email_sender_address = _shared("email_sender_address")
+    email_link = _shared("email_link")
+    comments = _shared("comments")
+
 
 @dataclass
 class EmailProcessResult:
@@ -99,6 +249,21 @@ class EmailProcessResult:
     error_message: Optional[str] = None
     cases: list[CaseRow] = field(default_factory=list)
     marked_as_read: bool = False
+    timings: dict[str, float] = field(default_factory=dict)  # Seconds per stage (src.utils.timing)
+    sources: list[str] = field(default_factory=list)  # source_details of the merged extractions
+    conflicts: list[str] = field(default_factory=list)  # Merge conflicts, as in case comments
+    body_chars: int = 0  # Characters of the full body text
+    body_chars_extracted: int = 0  # Characters left after body reduction (see body_reduction.py)
+    cases_extracted: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.cases_extracted = len(self.cases)
+
+    def release(self) -> None:
+        """Drop case rows and email bodies once written to the report and event log; counts are kept."""
+        self.cases_extracted = len(self.cases)
+        self.cases = []
+        self.email_item.release_bodies()
 
 
 @dataclass
@@ -2,67 +2,127 @@
 Main processing pipeline.
 """
 
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, Union
 
 from src.config import Config
-from src.core.extractors import DataExtractor
+from src.core.body_reduction import reduce_email_body
+from src.core.extractors import DataExtractor, OcrExtraction
 from src.core.models import (
+    CaseMetadata,
     CaseRow,
     EmailItem,
     EmailProcessResult,
     ErrorType,
     ExtractedData,
+    MergeConflict,
     ProcessStatus,
     RunResult,
 )
 from src.core.normalize import Normalizers
 from src.core.priority import PriorityMerger
 from src.core.validators import ValidationError, Validators
+from src.integrations.anthropic.cache import ResponseCache, ResponseCacheError
+from src.integrations.anthropic.fallback import ClaudeFallback, build_claude_fallback, wait_any
+from src.integrations.excel.writer import ExcelWriter, ReportStream
 from src.integrations.graph.auth import GraphAuthClient
 from src.integrations.graph.mail import GraphMailClient
+from src.integrations.logging.event_log import EventLogWriter
+from src.integrations.storage.case_store import CaseStore, CaseStoreAppender
+from src.utils.text import scan_scope
+from src.utils.timing import Timings, recording, span
 
 
-def process_single_email(
+@dataclass
+class EmailExtraction:
+    """Per-source extraction results of one email, before merging."""
+    extractor: DataExtractor
+    extractions: list[ExtractedData] = field(default_factory=list)  # Attachments and body
+    ocr: Optional[OcrExtraction] = None
+    body_chars: int = 0  # Full body text
+    body_chars_extracted: int = 0  # Body text after reduction
+
+    @property
+    def waiting_on_claude(self) -> bool:
+        """True if the OCR extraction has a Claude fallback request outstanding."""
+        return self.ocr is not None and self.ocr.claude_request is not None
+
+
+# (result index, email, extraction, email timings) of an email waiting on Claude
+_WaitingEmail = tuple[int, EmailItem, EmailExtraction, Timings]
+
+
+def extract_email(
     email: EmailItem,
     config: Config,
-    dry_run: bool = False,
-) -> EmailProcessResult:
+    claude_fallback: Optional[ClaudeFallback] = None,
+) -> EmailExtraction:
     """
-    Process a single email.
+    Extract data from all sources of an email.
+
+    A Claude fallback request for the OCR text may still be outstanding
+    afterwards; finish_email waits for it.
 
     Args:
         email: Email item to process.
         config: Application configuration.
-        dry_run: If True, don't mark email as read.
+        claude_fallback: Run-wide Claude fallback executor (optional).
 
     Returns:
-        EmailProcessResult with status and cases.
+        EmailExtraction.
     """
-    try:
-        # Initialize extractor
-        extractor = DataExtractor(config)
+    extractor = DataExtractor(config, claude_fallback)
+    extraction = EmailExtraction(extractor=extractor)
+
+    # 1. OCR (highest priority); a Claude fallback request may run in the background
+    with span("extract.ocr"):
+        extraction.ocr = extractor.start_ocr_extraction(email)
+
+    # 2. Attachments
+    extraction.extractions.extend(extractor.extract_from_attachments(email))
 
-        # Extract from all sources
-        extractions = []
+    # 3. Body (lowest priority)
+    with span("extract.body"):
+        body = reduce_email_body(email)
+        body_data = extractor.extract_from_reduced_body(body) if body else None
+    if body is not None:
+        extraction.body_chars = body.original_length
+        extraction.body_chars_extracted = body.reduced_length
+    if body_data:
+        extraction.extractions.append(body_data)
 
-        # 1. OCR (highest priority)
-        ocr_data = extractor.extract_from_ocr(email)
-        if ocr_data:
-            extractions.append(ocr_data)
+    return extraction
 
-        # 2. Attachments
-        attachment_data = extractor.extract_from_attachments(email)
-        extractions.extend(attachment_data)
 
-        # 3. Body (lowest priority)
-        body_data = extractor.extract_from_body(email)
-        if body_data:
-            extractions.append(body_data)
+def finish_email(
+    email: EmailItem,
+    extraction: EmailExtraction,
+    dry_run: bool = False,
+) -> EmailProcessResult:
+    """
+    Merge, validate and turn an email's extractions into cases.
+
+    Args:
+        email: Email item being processed.
+        extraction: Result of extract_email.
+        dry_run: If True, don't mark email as read.
+
+    Returns:
+        EmailProcessResult with status and cases.
+    """
+    try:
+        extractions = list(extraction.extractions)
+        if extraction.ocr:
+            extractions.insert(0, extraction.extractor.finish_ocr_extraction(extraction.ocr))
 
         # Merge extractions by priority
         merger = PriorityMerger()
-        merged_data, conflicts = merger.merge_all(extractions)
+        with span("merge"):
+            merged_data, conflicts = merger.merge_all(extractions)
+        sources = [e.source_details for e in extractions]
+        conflict_notes = [str(c) for c in conflicts]
 
         # Validate mandatory date gate (HARD STOP)
         try:
@@ -76,6 +136,10 @@ def process_single_email(
                 error_message=str(e),
                 cases=[],
                 marked_as_read=False,
+                sources=sources,
+                conflicts=conflict_notes,
+                body_chars=extraction.body_chars,
+                body_chars_extracted=extraction.body_chars_extracted,
             )
 
         # Generate case rows (one per EAN)
@@ -89,24 +153,58 @@ def process_single_email(
             error_message=None,
             cases=cases,
             marked_as_read=not dry_run,
+            sources=sources,
+            conflicts=conflict_notes,
+            body_chars=extraction.body_chars,
+            body_chars_extracted=extraction.body_chars_extracted,
         )
 
     except Exception as e:
-        # TECHNICAL ERROR - skip email, leave UNREAD, continue processing
-        return EmailProcessResult(
-            email_item=email,
-            status=ProcessStatus.SKIPPED_TECHNICAL_ERROR,
-            error_type=ErrorType.TECHNICAL,
-            error_message=str(e),
-            cases=[],
-            marked_as_read=False,
-        )
+        return _technical_error(email, e)
+
+
+def _technical_error(email: EmailItem, error: Exception) -> EmailProcessResult:
+    """TECHNICAL ERROR - skip email, leave UNREAD, continue processing."""
+    return EmailProcessResult(
+        email_item=email,
+        status=ProcessStatus.SKIPPED_TECHNICAL_ERROR,
+        error_type=ErrorType.TECHNICAL,
+        error_message=str(error),
+        cases=[],
+        marked_as_read=False,
+    )
+
+
+def process_single_email(
+    email: EmailItem,
+    config: Config,
+    dry_run: bool = False,
+    claude_fallback: Optional[ClaudeFallback] = None,
+) -> EmailProcessResult:
+    """
+    Process a single email.
+
+    Args:
+        email: Email item to process.
+        config: Application configuration.
+        dry_run: If True, don't mark email as read.
+        claude_fallback: Run-wide Claude fallback executor (optional).
+
+    Returns:
+        EmailProcessResult with status and cases.
+    """
+    try:
+        extraction = extract_email(email, config, claude_fallback)
+    except Exception as e:
+        return _technical_error(email, e)
+
+    return finish_email(email, extraction, dry_run)
 
 
 def generate_case_rows(
     email: EmailItem,
     merged_data: ExtractedData,
-    conflicts: list[str],
+    conflicts: list[MergeConflict],
 ) -> list[CaseRow]:
     """
     Generate case rows from merged data.
@@ -114,13 +212,41 @@ def generate_case_rows(
     Args:
         email: Email item.
         merged_data: Merged extracted data.
-        conflicts: List of conflict descriptions.
+        conflicts: Merge conflicts.
 
     Returns:
         List of CaseRow objects (one per EAN).
     """
     cases = []
 
+    # Build comments
+    comments_parts = []
+
+    # Add data source info
+    comments_parts.append(f"Sources: {merged_data.source_details}")
+
+    # Add conflicts
+    if conflicts:
+        comments_parts.append("Conflicts: " + "; ".join(str(c) for c in conflicts))
+
+    # Add OCR usage note
+    if "OCR" in merged_data.source_details:
+        comments_parts.append("Used OCR for extraction")
+
+    # Per-email values, shared by all rows of this email
+    meta = CaseMetadata.interned(
+        document_creation_date=merged_data.document_creation_date,
+        delivery_date=merged_data.delivery_date,
+        order_creation_date=merged_data.order_creation_date,
+        supplier_name=Normalizers.normalize_supplier_name(merged_data.supplier_name),
+        supplier_invoice_number=Normalizers.normalize_invoice_number(
+            merged_data.supplier_invoice_number
+        ),
+        email_sender_address=email.sender_address,
+        email_link=email.web_link,
+        comments=" | ".join(comments_parts),
+    )
+
     # If no EANs, create single row with available data
     eans = merged_data.eans if merged_data.eans else ["UNKNOWN"]
 
@@ -149,38 +275,13 @@ def generate_case_rows(
             Normalizers.normalize_price(internal_price) if internal_price else None
         )
 
-        # Build comments
-        comments_parts = []
-
-        # Add data source info
-        comments_parts.append(f"Sources: {merged_data.source_details}")
-
-        # Add conflicts
-        if conflicts:
-            comments_parts.append("Conflicts: " + "; ".join(conflicts))
-
-        # Add OCR usage note
-        if "OCR" in merged_data.source_details:
-            comments_parts.append("Used OCR for extraction")
-
-        comments = " | ".join(comments_parts)
-
         # Create case row
         case = CaseRow(
             unit_store=normalized_store,
             ean_code=normalized_ean,
-            document_creation_date=merged_data.document_creation_date,
-            delivery_date=merged_data.delivery_date,
-            order_creation_date=merged_data.order_creation_date,
             supplier_price=normalized_supplier_price,
             internal_price=normalized_internal_price,
-            supplier_name=Normalizers.normalize_supplier_name(merged_data.supplier_name),
-            supplier_invoice_number=Normalizers.normalize_invoice_number(
-                merged_data.supplier_invoice_number
-            ),
-            email_sender_address=email.sender_address,
-            email_link=email.web_link,
-            comments=comments,
+            meta=meta,
         )
 
         cases.append(case)
@@ -188,61 +289,99 @@ def generate_case_rows(
     return cases
 
 
-def run_pipeline(
+def process_messages(
+    mail_client: GraphMailClient,
+    messages_metadata: list[dict],
     config: Config,
-    date_from: date,
-    date_to: date,
     dry_run: bool = False,
-) -> RunResult:
+    report: Optional[Union[ReportStream, CaseStoreAppender]] = None,
+    claude_fallback: Optional[ClaudeFallback] = None,
+    timings: Optional[Timings] = None,
+    event_log: Optional[EventLogWriter] = None,
+) -> list[EmailProcessResult]:
     """
-    Run the main processing pipeline.
+    Fetch and process messages one by one.
 
     Args:
+        mail_client: Graph mail client.
+        messages_metadata: Message metadata from list_unread_messages.
         config: Application configuration.
-        date_from: Start date (inclusive).
-        date_to: End date (inclusive).
-        dry_run: If True, don't mark emails as read or upload to SharePoint.
+        dry_run: If True, don't mark emails as read.
+        report: If given, each email's cases are appended as soon as it is processed.
+        claude_fallback: Run-wide Claude fallback executor (optional).
+        timings: Run-wide timings; each email's spans are merged in (optional).
+        event_log: JSON-lines event log; each email is appended as it completes (optional).
+
+    Emails whose OCR waits on a Claude fallback request are set aside while
+    the next emails are processed, up to the fallback's concurrency limit, and
+    finished as their requests complete or their deadlines pass. In batch
+    mode they are finished after the batch ends.
 
     Returns:
-        RunResult with statistics.
+        List of EmailProcessResult, one per message in input order (stage
+        timings in .timings). Case rows and bodies are released once
+        written; counts are kept.
     """
-    run_timestamp = datetime.now()
+    results: list[Optional[EmailProcessResult]] = []
 
-    # Initialize Graph API clients
-    auth_client = GraphAuthClient(config)
-    mail_client = GraphMailClient(config, auth_client)
+    # Emails waiting on a Claude request: in flight, and (batch mode) until flush
+    waiting: list[_WaitingEmail] = []
+    deferred: list[_WaitingEmail] = []
 
-    # Get unread messages in date range
-    print(f"Fetching unread messages from {date_from} to {date_to}...")
-    messages_metadata = mail_client.list_unread_messages(date_from, date_to)
-    print(f"Found {len(messages_metadata)} unread messages")
-
-    # Process each email
-    results: list[EmailProcessResult] = []
+    def finish(entry: _WaitingEmail, heading: str) -> None:
+        index, email, extraction, email_timings = entry
+        print(f"\n{heading}: {email.subject or 'No subject'}")
+        try:
+            with recording(email_timings), email_timings.span("email"), scan_scope():
+                result = finish_email(email, extraction, dry_run)
+                results[index] = result
+                _complete_message(mail_client, email, result, report)
+        except Exception as e:
+            # One failing email must not abort the others still waiting
+            print(f"  ✗ Unexpected error: {e}")
+            result = _technical_error(email, e)
+            results[index] = result
+        _record_timings(result, email_timings, timings)
+        _log_result(result, event_log)
 
     for i, msg_metadata in enumerate(messages_metadata, 1):
+        # All request slots taken: finish one before fetching more. This runs
+        # outside any email's span, so no email is charged for another's wait.
+        slots_full = bool(waiting) and len(waiting) >= claude_fallback.max_concurrency
+        for entry in _take_ready(waiting, block=slots_full):
+            finish(entry, "Finishing email after Claude")
+
         print(f"\nProcessing email {i}/{len(messages_metadata)}: {msg_metadata.get('subject', 'No subject')}")
+        email_timings = Timings()
 
         try:
-            # Fetch full email content
-            email = mail_client.get_email_item(msg_metadata)
-
-            # Process email
-            result = process_single_email(email, config, dry_run)
+            with recording(email_timings), email_timings.span("email"), scan_scope():
+                # Fetch full email content
+                with span("graph.fetch"):
+                    email = mail_client.get_email_item(msg_metadata)
 
-            results.append(result)
-
-            # Mark as read if processed successfully (and not dry-run)
-            if result.status == ProcessStatus.PROCESSED and result.marked_as_read:
+                # Extract; attachment payloads are not needed afterwards
                 try:
-                    mail_client.mark_as_read(email.message_id)
-                    print(f"  ✓ Processed: {len(result.cases)} cases extracted, marked as read")
+                    extraction = extract_email(email, config, claude_fallback)
                 except Exception as e:
-                    print(f"  ! Failed to mark as read: {e}")
-            elif result.status == ProcessStatus.SKIPPED_BUSINESS_ERROR:
-                print(f"  ✗ Skipped (BUSINESS): {result.error_message}")
-            elif result.status == ProcessStatus.SKIPPED_TECHNICAL_ERROR:
-                print(f"  ✗ Skipped (TECHNICAL): {result.error_message}")
+                    result = _technical_error(email, e)
+                else:
+                    if claude_fallback is not None and extraction.waiting_on_claude:
+                        entry = (len(results), email, extraction, email_timings)
+                        results.append(None)
+                        if claude_fallback.deferred:
+                            print("  … Waiting for Claude batch")
+                            deferred.append(entry)
+                        else:
+                            print("  … Waiting for Claude")
+                            waiting.append(entry)
+                        continue
+                    result = finish_email(email, extraction, dry_run)
+                finally:
+                    email.release_payloads()
+
+                results.append(result)
+                _complete_message(mail_client, email, result, report)
 
         except Exception as e:
             # Unexpected error - log and continue
@@ -265,85 +404,306 @@ def run_pipeline(
                 )
             )
 
-    # Calculate statistics
-    emails_processed = sum(1 for r in results if r.status == ProcessStatus.PROCESSED)
-    emails_skipped = len(results) - emails_processed
+        _record_timings(results[-1], email_timings, timings)
+        _log_result(results[-1], event_log)
+
+    while waiting:
+        for entry in _take_ready(waiting, block=True):
+            finish(entry, "Finishing email after Claude")
+
+    if deferred:
+        claude_fallback.flush()
+        for entry in deferred:
+            finish(entry, "Finishing email after Claude batch")
+
+    return results
+
+
+def _take_ready(waiting: list[_WaitingEmail], block: bool = False) -> list[_WaitingEmail]:
+    """
+    Remove and return the waiting emails whose Claude request is ready.
+
+    Args:
+        waiting: Emails waiting on Claude (modified in place).
+        block: Wait until at least one is ready.
+
+    Returns:
+        Ready emails, in the order they were set aside.
+    """
+    if block and waiting:
+        wait_any(entry[2].ocr.claude_request for entry in waiting)
+    ready_indexes = {entry[0] for entry in waiting if entry[2].ocr.claude_request.ready}
+    ready = [entry for entry in waiting if entry[0] in ready_indexes]
+    waiting[:] = [entry for entry in waiting if entry[0] not in ready_indexes]
+    return ready
+
+
+def _record_timings(
+    result: EmailProcessResult,
+    email_timings: Timings,
+    timings: Optional[Timings],
+) -> None:
+    """Store an email's stage totals on its result and merge its spans into the run timings."""
+    # Deferred emails are timed in two parts; count them as one email
+    email_timings.samples["email"] = [sum(email_timings.samples.get("email", []))]
+    result.timings = email_timings.totals()
+    if timings is not None:
+        timings.merge(email_timings)
+
+
+def _log_result(result: EmailProcessResult, event_log: Optional[EventLogWriter]) -> None:
+    """Append a completed email to the event log, then drop what the run no longer needs."""
+    if event_log is not None:
+        event_log.write_email(result)
+    result.release()
+
+
+def _complete_message(
+    mail_client: GraphMailClient,
+    email: EmailItem,
+    result: EmailProcessResult,
+    report: Optional[Union[ReportStream, CaseStoreAppender]],
+) -> None:
+    """
+    Append an email's cases to the report and mark it as read if processed.
+
+    A failed report write turns the result into a technical error, so the
+    email stays unread and is retried by the next run.
+    """
+    if report is not None:
+        try:
+            report.extend(result.cases)
+        except Exception as e:
+            result.status = ProcessStatus.SKIPPED_TECHNICAL_ERROR
+            result.error_type = ErrorType.TECHNICAL
+            result.error_message = f"Report write failed: {e}"
+            result.marked_as_read = False
+            result.cases = []
+
+    # Mark as read if processed successfully (and not dry-run)
+    if result.status == ProcessStatus.PROCESSED and result.marked_as_read:
+        try:
+            mail_client.mark_as_read(email.message_id)
+            print(f"  ✓ Processed: {len(result.cases)} cases extracted, marked as read")
+        except Exception as e:
+            print(f"  ! Failed to mark as read: {e}")
+    elif result.status == ProcessStatus.SKIPPED_BUSINESS_ERROR:
+        print(f"  ✗ Skipped (BUSINESS): {result.error_message}")
+    elif result.status == ProcessStatus.SKIPPED_TECHNICAL_ERROR:
+        print(f"  ✗ Skipped (TECHNICAL): {result.error_message}")
+
 
-    # Collect all cases from all emails
-    all_cases = []
-    for result in results:
-        all_cases.extend(result.cases)
+def run_pipeline(
+    config: Config,
+    date_from: date,
+    date_to: date,
+    dry_run: bool = False,
+) -> RunResult:
+    """
+    Run the main processing pipeline.
 
-    cases_extracted = len(all_cases)
+    Args:
+        config: Application configuration.
+        date_from: Start date (inclusive).
+        date_to: End date (inclusive).
+        dry_run: If True, don't mark emails as read or upload to SharePoint.
 
-    # Generate Excel and log files
-    from src.integrations.excel.writer import ExcelWriter
+    Returns:
+        RunResult with statistics.
+    """
     from src.integrations.logging.run_log import RunLogWriter
     from src.integrations.graph.sharepoint import GraphSharePointClient
     import tempfile
     from pathlib import Path
 
-    excel_filename = None
-    log_filename = None
-    sharepoint_upload_success = False
-
-    if cases_extracted > 0 or not dry_run:
-        # Generate filenames
-        excel_writer = ExcelWriter()
-        log_writer = RunLogWriter()
+    run_timestamp = datetime.now()
+    timings = Timings()
 
-        excel_filename = excel_writer.generate_filename(date_from, date_to)
-        log_filename = log_writer.generate_filename(run_timestamp)
+    # Initialize Graph API clients
+    auth_client = GraphAuthClient(config)
+    mail_client = GraphMailClient(config, auth_client)
 
-        # Create temp directory for outputs
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+    # Get unread messages in date range
+    print(f"Fetching unread messages from {date_from} to {date_to}...")
+    with timings.span("graph.list"):
+        messages_metadata = mail_client.list_unread_messages(date_from, date_to)
+    print(f"Found {len(messages_metadata)} unread messages")
 
-            # Write Excel file
-            excel_path = temp_path / excel_filename
-            if cases_extracted > 0:
-                excel_writer.write_report(all_cases, str(excel_path), date_from, date_to)
-                print(f"\nGenerated Excel report: {excel_filename}")
-            else:
-                # Create empty Excel if no cases
-                excel_writer.write_report([], str(excel_path), date_from, date_to)
-                print(f"\nGenerated empty Excel report: {excel_filename}")
+    excel_writer = ExcelWriter()
+    log_writer = RunLogWriter()
 
-            # Write log file
-            log_path = temp_path / log_filename
-            log_writer.write_log(results, str(log_path), run_timestamp)
-            print(f"Generated log file: {log_filename}")
+    excel_filename = excel_writer.generate_filename(date_from, date_to)
+    # Incremental mode keeps one report per period and overwrites it on upload
+    incremental = config.report_mode == "incremental"
+    log_filename = log_writer.generate_filename(run_timestamp)
+    sharepoint_upload_success = False
+    sharepoint_client = None
+
+    # Run-wide resources (Claude cache and executor, event log) are released
+    # even if the run fails; the event log then ends with completed: false
+    with ExitStack() as resources:
+        # One Claude response cache and fallback executor for the whole run (only with an API key)
+        claude_cache = None
+        claude_fallback = None
+        if config.anthropic_api_key:
+            try:
+                claude_cache = ResponseCache.from_config(config)
+                resources.callback(claude_cache.close)
+            except ResponseCacheError as e:
+                print(f"Claude response cache disabled: {e}")
+            try:
+                claude_fallback = build_claude_fallback(config, claude_cache)
+                resources.callback(claude_fallback.shutdown)
+            except Exception as e:
+                print(f"Claude fallback disabled: {e}")
+
+        # JSON-lines event log, kept locally and flushed per email (survives a crashed run)
+        event_log_path = Path(config.event_log_dir) / EventLogWriter.generate_filename(run_timestamp)
+        event_log = resources.enter_context(
+            EventLogWriter(str(event_log_path), run_timestamp, claude_cache.stats if claude_cache else None)
+        )
 
-            # Upload to SharePoint (if not dry-run)
-            if not dry_run:
-                try:
-                    sharepoint_client = GraphSharePointClient(config, auth_client)
+        # Create temp directory for outputs; run-level spans (report, upload) go to the run timings
+        with recording(timings), tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            excel_path = temp_path / excel_filename
 
-                    # Upload Excel
-                    final_excel_name = sharepoint_client.upload_file(
-                        str(excel_path),
-                        filename=excel_filename,
-                        handle_collision=True,
+            if incremental:
+                # Collect new cases in the local store, then rebuild the rolling report.
+                # Each email's cases are committed before it is marked as read, so a
+                # crash later in the run cannot lose them; dry runs never commit.
+                with CaseStore(config.case_store_path) as case_store:
+                    period = Path(excel_filename).stem
+                    appender = CaseStoreAppender(case_store, period, commit_each=not dry_run)
+                    results = process_messages(
+                        mail_client, messages_metadata, config, dry_run, appender, claude_fallback, timings, event_log
                     )
-                    print(f"Uploaded Excel to SharePoint: {final_excel_name}")
+                    cases_extracted = appender.rows_written
 
-                    # Upload log
-                    final_log_name = sharepoint_client.upload_file(
-                        str(log_path),
-                        filename=log_filename,
-                        handle_collision=True,
+                    with excel_writer.open_stream(str(excel_path), config.report_formats) as report:
+                        report.extend(case_store.iter_cases(period))
+                    print(f"\nAppended {cases_extracted} new cases to rolling report ({report.rows_written} total)")
+            else:
+                # Process each email, streaming its cases into the Excel report
+                with excel_writer.open_stream(str(excel_path), config.report_formats) as report:
+                    results = process_messages(
+                        mail_client, messages_metadata, config, dry_run, report, claude_fallback, timings, event_log
                     )
-                    print(f"Uploaded log to SharePoint: {final_log_name}")
+                cases_extracted = report.rows_written
+
+            event_log.close()
+            print(f"Event log: {event_log_path}")
+
+            # Calculate statistics
+            emails_processed = sum(1 for r in results if r.status == ProcessStatus.PROCESSED)
+            emails_skipped = len(results) - emails_processed
+
+            if cases_extracted > 0 or not dry_run:
+                if report.rows_written > 0:
+                    print(f"\nGenerated Excel report: {excel_filename}")
+                else:
+                    print(f"\nGenerated empty Excel report: {excel_filename}")
+
+                # Write log files (text + JSON companion)
+                log_path = temp_path / log_filename
+                cache_stats = claude_cache.stats if claude_cache else None
+                fallback_stats = claude_fallback.stats if claude_fallback else None
+                usage_stats = claude_fallback.client.usage if claude_fallback else None
+                log_writer.write_log(
+                    results, str(log_path), run_timestamp, cache_stats, fallback_stats, usage_stats, timings
+                )
+                json_log_filename = log_writer.generate_json_filename(run_timestamp)
+                json_log_path = temp_path / json_log_filename
+                log_writer.write_json(
+                    results, str(json_log_path), run_timestamp, cache_stats, fallback_stats, usage_stats, timings
+                )
+                print(f"Generated log file: {log_filename}")
+
+                # Upload to SharePoint (if not dry-run)
+                if not dry_run:
+                    try:
+                        sharepoint_client = GraphSharePointClient(config, auth_client)
+
+                        # Upload Excel
+                        final_excel_name = sharepoint_client.upload_file(
+                            str(excel_path),
+                            filename=excel_filename,
+                            handle_collision=not incremental,
+                        )
+                        print(f"Uploaded Excel to SharePoint: {final_excel_name}")
+
+                        # Upload log
+                        final_log_name = sharepoint_client.upload_file(
+                            str(log_path),
+                            filename=log_filename,
+                            handle_collision=True,
+                        )
+                        print(f"Uploaded log to SharePoint: {final_log_name}")
+
+                        # Upload companions under the final names (so _v2 copies stay paired)
+                        companions = [
+                            (Path(path), Path(final_excel_name).with_suffix(Path(path).suffix).name)
+                            for output_format, path in report.paths.items()
+                            if output_format != "xlsx"
+                        ]
+                        log_companions = {json_log_path, event_log_path}
+                        companions.append((json_log_path, Path(final_log_name).with_suffix(".json").name))
+                        companions.append((event_log_path, Path(final_log_name).with_suffix(".jsonl").name))
+
+                        for companion_path, companion_name in companions:
+                            final_name = sharepoint_client.upload_file(
+                                str(companion_path),
+                                filename=companion_name,
+                                handle_collision=not (incremental and companion_path not in log_companions),
+                            )
+                            print(f"Uploaded {companion_path.suffix[1:]} to SharePoint: {final_name}")
+
+                        sharepoint_upload_success = True
+                        excel_filename = final_excel_name
+                        log_filename = final_log_name
+
+                    except Exception as e:
+                        print(f"Failed to upload to SharePoint: {e}")
+                        sharepoint_upload_success = False
+                else:
+                    print("Dry run mode: Skipping SharePoint upload")
+            else:
+                # Dry run without cases: nothing to keep
+                excel_filename = None
+                log_filename = None
 
-                    sharepoint_upload_success = True
-                    excel_filename = final_excel_name
-                    log_filename = final_log_name
 
-                except Exception as e:
-                    print(f"Failed to upload to SharePoint: {e}")
-                    sharepoint_upload_success = False
-            else:
-                print("Dry run mode: Skipping SharePoint upload")
+    # Optional local profile, written last so it includes the uploads
+    if config.timing_profile_dir:
+        profile_path = Path(config.timing_profile_dir) / log_writer.generate_profile_filename(run_timestamp)
+        try:
+            profile_path.parent.mkdir(parents=True, exist_ok=True)
+            log_writer.write_profile(results, str(profile_path), run_timestamp, timings)
+            print(f"Generated timing profile: {profile_path}")
+        except OSError as e:
+            print(f"Failed to write timing profile: {e}")
+
+    # Prometheus textfile metrics (counters continue from the previous file)
+    if config.metrics_textfile:
+        from src.integrations.logging.metrics import MetricsError, RunMetrics
+
+        graph_stats = mail_client.stats
+        if sharepoint_client is not None:
+            graph_stats.merge(sharepoint_client.stats)
+        metrics = RunMetrics()
+        metrics.record_run(
+            run_timestamp,
+            results,
+            cases_extracted,
+            timings,
+            graph_stats,
+            claude_fallback.client.usage if claude_fallback else None,
+            claude_cache.stats if claude_cache else None,
+        )
+        try:
+            metrics.write(config.metrics_textfile)
+        except MetricsError as e:
+            print(f"Failed to write metrics: {e}")
 
     # Create run result
     run_result = RunResult(
@@ -0,0 +1,205 @@
+"""
+Persistent cache of Claude responses.
+
+Unchanged UNREAD emails are reprocessed on every run, and forwarded emails
+often carry identical OCR text, so the same prompt is sent again and again.
+Responses are stored in SQLite keyed by a hash of model + request, expire
+after a TTL and are evicted least-recently-used beyond a size limit.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+
+class ResponseCacheError(Exception):
+    """Response cache error."""
+    pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    latency REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A stored Claude response and what it cost to produce."""
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0  # Seconds the original API call took
+
+
+@dataclass
+class CacheStats:
+    """Cache effectiveness during one run."""
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    latency_saved: float = 0.0  # Seconds
+    input_tokens_saved: int = 0
+    output_tokens_saved: int = 0
+
+    def as_dict(self) -> dict:
+        """Stats as a JSON-ready dict."""
+        data = asdict(self)
+        data["latency_saved"] = round(self.latency_saved, 3)
+        return data
+
+
+def make_cache_key(model: str, **request) -> str:
+    """
+    Hash a request into a cache key.
+
+    Args:
+        model: Model name.
+        **request: Remaining request parameters (system, messages, max_tokens, ...).
+
+    Returns:
+        Hex digest.
+    """
+    raw = json.dumps({"model": model, **request}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed Claude response cache with TTL and LRU eviction."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        """
+        Open (and create if needed) the cache.
+
+        Writes are committed immediately, so a crashed run keeps the
+        responses it already paid for. Safe to share between threads.
+
+        Args:
+            path: SQLite database file.
+            ttl_seconds: Age after which an entry is ignored and removed.
+            max_entries: Entries kept; the least recently used are evicted.
+
+        Raises:
+            ResponseCacheError: If the database cannot be opened.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._conn.execute(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            raise ResponseCacheError(f"Failed to open response cache {path}: {e}") from e
+
+    @classmethod
+    def from_config(cls, config) -> Optional["ResponseCache"]:
+        """
+        Open the cache configured for this run.
+
+        Args:
+            config: Application configuration.
+
+        Returns:
+            ResponseCache, or None if caching is disabled (TTL 0).
+        """
+        if config.claude_cache_ttl_hours <= 0:
+            return None
+        return cls(
+            config.claude_cache_path,
+            ttl_seconds=config.claude_cache_ttl_hours * 3600,
+            max_entries=config.claude_cache_max_entries,
+        )
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a response.
+
+        Args:
+            key: Cache key from make_cache_key.
+
+        Returns:
+            CachedResponse, or None if missing or expired.
+        """
+        with self._lock:
+            now = time.time()
+            row = self._conn.execute(
+                "SELECT response, input_tokens, output_tokens, latency, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None or now - row[4] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+
+            cached = CachedResponse(text=row[0], input_tokens=row[1], output_tokens=row[2], latency=row[3])
+            self.stats.hits += 1
+            self.stats.latency_saved += cached.latency
+            self.stats.input_tokens_saved += cached.input_tokens
+            self.stats.output_tokens_saved += cached.output_tokens
+            return cached
+
+    def put(self, key: str, model: str, response: CachedResponse) -> None:
+        """
+        Store a response, then evict expired and excess entries.
+
+        Args:
+            key: Cache key from make_cache_key.
+            model: Model that produced the response.
+            response: Response text and cost.
+        """
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, response.text, response.input_tokens, response.output_tokens,
+                 response.latency, now, now),
+            )
+            self.stats.stored += 1
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        expired = self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        excess = self._conn.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+            (self.max_entries,),
+        ).rowcount
+        self.stats.evicted += expired + excess
+
+    def count(self) -> int:
+        """Number of stored entries."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
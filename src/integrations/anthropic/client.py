@@ -6,38 +6,128 @@ Claude NEVER invents data, NEVER fills in missing values, NEVER interprets inten
 """
 
 import json
-from typing import Optional
+import time
+from typing import Optional, Union
 
 import anthropic
 
 from src.config import Config
+from src.integrations.anthropic.cache import CachedResponse, ResponseCache, make_cache_key
 from src.integrations.anthropic.prompts import (
-    EXTRACTION_SYSTEM_PROMPT,
     build_conflict_resolution_prompt,
     build_field_extraction_prompt,
-    build_structured_extraction_prompt,
+    build_structured_extraction_content,
+    build_system_blocks,
 )
+from src.integrations.anthropic.trimming import trim_to_budget
+from src.integrations.anthropic.usage import UsageStats
 
 
 class ClaudeClient:
     """Client for Claude API (Anthropic)."""
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        cache: Optional[ResponseCache] = None,
+        max_retries: Optional[int] = None,
+    ):
         """
         Initialize Claude client.
 
         Args:
             config: Application configuration.
+            cache: Response cache shared across the run (optional).
+            max_retries: SDK retries per API call (SDK default if None).
         """
         self.config = config
         self.api_key = config.anthropic_api_key
+        self.cache = cache
+        self.input_token_budget = config.claude_input_token_budget
+        self.usage = UsageStats()
 
         if not self.api_key:
             raise ValueError("Claude API key not configured in .env")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Base URL override: API gateways and local stand-in servers
+        options = {"base_url": config.anthropic_base_url} if config.anthropic_base_url else {}
+        if max_retries is not None:
+            options["max_retries"] = max_retries
+        self.client = anthropic.Anthropic(api_key=self.api_key, **options)
         self.model = "claude-sonnet-4-20250514"
 
+    def _request(self, prompt: Union[str, list[dict]], max_tokens: int) -> dict:
+        """Request parameters (besides the model) for a prompt."""
+        return {
+            "max_tokens": max_tokens,
+            "system": build_system_blocks(),
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def _structured_content(self, text: str) -> list[dict]:
+        """Structured extraction message for a text trimmed to the input token budget."""
+        trimmed = trim_to_budget(text, self.input_token_budget)
+        if trimmed.trimmed:
+            self.usage.record_trim(trimmed.original_tokens - trimmed.tokens)
+        return build_structured_extraction_content(trimmed.text)
+
+    def _complete(
+        self,
+        prompt: Union[str, list[dict]],
+        max_tokens: int,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Send a prompt (or answer it from the cache) and return the response text.
+
+        Args:
+            prompt: User prompt (text or content blocks).
+            max_tokens: Response token limit.
+            timeout: Request timeout in seconds (optional; not part of the cache key).
+
+        Returns:
+            Response text.
+
+        Raises:
+            anthropic.APIError: If the API call fails.
+        """
+        request = self._request(prompt, max_tokens)
+
+        key = None
+        if self.cache is not None:
+            key = make_cache_key(self.model, **request)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.text
+
+        started = time.perf_counter()
+        options = {"timeout": timeout} if timeout is not None else {}
+        message = self.client.messages.create(model=self.model, **request, **options)
+        latency = time.perf_counter() - started
+
+        response_text = message.content[0].text
+        self.usage.record_call(message.usage, latency)
+        print(
+            f"Claude call: {message.usage.input_tokens} input / {message.usage.output_tokens} output "
+            f"tokens in {latency:.1f} s"
+        )
+
+        if key is not None:
+            self.cache.put(key, self.model, self._cached_response(message, latency))
+
+        return response_text
+
+    @staticmethod
+    def _cached_response(message, latency: float) -> CachedResponse:
+        """Cache entry for an API message."""
+        usage = getattr(message, "usage", None)
+        return CachedResponse(
+            text=message.content[0].text,
+            input_tokens=getattr(usage, "input_tokens", 0) or 0,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0,
+            latency=latency,
+        )
+
     def clarify_extraction(
         self,
         text: str,
@@ -64,14 +154,7 @@ class ClaudeClient:
         prompt = build_field_extraction_prompt(field_name, text, context)
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                system=EXTRACTION_SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            response_text = message.content[0].text
+            response_text = self._complete(prompt, max_tokens=1024)
 
             # Parse JSON response
             try:
@@ -106,14 +189,7 @@ class ClaudeClient:
         prompt = build_conflict_resolution_prompt(field_name, values, sources)
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                system=EXTRACTION_SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            response_text = message.content[0].text
+            response_text = self._complete(prompt, max_tokens=1024)
 
             # Parse JSON response
             try:
@@ -126,6 +202,28 @@ class ClaudeClient:
             print(f"Claude API error: {e}")
             return None
 
+    def request_structured_data(self, text: str, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Extract all structured data at once, letting API errors propagate.
+
+        Args:
+            text: Source text (trimmed to the input token budget).
+            timeout: Request timeout in seconds (optional).
+
+        Returns:
+            Dictionary with extracted fields, or None if the response is not JSON.
+
+        Raises:
+            anthropic.APIError: If the API call fails or times out.
+        """
+        response_text = self._complete(self._structured_content(text), max_tokens=2048, timeout=timeout)
+
+        # Parse JSON response
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            return None
+
     def extract_structured_data(self, text: str) -> Optional[dict]:
         """
         Extract all structured data at once using Claude.
@@ -136,25 +234,83 @@ class ClaudeClient:
         Returns:
             Dictionary with extracted fields or None.
         """
-        prompt = build_structured_extraction_prompt(text)
-
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2048,
-                system=EXTRACTION_SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            return self.request_structured_data(text)
+        except Exception as e:
+            print(f"Claude API error: {e}")
+            return None
 
-            response_text = message.content[0].text
+    def run_batch(
+        self,
+        texts: dict[str, str],
+        poll_interval: float = 30.0,
+        timeout: float = 3600.0,
+    ) -> dict[str, Optional[dict]]:
+        """
+        Run structured extraction for many texts via the Message Batches API.
 
-            # Parse JSON response
+        Cached responses are answered locally; the rest is submitted as one
+        batch, polled until it ends, and stored in the cache.
+
+        Args:
+            texts: Source texts by custom id (letters, digits, "_" and "-").
+            poll_interval: Seconds between status checks.
+            timeout: Seconds to wait for the batch before giving up.
+
+        Returns:
+            Extracted fields by custom id (None where a request failed or
+            the response is not JSON).
+
+        Raises:
+            anthropic.APIError: If the batch cannot be created or polled.
+            TimeoutError: If the batch does not end within the timeout.
+        """
+        responses: dict[str, Optional[str]] = {custom_id: None for custom_id in texts}
+        requests = {}
+        keys = {}
+
+        for custom_id, text in texts.items():
+            request = self._request(self._structured_content(text), max_tokens=2048)
+            if self.cache is not None:
+                keys[custom_id] = make_cache_key(self.model, **request)
+                cached = self.cache.get(keys[custom_id])
+                if cached is not None:
+                    responses[custom_id] = cached.text
+                    continue
+            requests[custom_id] = request
+
+        if requests:
+            started = time.monotonic()
+            batch = self.client.messages.batches.create(
+                requests=[
+                    {"custom_id": custom_id, "params": {"model": self.model, **request}}
+                    for custom_id, request in requests.items()
+                ]
+            )
+
+            while batch.processing_status != "ended":
+                if time.monotonic() - started > timeout:
+                    self.client.messages.batches.cancel(batch.id)
+                    raise TimeoutError(f"Claude batch {batch.id} did not finish within {timeout:.0f} s")
+                time.sleep(poll_interval)
+                batch = self.client.messages.batches.retrieve(batch.id)
+
+            # Requests of a batch have no latency of their own: the wall time is
+            # kept per batch, and cache entries save no latency when hit later
+            self.usage.record_batch(time.monotonic() - started)
+            for entry in self.client.messages.batches.results(batch.id):
+                if entry.custom_id not in requests or entry.result.type != "succeeded":
+                    continue
+                message = entry.result.message
+                responses[entry.custom_id] = message.content[0].text
+                self.usage.record_call(message.usage, None)
+                if entry.custom_id in keys:
+                    self.cache.put(keys[entry.custom_id], self.model, self._cached_response(message, 0.0))
+
+        results: dict[str, Optional[dict]] = {}
+        for custom_id, response_text in responses.items():
             try:
-                result = json.loads(response_text)
-                return result
+                results[custom_id] = json.loads(response_text) if response_text is not None else None
             except json.JSONDecodeError:
-                return None
-
-        except Exception as e:
-            print(f"Claude API error: {e}")
-            return None
+                results[custom_id] = None
+        return results
@@ -0,0 +1,322 @@
+"""
+Run-wide executor for the Claude extraction fallback.
+
+Claude calls run on a small thread pool, so the caller keeps extracting
+attachments and the body - and further emails - while requests are in
+flight. The executor enforces:
+- a global concurrency cap (pool size) shared by all emails of the run
+- a deadline per request, counted from submission; the API call gets only
+  the time left and no SDK retries, so a worker is free at the deadline
+- a circuit breaker: after N consecutive failures the fallback is disabled
+  for the rest of the run
+
+In batch mode (ClaudeBatchFallback) requests are only collected during the
+run and sent together through the Message Batches API at the end; callers
+defer the affected emails until flush() has filled in the results.
+"""
+
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass
+from typing import Iterable, Optional
+
+
+@dataclass
+class FallbackStats:
+    """Claude fallback outcomes during one run."""
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    skipped: int = 0  # Not sent because the circuit was open
+
+    def as_dict(self) -> dict:
+        """Stats as a JSON-ready dict."""
+        return asdict(self)
+
+
+class CircuitBreaker:
+    """Opens after a number of consecutive failures and stays open."""
+
+    def __init__(self, failure_threshold: int):
+        """
+        Initialize breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+        """
+        self.failure_threshold = failure_threshold
+        self.consecutive_failures = 0
+        self.open = False
+
+    def record_success(self) -> None:
+        """Reset the failure streak."""
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failure; open the circuit at the threshold."""
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.open = True
+
+
+@dataclass
+class PendingRequest:
+    """A Claude request in flight."""
+    future: Future
+    deadline: float  # time.monotonic() value
+
+    @property
+    def ready(self) -> bool:
+        """True once result() will not block: the request ended or its deadline passed."""
+        return self.future.done() or time.monotonic() >= self.deadline
+
+
+def wait_any(pending: Iterable[PendingRequest]) -> None:
+    """
+    Block until at least one request is ready (see PendingRequest.ready).
+
+    Args:
+        pending: Requests in flight (not empty).
+    """
+    pending = list(pending)
+    if any(request.ready for request in pending):
+        return
+    timeout = max(0.0, min(request.deadline for request in pending) - time.monotonic())
+    wait([request.future for request in pending], timeout=timeout, return_when=FIRST_COMPLETED)
+
+
+class ClaudeFallback:
+    """Runs structured-extraction requests with a concurrency cap, deadlines and a circuit breaker."""
+
+    # Results are only available after flush() (batch mode)
+    deferred = False
+
+    def __init__(
+        self,
+        client,
+        max_concurrency: int = 4,
+        deadline_seconds: float = 60.0,
+        failure_threshold: int = 3,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            client: ClaudeClient (anything with request_structured_data).
+            max_concurrency: Requests in flight at most (0: no worker threads,
+                for subclasses that send requests themselves).
+            deadline_seconds: Time allowed per request, from submission.
+            failure_threshold: Consecutive failures/timeouts that disable the fallback.
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.deadline_seconds = deadline_seconds
+        self.breaker = CircuitBreaker(failure_threshold)
+        self.stats = FallbackStats()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="claude")
+            if max_concurrency > 0 else None
+        )
+
+    @property
+    def available(self) -> bool:
+        """False once the circuit breaker has disabled the fallback."""
+        return not self.breaker.open
+
+    def submit(self, text: str) -> Optional[PendingRequest]:
+        """
+        Start a structured-extraction request.
+
+        Args:
+            text: Source text.
+
+        Returns:
+            PendingRequest, or None if the fallback is disabled.
+        """
+        if self.breaker.open:
+            self.stats.skipped += 1
+            return None
+
+        self.stats.submitted += 1
+        deadline = time.monotonic() + self.deadline_seconds
+        future = self._executor.submit(self._run, text, deadline)
+        return PendingRequest(future=future, deadline=deadline)
+
+    def _run(self, text: str, deadline: float) -> Optional[dict]:
+        """Worker: call Claude with the time left until the deadline (queued requests may have none)."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("deadline passed before the request started")
+        return self.client.request_structured_data(text, remaining)
+
+    def result(self, pending: Optional[PendingRequest]) -> Optional[dict]:
+        """
+        Wait for a request until its deadline.
+
+        Args:
+            pending: Request from submit (None is passed through).
+
+        Returns:
+            Extracted fields, or None on failure, timeout or non-JSON response.
+        """
+        if pending is None:
+            return None
+        self._before_result(pending)
+
+        try:
+            data = pending.future.result(timeout=max(0.0, pending.deadline - time.monotonic()))
+        except FutureTimeoutError:
+            pending.future.cancel()
+            self.stats.timed_out += 1
+            self._record_failure("deadline exceeded")
+            return None
+        except Exception as e:
+            self.stats.failed += 1
+            self._record_failure(str(e))
+            return None
+
+        self.stats.succeeded += 1
+        self.breaker.record_success()
+        return data
+
+    def _before_result(self, pending: PendingRequest) -> None:
+        """Hook run before waiting on a request."""
+        pass
+
+    def flush(self) -> None:
+        """Send collected requests (batch mode only)."""
+        pass
+
+    def _record_failure(self, reason: str) -> None:
+        was_open = self.breaker.open
+        self.breaker.record_failure()
+        print(f"Claude fallback failed: {reason}")
+        if self.breaker.open and not was_open:
+            print(
+                f"Claude fallback disabled for the rest of the run "
+                f"after {self.breaker.consecutive_failures} consecutive failures"
+            )
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; requests not yet started are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ClaudeBatchFallback(ClaudeFallback):
+    """Collects fallback requests of a run and sends them as one Message Batch."""
+
+    deferred = True
+
+    def __init__(
+        self,
+        client,
+        poll_interval: float = 30.0,
+        timeout: float = 3600.0,
+    ):
+        """
+        Initialize collector.
+
+        Args:
+            client: ClaudeClient (anything with run_batch).
+            poll_interval: Seconds between batch status checks.
+            timeout: Seconds to wait for the batch to end.
+        """
+        # Requests go out in one batch from flush(); no worker threads
+        super().__init__(client, max_concurrency=0, deadline_seconds=timeout, failure_threshold=1)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._texts: dict[str, str] = {}  # custom_id -> text
+        self._futures: dict[str, list[Future]] = {}
+
+    def submit(self, text: str) -> Optional[PendingRequest]:
+        """
+        Register a request for the next flush; identical texts share one request.
+
+        Args:
+            text: Source text.
+
+        Returns:
+            PendingRequest resolved by flush().
+        """
+        custom_id = self._custom_id(text)
+        if custom_id not in self._texts:
+            self._texts[custom_id] = text
+            self.stats.submitted += 1
+
+        future: Future = Future()
+        self._futures.setdefault(custom_id, []).append(future)
+        return PendingRequest(future=future, deadline=float("inf"))
+
+    @staticmethod
+    def _custom_id(text: str) -> str:
+        return "req-" + hashlib.sha1(text.encode("utf-8")).hexdigest()[:32]
+
+    def _before_result(self, pending: PendingRequest) -> None:
+        # Waiting on an unsent request: send everything collected so far
+        if not pending.future.done():
+            self.flush()
+        pending.deadline = time.monotonic()
+
+    def flush(self) -> None:
+        """Submit collected requests as one batch, wait for it and resolve all futures."""
+        if not self._texts:
+            return
+
+        texts, futures = self._texts, self._futures
+        self._texts, self._futures = {}, {}
+
+        print(f"Submitting Claude batch with {len(texts)} requests...")
+        try:
+            results = self.client.run_batch(texts, poll_interval=self.poll_interval, timeout=self.timeout)
+        except Exception as e:
+            for waiting in futures.values():
+                for future in waiting:
+                    future.set_exception(e)
+            return
+
+        for custom_id, waiting in futures.items():
+            for future in waiting:
+                future.set_result(results.get(custom_id))
+
+    def shutdown(self) -> None:
+        """Cancel requests that were never sent."""
+        for waiting in self._futures.values():
+            for future in waiting:
+                future.cancel()
+        self._texts, self._futures = {}, {}
+        super().shutdown()
+
+
+def build_claude_fallback(config, cache=None) -> ClaudeFallback:
+    """
+    Build the Claude fallback for the configured mode.
+
+    Args:
+        config: Application configuration.
+        cache: Claude response cache (optional).
+
+    Returns:
+        ClaudeBatchFallback for CLAUDE_MODE=batch, otherwise ClaudeFallback.
+
+    Raises:
+        ValueError: If the API key is not configured.
+    """
+    from src.integrations.anthropic.client import ClaudeClient
+
+    if config.claude_mode == "batch":
+        return ClaudeBatchFallback(
+            ClaudeClient(config, cache=cache),
+            poll_interval=config.claude_batch_poll_seconds,
+            timeout=config.claude_batch_timeout_seconds,
+        )
+    # No SDK retries: they would keep a worker busy past the request deadline
+    return ClaudeFallback(
+        ClaudeClient(config, cache=cache, max_retries=0),
+        max_concurrency=config.claude_max_concurrency,
+        deadline_seconds=config.claude_deadline_seconds,
+        failure_threshold=config.claude_failure_threshold,
+    )
@@ -8,6 +8,8 @@ CRITICAL RULES:
 - Only work with explicitly provided text
 """
 
+from src.integrations.anthropic.trimming import estimate_tokens
+
 EXTRACTION_SYSTEM_PROMPT = """You are a data extraction assistant. Your job is to extract structured data from text.
 
 CRITICAL RULES:
@@ -100,17 +102,9 @@ Respond with ONLY the best value in this format:
     return prompt
 
 
-def build_structured_extraction_prompt(text: str) -> str:
-    """
-    Build prompt for extracting all structured data at once.
-
-    Args:
-        text: Source text.
-
-    Returns:
-        Prompt string.
-    """
-    return f"""Extract structured data from the following text for a price discrepancy case.
+# Static part of the structured extraction prompt. It precedes the source text,
+# so together with the system prompt it forms the prompt prefix.
+STRUCTURED_EXTRACTION_INSTRUCTIONS = """Extract structured data from the text below for a price discrepancy case.
 
 RULES:
 - Only extract explicitly present data
@@ -118,21 +112,83 @@ RULES:
 - Return null for missing fields
 - Dates in ISO format (YYYY-MM-DD)
 - Prices as numbers (no currency symbols)
-
-Text:
-{text}
+- Lines may be omitted from the text; "[...]" marks where lines were left out
 
 Respond with JSON in this exact format:
-{{
+{
   "ean_codes": [<list of EAN codes found, or empty array>],
   "delivery_date": "<date or null>",
   "order_creation_date": "<date or null>",
   "document_creation_date": "<date or null>",
   "supplier_name": "<name or null>",
   "supplier_invoice_number": "<number or null>",
-  "supplier_prices": {{"<ean>": <price>, ...}},
-  "internal_prices": {{"<ean>": <price>, ...}},
-  "stores": {{"<ean>": "<store>", ...}}
-}}
+  "supplier_prices": {"<ean>": <price>, ...},
+  "internal_prices": {"<ean>": <price>, ...},
+  "stores": {"<ean>": "<store>", ...}
+}
 
 Return ONLY valid JSON. No explanations."""
+
+# Marks the end of the cacheable prompt prefix (prompt caching)
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Shortest prefix the API caches for Sonnet models (tokens); a marker on a
+# shorter prefix has no effect
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+
+def prefix_is_cacheable() -> bool:
+    """
+    Check whether system prompt + instructions are long enough to be cached.
+
+    Returns:
+        True if the static prefix reaches PROMPT_CACHE_MIN_TOKENS (estimated).
+    """
+    prefix = EXTRACTION_SYSTEM_PROMPT + STRUCTURED_EXTRACTION_INSTRUCTIONS
+    return estimate_tokens(prefix) >= PROMPT_CACHE_MIN_TOKENS
+
+
+def build_system_blocks() -> list[dict]:
+    """
+    Build the system prompt as content blocks.
+
+    The system prompt is cached, if at all, as part of the prefix that ends
+    with the structured extraction instructions.
+
+    Returns:
+        System content blocks.
+    """
+    return [{"type": "text", "text": EXTRACTION_SYSTEM_PROMPT}]
+
+
+def build_structured_extraction_content(text: str) -> list[dict]:
+    """
+    Build the structured extraction message as content blocks.
+
+    The static instructions come first and carry the prompt-cache marker
+    when the prefix is long enough to be cached; the source text follows
+    in its own block.
+
+    Args:
+        text: Source text.
+
+    Returns:
+        User message content blocks.
+    """
+    instructions = {"type": "text", "text": STRUCTURED_EXTRACTION_INSTRUCTIONS}
+    if prefix_is_cacheable():
+        instructions["cache_control"] = CACHE_CONTROL
+    return [instructions, {"type": "text", "text": f"Text:\n{text}"}]
+
+
+def build_structured_extraction_prompt(text: str) -> str:
+    """
+    Build prompt for extracting all structured data at once.
+
+    Args:
+        text: Source text.
+
+    Returns:
+        Prompt string.
+    """
+    return "\n\n".join(block["text"] for block in build_structured_extraction_content(text))
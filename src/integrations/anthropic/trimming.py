@@ -0,0 +1,139 @@
+"""
+Relevance trimming of source text sent to Claude.
+
+Multi-page OCR dumps are mostly boilerplate (addresses, terms, footers), while
+the fields Claude extracts sit on lines with EAN-like numbers, prices, dates
+and keyword anchors. Over the token budget only those lines (and their direct
+neighbours) are kept, in original order, with "[...]" marking each gap.
+"""
+
+import re
+from dataclasses import dataclass
+
+from src.utils.text import DATE_ANCHOR_PATTERN, PRICE_PATTERN
+
+# Rough token estimate; Claude tokenizers average ~4 characters per token
+CHARS_PER_TOKEN = 4
+
+# Line relevance, highest first
+_MARKER_SCORE = 4  # "[OCR from ...]" source markers
+_EAN_SCORE = 3
+_ANCHOR_SCORE = 2
+_NUMBER_SCORE = 1
+
+GAP_MARKER = "[...]"
+
+# EAN-like digit runs (8-14 digits, also with OCR-inserted spaces removed)
+_EAN_LIKE_PATTERN = re.compile(r'\d{8,14}')
+_ANCHOR_PATTERN = re.compile(
+    r'\b(?:ean|gtin|art(?:ikel|icle)?|price|cena|cene|invoice|račun|faktura|'
+    r'store|unit|enota|trgovina|supplier|dobavitelj|prodajalec)',
+    re.IGNORECASE,
+)
+_NUMBER_PATTERN = re.compile(r'\d')
+
+
+@dataclass
+class TrimmedText:
+    """Text after trimming, with its estimated size before and after."""
+    text: str
+    original_tokens: int
+    tokens: int
+    lines_dropped: int = 0
+
+    @property
+    def trimmed(self) -> bool:
+        """True if any line was dropped."""
+        return self.lines_dropped > 0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text.
+
+    Args:
+        text: Text.
+
+    Returns:
+        Estimated tokens (rounded up).
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _line_score(line: str) -> int:
+    """Relevance of one line (0 = irrelevant)."""
+    if line.startswith("[OCR from "):
+        return _MARKER_SCORE
+    if _EAN_LIKE_PATTERN.search(line.replace(" ", "")):
+        return _EAN_SCORE
+    if _ANCHOR_PATTERN.search(line) or DATE_ANCHOR_PATTERN.search(line):
+        return _ANCHOR_SCORE
+    if PRICE_PATTERN.search(line) or _NUMBER_PATTERN.search(line):
+        return _NUMBER_SCORE
+    return 0
+
+
+def trim_to_budget(text: str, token_budget: int, context_lines: int = 1) -> TrimmedText:
+    """
+    Keep the most relevant lines of a text within a token budget.
+
+    Lines are ranked by relevance (source markers, EAN-like numbers, keyword
+    anchors, other numbers); neighbours of a relevant line rank just below it.
+    Lines are taken best-first while they fit, then emitted in original order.
+
+    Args:
+        text: Source text (e.g. combined OCR text).
+        token_budget: Estimated tokens allowed; 0 or less disables trimming.
+        context_lines: Neighbouring lines kept around each relevant line.
+
+    Returns:
+        TrimmedText (the original text if it already fits).
+    """
+    original_tokens = estimate_tokens(text)
+    if token_budget <= 0 or original_tokens <= token_budget:
+        return TrimmedText(text=text, original_tokens=original_tokens, tokens=original_tokens)
+
+    lines = text.splitlines()
+
+    # Priority per line: own score, or a neighbour's score minus a half step
+    priority = [0.0] * len(lines)
+    for index, line in enumerate(lines):
+        score = _line_score(line)
+        if not score:
+            continue
+        priority[index] = max(priority[index], score)
+        for offset in range(1, context_lines + 1):
+            for neighbour in (index - offset, index + offset):
+                if 0 <= neighbour < len(lines) and lines[neighbour].strip():
+                    priority[neighbour] = max(priority[neighbour], score - 0.5)
+
+    ranked = sorted(
+        (index for index in range(len(lines)) if priority[index] > 0),
+        key=lambda index: (-priority[index], index),
+    )
+
+    # Each kept line costs its text plus a newline; reserve room for gap markers
+    gap_cost = estimate_tokens(GAP_MARKER + "\n")
+    kept = set()
+    used = 0
+    for index in ranked:
+        cost = estimate_tokens(lines[index] + "\n") + gap_cost
+        if used + cost > token_budget:
+            continue
+        kept.add(index)
+        used += cost
+
+    output = []
+    for index, line in enumerate(lines):
+        if index in kept:
+            output.append(line)
+        elif not output or output[-1] != GAP_MARKER:
+            output.append(GAP_MARKER)
+
+    trimmed = "\n".join(output)
+    return TrimmedText(
+        text=trimmed,
+        original_tokens=original_tokens,
+        tokens=estimate_tokens(trimmed),
+        lines_dropped=len(lines) - len(kept),
+    )
@@ -0,0 +1,107 @@
+"""
+Token and latency accounting for Claude API calls.
+
+Cache hits (see cache.py) are not API calls and are not counted here.
+Requests answered through a Message Batch have no latency of their own;
+they count as calls (tokens) and the batch wall time is kept separately.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class UsageStats:
+    """Claude API usage during one run (safe to update from worker threads)."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0  # Prompt prefix written to the prompt cache
+    cache_read_input_tokens: int = 0  # Prompt prefix served from the prompt cache
+    latency: float = 0.0  # Seconds, all direct (non-batch) calls
+    max_latency: float = 0.0
+    batch_calls: int = 0  # Calls answered through a Message Batch (included in calls)
+    batches: int = 0
+    batch_wall_time: float = 0.0  # Seconds from batch creation to its end, all batches
+    trimmed_prompts: int = 0  # Prompts whose source text was cut to the token budget
+    trimmed_tokens: int = 0  # Estimated tokens removed by trimming
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_call(self, usage, latency: Optional[float]) -> None:
+        """
+        Add one API call.
+
+        Args:
+            usage: Message usage from the API (missing counters count as 0).
+            latency: Seconds the call took; None for a request of a batch.
+        """
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += _count(usage, "input_tokens")
+            self.output_tokens += _count(usage, "output_tokens")
+            self.cache_creation_input_tokens += _count(usage, "cache_creation_input_tokens")
+            self.cache_read_input_tokens += _count(usage, "cache_read_input_tokens")
+            if latency is None:
+                self.batch_calls += 1
+            else:
+                self.latency += latency
+                self.max_latency = max(self.max_latency, latency)
+
+    def record_batch(self, wall_time: float) -> None:
+        """
+        Add one Message Batch.
+
+        Args:
+            wall_time: Seconds from creation until the batch ended.
+        """
+        with self._lock:
+            self.batches += 1
+            self.batch_wall_time += wall_time
+
+    def record_trim(self, tokens_removed: int) -> None:
+        """
+        Add one trimmed prompt.
+
+        Args:
+            tokens_removed: Estimated tokens cut from its source text.
+        """
+        with self._lock:
+            self.trimmed_prompts += 1
+            self.trimmed_tokens += tokens_removed
+
+    @property
+    def tokens_per_call(self) -> float:
+        """Average input + output tokens per call."""
+        return (self.input_tokens + self.output_tokens) / self.calls if self.calls else 0.0
+
+    @property
+    def latency_per_call(self) -> float:
+        """Average seconds per direct (non-batch) call."""
+        direct_calls = self.calls - self.batch_calls
+        return self.latency / direct_calls if direct_calls else 0.0
+
+    def as_dict(self) -> dict:
+        """Stats as a JSON-ready dict."""
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_creation_input_tokens": self.cache_creation_input_tokens,
+            "cache_read_input_tokens": self.cache_read_input_tokens,
+            "tokens_per_call": round(self.tokens_per_call, 1),
+            "latency": round(self.latency, 3),
+            "latency_per_call": round(self.latency_per_call, 3),
+            "max_latency": round(self.max_latency, 3),
+            "batch_calls": self.batch_calls,
+            "batches": self.batches,
+            "batch_wall_time": round(self.batch_wall_time, 3),
+            "trimmed_prompts": self.trimmed_prompts,
+            "trimmed_tokens": self.trimmed_tokens,
+        }
+
+
+def _count(usage, name: str) -> int:
+    """Integer usage counter, or 0 if absent."""
+    value = getattr(usage, name, 0)
+    return value if isinstance(value, int) else 0
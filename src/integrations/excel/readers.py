@@ -0,0 +1,277 @@
+"""
+Spreadsheet readers.
+
+One interface over the spreadsheet formats suppliers send. Each reader turns
+file content into (sheet_name, rows) pairs with rows produced lazily, so the
+structured extractor can consume any format the same way. Content is read
+through a file object, so spilled attachment blobs are never loaded whole.
+
+Backends:
+- .xlsx/.xlsm: openpyxl in read-only mode
+- .xls/.xlsb/.ods: python-calamine (Rust, imported on first use)
+- .csv/.tsv: stdlib csv with encoding and dialect sniffing
+"""
+
+import codecs
+import csv
+import io
+from collections import Counter
+from typing import Any, Iterator, Optional, Sequence
+
+import openpyxl
+
+from src.utils.blob import Blob, BlobLike, as_blob
+
+
+class SpreadsheetReaderError(Exception):
+    """Spreadsheet reading error."""
+    pass
+
+
+# (sheet_name, lazily produced rows)
+SheetRows = tuple[str, Iterator[Sequence[Any]]]
+
+# Encodings tried in order for text files; latin-1 never fails
+CSV_ENCODINGS = ("utf-8-sig", "cp1250", "latin-1")
+
+# Delimiters considered when sniffing the CSV dialect
+CSV_DELIMITERS = ",;\t|"
+
+# Bytes inspected for encoding and dialect detection
+CSV_SNIFF_BYTES = 64 * 1024
+
+
+class SpreadsheetReader:
+    """Base class for format-specific spreadsheet readers."""
+
+    name = ""
+    extensions: tuple[str, ...] = ()
+    content_types: tuple[str, ...] = ()
+
+    def iter_sheets(self, content: BlobLike) -> Iterator[SheetRows]:
+        """
+        Yield the sheets of a file.
+
+        Args:
+            content: File content (bytes or blob).
+
+        Yields:
+            (sheet_name, rows) pairs; each row is a sequence of cell values.
+
+        Raises:
+            SpreadsheetReaderError: If the file cannot be read.
+        """
+        raise NotImplementedError
+
+
+class OpenpyxlReader(SpreadsheetReader):
+    """Office Open XML workbooks via openpyxl (read-only mode)."""
+
+    name = "xlsx"
+    extensions = (".xlsx", ".xlsm")
+    content_types = (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "application/vnd.ms-excel.sheet.macroenabled.12",
+    )
+
+    def iter_sheets(self, content: BlobLike) -> Iterator[SheetRows]:
+        with as_blob(content).open() as stream:
+            try:
+                workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+            except Exception as e:
+                raise SpreadsheetReaderError(f"Failed to load XLSX: {e}") from e
+
+            try:
+                for sheet in workbook.worksheets:
+                    yield sheet.title, sheet.iter_rows(values_only=True)
+            finally:
+                workbook.close()
+
+
+class CalamineReader(SpreadsheetReader):
+    """Legacy Excel, binary Excel and OpenDocument via python-calamine."""
+
+    name = "calamine"
+    extensions = (".xls", ".xlsb", ".ods")
+    content_types = (
+        "application/vnd.ms-excel",
+        "application/vnd.ms-excel.sheet.binary.macroenabled.12",
+        "application/vnd.oasis.opendocument.spreadsheet",
+    )
+
+    def iter_sheets(self, content: BlobLike) -> Iterator[SheetRows]:
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError as e:
+            raise SpreadsheetReaderError("python-calamine is not installed") from e
+
+        try:
+            # Format is detected from the content, so mislabeled files still open
+            with as_blob(content).open() as stream:
+                workbook = CalamineWorkbook.from_filelike(stream)
+        except Exception as e:
+            raise SpreadsheetReaderError(f"Failed to load spreadsheet: {e}") from e
+
+        for sheet_name in workbook.sheet_names:
+            try:
+                sheet = workbook.get_sheet_by_name(sheet_name)
+            except Exception:
+                continue  # Chart sheets and other non-data sheets
+            yield sheet_name, (self._normalize_row(row) for row in sheet.iter_rows())
+
+    @staticmethod
+    def _normalize_row(row: Sequence[Any]) -> tuple:
+        """Match openpyxl values: None for empty cells, int for whole numbers."""
+        return tuple(
+            None if cell == "" else int(cell) if isinstance(cell, float) and cell.is_integer() else cell
+            for cell in row
+        )
+
+
+class CsvReader(SpreadsheetReader):
+    """Delimited text files as a single sheet."""
+
+    name = "csv"
+    extensions = (".csv", ".tsv")
+    content_types = ("text/csv", "text/tab-separated-values", "application/csv")
+
+    def iter_sheets(self, content: BlobLike) -> Iterator[SheetRows]:
+        blob = as_blob(content)
+        encoding, dialect = sniff_csv_format(blob)
+        yield "CSV", self._iter_rows(blob, encoding, dialect)
+
+    @staticmethod
+    def _iter_rows(blob: Blob, encoding: str, dialect: type[csv.Dialect]) -> Iterator[tuple]:
+        """Rows with empty cells as None; the stream stays open until the rows are consumed."""
+        with io.TextIOWrapper(blob.open(), encoding=encoding, newline="") as stream:
+            for row in csv.reader(stream, dialect):
+                yield tuple(cell if cell != "" else None for cell in row)
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Pick the first encoding from CSV_ENCODINGS that decodes the sample.
+
+    Args:
+        sample: Leading bytes of the file (may end mid-character).
+
+    Returns:
+        Encoding name.
+    """
+    for encoding in CSV_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return CSV_ENCODINGS[-1]
+
+
+def guess_delimiter(sample: str) -> str:
+    """
+    Pick the delimiter that splits the most sample lines into the same number of fields.
+
+    csv.Sniffer alone tends to choose "," for semicolon files with decimal
+    commas, so the delimiter is decided here first.
+
+    Args:
+        sample: Leading text of the file.
+
+    Returns:
+        One of CSV_DELIMITERS (defaults to ",").
+    """
+    lines = [line for line in sample.splitlines()[:-1] or sample.splitlines() if line.strip()]
+    best, best_score = ",", (0, 0)
+
+    for delimiter in CSV_DELIMITERS:
+        counts = Counter(line.count(delimiter) for line in lines)
+        counts.pop(0, None)
+        if not counts:
+            continue
+        fields, lines_matching = max(counts.items(), key=lambda item: (item[1], item[0]))
+        score = (lines_matching, fields)
+        if score > best_score:
+            best, best_score = delimiter, score
+
+    return best
+
+
+def sniff_csv_format(content: BlobLike) -> tuple[str, type[csv.Dialect]]:
+    """
+    Detect encoding and dialect of delimited text.
+
+    Args:
+        content: File content (bytes or blob); only the first CSV_SNIFF_BYTES are read.
+
+    Returns:
+        Tuple of (encoding, csv dialect). Falls back to the excel dialect
+        with the guessed delimiter when sniffing fails.
+    """
+    sample_bytes = as_blob(content).head(CSV_SNIFF_BYTES)
+    encoding = detect_encoding(sample_bytes)
+    sample = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample_bytes, final=False)
+    delimiter = guess_delimiter(sample)
+
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=delimiter)
+    except csv.Error:
+        dialect = type("SniffedDialect", (csv.excel,), {"delimiter": delimiter})
+
+    return encoding, dialect
+
+
+# Readers in lookup order
+SPREADSHEET_READERS: list[SpreadsheetReader] = [OpenpyxlReader(), CalamineReader(), CsvReader()]
+
+
+def get_spreadsheet_reader(filename: str, content_type: str = "") -> Optional[SpreadsheetReader]:
+    """
+    Select the reader for an attachment.
+
+    The file extension wins over the content type, since mail clients often
+    send any spreadsheet (CSV included) as application/vnd.ms-excel.
+
+    Args:
+        filename: Attachment filename.
+        content_type: Attachment MIME type.
+
+    Returns:
+        Matching reader, or None if the file is not a spreadsheet.
+    """
+    lower_name = filename.lower()
+    for reader in SPREADSHEET_READERS:
+        if lower_name.endswith(reader.extensions):
+            return reader
+
+    lower_type = (content_type or "").lower()
+    for reader in SPREADSHEET_READERS:
+        if lower_type in reader.content_types:
+            return reader
+
+    return None
+
+
+def sheets_to_text(sheets: Iterator[SheetRows]) -> str:
+    """
+    Render sheets as plain text ("[Sheet: name]" line, then tab-separated rows).
+
+    Args:
+        sheets: (sheet_name, rows) pairs.
+
+    Returns:
+        Plain text representation of all sheets.
+    """
+    text_parts = []
+
+    for sheet_name, rows in sheets:
+        text_parts.append(f"[Sheet: {sheet_name}]")
+
+        for row in rows:
+            # Convert row to string, skip empty rows
+            row_str = "\t".join(str(cell) if cell is not None else "" for cell in row)
+            if row_str.strip():
+                text_parts.append(row_str)
+
+        text_parts.append("")  # Empty line between sheets
+
+    return "\n".join(text_parts)
@@ -1,18 +1,27 @@
 """
 Excel report writer.
 
-Writes CaseRow data to Excel file with mandatory column order.
+Writes CaseRow data to Excel file with mandatory column order, optionally
+with CSV and Parquet copies (same columns, typed dates and prices).
 """
 
+import csv
 from datetime import date
+from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Sequence
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.utils import get_column_letter
 
 from src.core.models import CaseRow
+from src.utils.timing import span
+
+
+# Price precision of columnar outputs
+CENT = Decimal("0.01")
 
 
 class ExcelWriter:
@@ -54,43 +63,45 @@ class ExcelWriter:
             date_from: Start date of run.
             date_to: End date of run.
         """
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws: Worksheet = wb.active
-        ws.title = "Price Discrepancies"
-
-        # Write header row
-        for col_idx, header in enumerate(self.HEADERS, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.font = Font(bold=True)
+        with self.open_stream(output_path) as report:
+            report.extend(cases)
 
-        # Write data rows
-        for row_idx, case in enumerate(cases, start=2):
-            self._write_case_row(ws, row_idx, case)
+    def open_stream(self, output_path: str, formats: Sequence[str] = ("xlsx",)) -> "ReportStream":
+        """
+        Open a report that accepts case rows as they arrive.
 
-        # Auto-adjust column widths
-        for col_idx in range(1, len(self.HEADERS) + 1):
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = 20
+        Rows go through a write-only workbook (and, if requested, CSV and
+        Parquet files with the same columns), so memory stays flat no matter
+        how many cases are appended. The files are complete once the stream
+        is closed (use it as a context manager).
 
-        # Save workbook
-        wb.save(output_path)
+        Args:
+            output_path: Output file path.
+            formats: Output formats ("xlsx", "csv", "parquet").
+
+        Returns:
+            ReportStream with the header rows already written.
+        """
+        return ReportStream(output_path, self.HEADERS, formats)
 
-    def _write_case_row(self, ws: Worksheet, row_idx: int, case: CaseRow) -> None:
+    @classmethod
+    def _case_values(cls, case: CaseRow) -> list:
         """
-        Write a single case row to worksheet.
+        Cell values of a single case row.
 
         Args:
-            ws: Worksheet.
-            row_idx: Row index (1-based).
             case: Case row data.
+
+        Returns:
+            Values in HEADERS order.
         """
         # Column order must match HEADERS
-        values = [
+        return [
             case.unit_store,  # 1. Unit (Store)
             case.ean_code,  # 2. EAN Code
-            self._format_date(case.document_creation_date),  # 3. Document Creation Date
-            self._format_date(case.delivery_date),  # 4. Delivery Date
-            self._format_date(case.order_creation_date),  # 5. Order Creation Date
+            cls._format_date(case.document_creation_date),  # 3. Document Creation Date
+            cls._format_date(case.delivery_date),  # 4. Delivery Date
+            cls._format_date(case.order_creation_date),  # 5. Order Creation Date
             case.supplier_price,  # 6. Supplier Price
             case.internal_price,  # 7. Internal (Own) Price
             case.supplier_name or "",  # 8. Supplier Name
@@ -100,8 +111,31 @@ class ExcelWriter:
             case.comments,  # 12. Comments
         ]
 
-        for col_idx, value in enumerate(values, start=1):
-            ws.cell(row=row_idx, column=col_idx, value=value)
+    @staticmethod
+    def _typed_values(case: CaseRow) -> list:
+        """
+        Typed cell values of a single case row for columnar outputs.
+
+        Args:
+            case: Case row data.
+
+        Returns:
+            Values in HEADERS order: dates as date, prices as Decimal, None for missing.
+        """
+        return [
+            case.unit_store,
+            case.ean_code,
+            case.document_creation_date,
+            case.delivery_date,
+            case.order_creation_date,
+            None if case.supplier_price is None else Decimal(str(case.supplier_price)).quantize(CENT),
+            None if case.internal_price is None else Decimal(str(case.internal_price)).quantize(CENT),
+            case.supplier_name,
+            case.supplier_invoice_number,
+            case.email_sender_address,
+            case.email_link,
+            case.comments,
+        ]
 
     @staticmethod
     def _format_date(date_value: Optional[date]) -> str:
@@ -131,3 +165,197 @@ class ExcelWriter:
                 f"Price_Discrepancies_{date_from.strftime('%Y-%m-%d')}_to_"
                 f"{date_to.strftime('%Y-%m-%d')}.xlsx"
             )
+
+
+class ReportWriterError(Exception):
+    """Report writing error."""
+    pass
+
+
+class _XlsxSink:
+    """Write-only Excel workbook; rows are flushed to disk as they are appended."""
+
+    SHEET_TITLE = "Price Discrepancies"
+    COLUMN_WIDTH = 20
+
+    def __init__(self, output_path: str, headers: list[str]):
+        self.output_path = output_path
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(self.SHEET_TITLE)
+
+        # Column widths must be set before the first row in write-only mode
+        for col_idx in range(1, len(headers) + 1):
+            self._sheet.column_dimensions[get_column_letter(col_idx)].width = self.COLUMN_WIDTH
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(self._sheet, value=header)
+            cell.font = Font(bold=True)
+            header_cells.append(cell)
+        self._sheet.append(header_cells)
+
+    def write(self, case: CaseRow) -> None:
+        self._sheet.append(ExcelWriter._case_values(case))
+
+    def close(self) -> None:
+        self._workbook.save(self.output_path)
+
+
+class _CsvSink:
+    """UTF-8 CSV with ISO dates and two-decimal prices."""
+
+    def __init__(self, output_path: str, headers: list[str]):
+        self.output_path = output_path
+        self._file = open(output_path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(headers)
+
+    def write(self, case: CaseRow) -> None:
+        self._writer.writerow([
+            "" if value is None else
+            f"{value:.2f}" if isinstance(value, Decimal) else
+            value.isoformat() if isinstance(value, date) else value
+            for value in ExcelWriter._typed_values(case)
+        ])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetSink:
+    """Parquet file with date32 dates and decimal prices, written in row groups."""
+
+    ROW_GROUP_SIZE = 10_000
+
+    def __init__(self, output_path: str, headers: list[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ReportWriterError("Parquet output requires pyarrow") from e
+
+        self.output_path = output_path
+        self._pa = pa
+        self._headers = headers
+        self._schema = pa.schema([
+            pa.field(header, kind)
+            for header, kind in zip(headers, [
+                pa.string(), pa.string(),
+                pa.date32(), pa.date32(), pa.date32(),
+                pa.decimal128(12, 2), pa.decimal128(12, 2),
+                pa.string(), pa.string(), pa.string(), pa.string(), pa.string(),
+            ])
+        ])
+        self._writer = pq.ParquetWriter(output_path, self._schema)
+        self._buffer: list[list] = []
+
+    def write(self, case: CaseRow) -> None:
+        self._buffer.append(ExcelWriter._typed_values(case))
+        if len(self._buffer) >= self.ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        columns = list(zip(*self._buffer)) if self._buffer else [[] for _ in self._headers]
+        table = self._pa.Table.from_arrays(
+            [self._pa.array(list(column), type=f.type) for column, f in zip(columns, self._schema)],
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self) -> None:
+        if self._buffer:
+            self._flush()
+        self._writer.close()
+
+
+# Output format → (file suffix, sink class)
+REPORT_SINKS = {
+    "xlsx": (".xlsx", _XlsxSink),
+    "csv": (".csv", _CsvSink),
+    "parquet": (".parquet", _ParquetSink),
+}
+
+
+class ReportStream:
+    """Report that accepts case rows as they arrive and writes every configured format."""
+
+    def __init__(self, output_path: str, headers: list[str], formats: Sequence[str] = ("xlsx",)):
+        """
+        Create the output files and write their headers.
+
+        Args:
+            output_path: Output file path; other formats use the same stem.
+            headers: Column headers in mandatory order.
+            formats: Output formats (keys of REPORT_SINKS).
+
+        Raises:
+            ReportWriterError: If a format is unknown or its backend is missing
+                (sinks opened before the failing one are closed first).
+        """
+        self.rows_written = 0
+        self.paths: dict[str, str] = {}
+        self._sinks = []
+
+        unknown = [f for f in formats if f not in REPORT_SINKS]
+        if unknown:
+            raise ReportWriterError(f"Unknown report format: {', '.join(unknown)}")
+
+        base = Path(output_path)
+        try:
+            for output_format in formats:
+                suffix, sink_class = REPORT_SINKS[output_format]
+                path = str(base.with_suffix(suffix))
+                self._sinks.append(sink_class(path, headers))
+                self.paths[output_format] = path
+        except Exception:
+            # Release the sinks already opened (temporary workbook, file handles)
+            for sink in self._sinks:
+                try:
+                    sink.close()
+                except Exception:
+                    pass
+            raise
+
+        self.output_path = self.paths.get("xlsx", output_path)
+        self._closed = False
+
+    def append(self, case: CaseRow) -> None:
+        """Append one case row."""
+        for sink in self._sinks:
+            sink.write(case)
+        self.rows_written += 1
+
+    def extend(self, cases: Iterable[CaseRow]) -> None:
+        """Append case rows in order."""
+        with span("report.write"):
+            for case in cases:
+                self.append(case)
+
+    def close(self) -> None:
+        """
+        Finish and save all files.
+
+        Every sink is closed even if an earlier one fails; the first error is
+        raised afterwards, and a second close() does not retry.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        error = None
+        with span("report.write"):
+            for sink in self._sinks:
+                try:
+                    sink.close()
+                except Exception as e:
+                    if error is None:
+                        error = e
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> "ReportStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
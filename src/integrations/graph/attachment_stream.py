@@ -0,0 +1,284 @@
+"""
+Streaming decoder for Graph attachment list responses.
+
+The attachments endpoint returns every file inline as a base64 "contentBytes"
+string. Parsing the response with json.loads keeps the response text, the
+base64 string and the decoded bytes alive together (~3x the file size).
+
+Here the response is read chunk by chunk: contentBytes values are decoded as
+they arrive and written straight into a BlobWriter (memory or spool file),
+while everything else (the small metadata) is collected into a skeleton
+document with a placeholder index in place of each payload. The skeleton is
+parsed with json.loads at the end.
+"""
+
+import binascii
+import json
+from typing import Iterable, Iterator, Optional
+
+from src.utils.blob import BLOB_MEMORY_LIMIT, Blob, BlobWriter
+
+
+class AttachmentStreamError(Exception):
+    """Malformed attachment response."""
+    pass
+
+
+# JSON key holding the base64 payload
+CONTENT_KEY = b"contentBytes"
+
+# Single-character escapes that may appear inside a base64 JSON string ("\/" in particular)
+_SIMPLE_ESCAPES = {ord("/"): "/", ord("n"): "\n", ord("r"): "\r", ord("t"): "\t"}
+
+# Characters an escape in a payload may stand for ("\u002B" for "+" etc.);
+# whitespace is dropped
+_BASE64_ALPHABET = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=")
+_ESCAPE_WHITESPACE = frozenset(" \t\r\n")
+_HEX_DIGITS = frozenset(b"0123456789abcdefABCDEF")
+_UNICODE_ESCAPE = ord("u")
+
+_WHITESPACE = frozenset(b" \t\r\n")
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_COLON = ord(":")
+
+
+def _unescape_payload(sequence: bytes) -> bytes:
+    """
+    Resolve an escape sequence found inside a payload.
+
+    Args:
+        sequence: Escape without the backslash ("/", "n", "u002B", ...).
+
+    Returns:
+        Base64 text the escape stands for (empty for whitespace).
+
+    Raises:
+        AttachmentStreamError: If the escape is not a base64 character or whitespace.
+    """
+    char = None
+    if sequence[0] == _UNICODE_ESCAPE:
+        if len(sequence) == 5 and all(digit in _HEX_DIGITS for digit in sequence[1:]):
+            char = chr(int(sequence[1:], 16))
+    else:
+        char = _SIMPLE_ESCAPES.get(sequence[0])
+
+    if char in _ESCAPE_WHITESPACE:
+        return b""
+    if char in _BASE64_ALPHABET:
+        return char.encode("ascii")
+    raise AttachmentStreamError(
+        f"Unexpected escape in attachment content: \\{sequence.decode('ascii', 'replace')}"
+    )
+
+
+class _Base64Sink:
+    """Decode base64 text in pieces of any length into a BlobWriter."""
+
+    def __init__(self, memory_limit: int):
+        self.writer = BlobWriter(memory_limit)
+        self._pending = b""  # Undecoded tail (fewer than 4 characters)
+
+    def feed(self, text: bytes) -> None:
+        if self._pending:
+            text = self._pending + text
+        usable = len(text) - len(text) % 4
+        self._pending = text[usable:]
+        if usable:
+            self.writer.write(binascii.a2b_base64(text[:usable]))
+
+    def finish(self) -> Blob:
+        if self._pending:
+            # Unpadded tail; a2b_base64 tolerates the missing padding
+            self.writer.write(binascii.a2b_base64(self._pending + b"=" * (-len(self._pending) % 4)))
+            self._pending = b""
+        return self.writer.finish()
+
+
+class AttachmentStreamParser:
+    """Push parser separating contentBytes payloads from response metadata."""
+
+    def __init__(self, memory_limit: int = BLOB_MEMORY_LIMIT):
+        """
+        Initialize parser.
+
+        Args:
+            memory_limit: Decoded size above which a payload goes to disk.
+        """
+        self.memory_limit = memory_limit
+        self.blobs: list[Blob] = []
+
+        self._skeleton = bytearray()
+        self._in_string = False
+        self._escape = False
+        self._string = bytearray()  # Current string (outside payloads)
+        self._after_key = False  # Last string was CONTENT_KEY
+        self._await_value = False  # ... and its colon has been seen
+        self._payload: Optional[_Base64Sink] = None
+        self._payload_escape: Optional[bytearray] = None  # Escape read so far inside a payload
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Consume the next piece of the response body.
+
+        Args:
+            chunk: Raw response bytes.
+
+        Raises:
+            AttachmentStreamError: If the payload is not valid base64.
+        """
+        pos = 0
+        end = len(chunk)
+
+        while pos < end:
+            if self._payload is not None:
+                pos = self._feed_payload(chunk, pos)
+                continue
+
+            byte = chunk[pos]
+            pos += 1
+
+            if self._in_string:
+                self._skeleton.append(byte)
+                if self._escape:
+                    self._escape = False
+                    self._string.append(byte)
+                elif byte == _BACKSLASH:
+                    self._escape = True
+                    self._string.append(byte)
+                elif byte == _QUOTE:
+                    self._in_string = False
+                    self._after_key = self._string == CONTENT_KEY
+                    self._string.clear()
+                else:
+                    self._string.append(byte)
+                continue
+
+            if byte in _WHITESPACE:
+                self._skeleton.append(byte)
+                continue
+
+            if self._await_value and byte == _QUOTE:
+                # Payload starts: placeholder in the skeleton, bytes to the sink
+                self._skeleton += b'"%d"' % len(self.blobs)
+                self._payload = _Base64Sink(self.memory_limit)
+                self._await_value = False
+                continue
+
+            self._await_value = self._after_key and byte == _COLON
+            self._after_key = False
+            self._skeleton.append(byte)
+            if byte == _QUOTE:
+                self._in_string = True
+
+    def _feed_payload(self, chunk: bytes, pos: int) -> int:
+        """Decode payload text from pos; return the position after what was consumed."""
+        try:
+            if self._payload_escape is not None:
+                # Escapes are rare; read them byte by byte (\uXXXX may span chunks)
+                self._payload_escape.append(chunk[pos])
+                if self._payload_escape[0] == _UNICODE_ESCAPE and len(self._payload_escape) < 5:
+                    return pos + 1
+                sequence = bytes(self._payload_escape)
+                self._payload_escape = None
+                self._payload.feed(_unescape_payload(sequence))
+                return pos + 1
+
+            quote = chunk.find(b'"', pos)
+            backslash = chunk.find(b"\\", pos, quote if quote != -1 else len(chunk))
+            stop = backslash if backslash != -1 else quote if quote != -1 else len(chunk)
+
+            self._payload.feed(chunk[pos:stop])
+            if stop == backslash:
+                self._payload_escape = bytearray()
+                return stop + 1
+            if stop == quote:
+                self.blobs.append(self._payload.finish())
+                self._payload = None
+                return stop + 1
+        except binascii.Error as e:
+            self.discard()
+            raise AttachmentStreamError(f"Invalid base64 attachment content: {e}") from e
+        except AttachmentStreamError:
+            self.discard()
+            raise
+
+        return stop
+
+    def close(self) -> dict:
+        """
+        Finish parsing.
+
+        Returns:
+            Parsed response; each contentBytes value is replaced by its Blob.
+
+        Raises:
+            AttachmentStreamError: If the response ended early or is not valid JSON.
+        """
+        if self._payload is not None or self._in_string:
+            self.discard()
+            raise AttachmentStreamError("Attachment response ended inside a string")
+
+        try:
+            data = json.loads(self._skeleton)
+        except ValueError as e:
+            self.discard()
+            raise AttachmentStreamError(f"Invalid attachment response: {e}") from e
+
+        for item in data.get("value", []) if isinstance(data, dict) else []:
+            if isinstance(item, dict) and isinstance(item.get("contentBytes"), str):
+                item["contentBytes"] = self.blobs[int(item["contentBytes"])]
+
+        return data
+
+    def discard(self) -> None:
+        """Release the payload in progress and every payload decoded so far."""
+        if self._payload is not None:
+            self._payload.writer.abort()
+            self._payload = None
+        for blob in self.blobs:
+            blob.close()
+        self.blobs.clear()
+
+
+def parse_attachment_stream(
+    chunks: Iterable[bytes],
+    memory_limit: int = BLOB_MEMORY_LIMIT,
+) -> dict:
+    """
+    Parse an attachment list response without materializing the payloads as text.
+
+    Args:
+        chunks: Response body pieces (e.g. requests' iter_content).
+        memory_limit: Decoded size above which a payload goes to disk.
+
+    Returns:
+        Parsed response; "contentBytes" values are Blobs instead of base64 strings.
+
+    Raises:
+        AttachmentStreamError: If the response is malformed.
+    """
+    parser = AttachmentStreamParser(memory_limit)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+    except BaseException:
+        # E.g. the connection dropped mid-response: no spool file may outlive it
+        parser.discard()
+        raise
+    return parser.close()
+
+
+def iter_file_attachments(data: dict) -> Iterator[dict]:
+    """
+    Yield file attachments (not item/reference attachments) of a parsed response.
+
+    Args:
+        data: Parsed attachment list response.
+
+    Yields:
+        Attachment dicts; contentBytes is a Blob.
+    """
+    for item in data.get("value", []):
+        if item.get("@odata.type") == "#microsoft.graph.fileAttachment":
+            yield item
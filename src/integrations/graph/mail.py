@@ -2,7 +2,6 @@
 Microsoft Graph API - Mail operations.
 """
 
-import base64
 from datetime import date, datetime
 from typing import Optional
 
@@ -10,8 +9,16 @@ import requests
 
 from src.config import Config
 from src.core.models import EmailAttachment, EmailItem
+from src.integrations.graph.attachment_stream import (
+    AttachmentStreamError,
+    iter_file_attachments,
+    parse_attachment_stream,
+)
 from src.integrations.graph.auth import GraphAuthClient
 from src.integrations.graph.queries import build_list_messages_params
+from src.integrations.graph.stats import GraphRequestStats
+from src.utils.blob import Blob
+from src.utils.timing import span
 
 
 class GraphMailError(Exception):
@@ -19,6 +26,10 @@ class GraphMailError(Exception):
     pass
 
 
+# Response bytes read per step when streaming attachments
+ATTACHMENT_STREAM_CHUNK_SIZE = 64 * 1024
+
+
 class GraphMailClient:
     """Handles mail operations via Microsoft Graph API."""
 
@@ -34,6 +45,7 @@ class GraphMailClient:
         """
         self.config = config
         self.auth_client = auth_client
+        self.stats = GraphRequestStats()
 
     def list_unread_messages(
         self,
@@ -68,6 +80,7 @@ class GraphMailClient:
                 headers=self.auth_client.get_headers(),
                 params=params if url == f"{self.GRAPH_BASE_URL}/users/{self.config.mailbox_user_id}/messages" else None,
             )
+            self.stats.record("list_messages", response.status_code)
 
             if response.status_code != 200:
                 raise GraphMailError(
@@ -92,6 +105,25 @@ class GraphMailClient:
         Returns:
             Tuple of (html_body, text_body).
 
+        Raises:
+            GraphMailError: If API request fails.
+        """
+        body, _ = self.get_message_bodies(message_id)
+        return body
+
+    def get_message_bodies(
+        self,
+        message_id: str,
+    ) -> tuple[tuple[Optional[str], Optional[str]], tuple[Optional[str], Optional[str]]]:
+        """
+        Get full body and unique body (content new to this message) in one request.
+
+        Args:
+            message_id: Message ID.
+
+        Returns:
+            Tuple of ((html_body, text_body), (unique_html, unique_text)).
+
         Raises:
             GraphMailError: If API request fails.
         """
@@ -103,6 +135,7 @@ class GraphMailClient:
             headers=self.auth_client.get_headers(),
             params=params,
         )
+        self.stats.record("get_message", response.status_code)
 
         if response.status_code != 200:
             raise GraphMailError(
@@ -110,8 +143,14 @@ class GraphMailClient:
             )
 
         data = response.json()
-        body = data.get("body", {})
-        body_type = body.get("contentType", "text").lower()
+
+        return self._split_body(data.get("body")), self._split_body(data.get("uniqueBody"))
+
+    @staticmethod
+    def _split_body(body: Optional[dict]) -> tuple[Optional[str], Optional[str]]:
+        """Split a Graph itemBody into (html, text) by its content type."""
+        body = body or {}
+        body_type = (body.get("contentType") or "text").lower()
         body_content = body.get("content")
 
         if body_type == "html":
@@ -134,35 +173,40 @@ class GraphMailClient:
         """
         url = f"{self.GRAPH_BASE_URL}/users/{self.config.mailbox_user_id}/messages/{message_id}/attachments"
 
-        response = requests.get(
-            url,
-            headers=self.auth_client.get_headers(),
-        )
-
-        if response.status_code != 200:
-            raise GraphMailError(
-                f"Failed to get attachments: {response.status_code} {response.text}"
+        with span("graph.attachments"):
+            response = requests.get(
+                url,
+                headers=self.auth_client.get_headers(),
+                stream=True,
             )
+            self.stats.record("get_attachments", response.status_code)
 
-        data = response.json()
-        attachments = []
+            with response:
+                if response.status_code != 200:
+                    raise GraphMailError(
+                        f"Failed to get attachments: {response.status_code} {response.text}"
+                    )
 
-        for item in data.get("value", []):
-            attachment_type = item.get("@odata.type")
+                # Payloads are decoded while the response is read, never held as text
+                try:
+                    data = parse_attachment_stream(response.iter_content(chunk_size=ATTACHMENT_STREAM_CHUNK_SIZE))
+                except (AttachmentStreamError, requests.RequestException) as e:
+                    raise GraphMailError(f"Failed to read attachments: {e}") from e
 
-            # Only handle file attachments (not item attachments)
-            if attachment_type == "#microsoft.graph.fileAttachment":
-                content_bytes_b64 = item.get("contentBytes", "")
-                content_bytes = base64.b64decode(content_bytes_b64)
+        attachments = []
 
-                attachments.append(
-                    EmailAttachment(
-                        filename=item.get("name", "unknown"),
-                        content_type=item.get("contentType", "application/octet-stream"),
-                        content=content_bytes,
-                        size=item.get("size", len(content_bytes)),
-                    )
+        # Only handle file attachments (not item attachments)
+        for item in iter_file_attachments(data):
+            content = item.get("contentBytes") or Blob()
+
+            attachments.append(
+                EmailAttachment(
+                    filename=item.get("name", "unknown"),
+                    content_type=item.get("contentType", "application/octet-stream"),
+                    content=content,
+                    size=item.get("size", content.size),
                 )
+            )
 
         return attachments
 
@@ -206,8 +250,8 @@ class GraphMailClient:
         """
         message_id = message_metadata["id"]
 
-        # Get body
-        body_html, body_text = self.get_message_body(message_id)
+        # Get body (full and unique)
+        (body_html, body_text), (unique_html, unique_text) = self.get_message_bodies(message_id)
 
         # Get attachments
         attachments = self.get_attachments(message_id)
@@ -234,6 +278,8 @@ class GraphMailClient:
             attachments=regular_attachments,
             inline_images=inline_images,
             web_link=message_metadata.get("webLink"),
+            unique_body_html=unique_html,
+            unique_body_text=unique_text,
         )
 
     def mark_as_read(self, message_id: str) -> None:
@@ -253,6 +299,7 @@ class GraphMailClient:
             headers=self.auth_client.get_headers(),
             json={"isRead": True},
         )
+        self.stats.record("mark_as_read", response.status_code)
 
         if response.status_code not in (200, 204):
             raise GraphMailError(
@@ -9,6 +9,8 @@ import requests
 
 from src.config import Config
 from src.integrations.graph.auth import GraphAuthClient
+from src.integrations.graph.stats import GraphRequestStats
+from src.utils.timing import span
 
 
 class GraphSharePointError(Exception):
@@ -31,6 +33,7 @@ class GraphSharePointClient:
         """
         self.config = config
         self.auth_client = auth_client
+        self.stats = GraphRequestStats()
 
     def _check_file_exists(self, filename: str) -> bool:
         """
@@ -52,6 +55,7 @@ class GraphSharePointClient:
             url,
             headers=self.auth_client.get_headers(),
         )
+        self.stats.record("check_file", response.status_code)
 
         return response.status_code == 200
 
@@ -115,29 +119,31 @@ class GraphSharePointClient:
         # Determine target filename
         target_filename = filename or local_file.name
 
-        # Handle collision if needed
-        if handle_collision:
-            target_filename = self._generate_unique_filename(target_filename)
-
-        # Upload file
-        folder_path = self.config.sharepoint_folder_path.strip("/")
-        url = (
-            f"{self.GRAPH_BASE_URL}/sites/{self.config.sharepoint_site_id}"
-            f"/drives/{self.config.sharepoint_drive_id}/root:/{folder_path}/{target_filename}:/content"
-        )
+        with span("upload"):
+            # Handle collision if needed
+            if handle_collision:
+                target_filename = self._generate_unique_filename(target_filename)
 
-        with open(local_file, "rb") as f:
-            file_content = f.read()
+            # Upload file
+            folder_path = self.config.sharepoint_folder_path.strip("/")
+            url = (
+                f"{self.GRAPH_BASE_URL}/sites/{self.config.sharepoint_site_id}"
+                f"/drives/{self.config.sharepoint_drive_id}/root:/{folder_path}/{target_filename}:/content"
+            )
 
-        # Use PUT for files <= 4MB (simple upload)
-        response = requests.put(
-            url,
-            headers={
-                **self.auth_client.get_headers(),
-                "Content-Type": "application/octet-stream",
-            },
-            data=file_content,
-        )
+            with open(local_file, "rb") as f:
+                file_content = f.read()
+
+            # Use PUT for files <= 4MB (simple upload)
+            response = requests.put(
+                url,
+                headers={
+                    **self.auth_client.get_headers(),
+                    "Content-Type": "application/octet-stream",
+                },
+                data=file_content,
+            )
+            self.stats.record("upload", response.status_code)
 
         if response.status_code not in (200, 201):
             raise GraphSharePointError(
@@ -185,6 +191,7 @@ class GraphSharePointClient:
             },
             data=content,
         )
+        self.stats.record("upload", response.status_code)
 
         if response.status_code not in (200, 201):
             raise GraphSharePointError(
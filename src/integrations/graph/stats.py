@@ -0,0 +1,48 @@
+"""
+Graph API request counters.
+
+Each Graph client counts its requests by operation and HTTP status;
+responses with status 429 (throttled) are also counted separately.
+"""
+
+from dataclasses import dataclass, field
+
+# Graph answers with 429 Too Many Requests when a client is throttled
+THROTTLED_STATUS = 429
+
+
+@dataclass
+class GraphRequestStats:
+    """Graph requests made during one run."""
+    requests: dict[tuple[str, int], int] = field(default_factory=dict)  # (operation, status) -> count
+    throttled: dict[str, int] = field(default_factory=dict)  # operation -> count
+
+    def record(self, operation: str, status_code: int) -> None:
+        """
+        Count one response.
+
+        Args:
+            operation: Client operation, e.g. "list_messages".
+            status_code: HTTP status of the response.
+        """
+        key = (operation, status_code)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        if status_code == THROTTLED_STATUS:
+            self.throttled[operation] = self.throttled.get(operation, 0) + 1
+
+    def merge(self, other: "GraphRequestStats") -> None:
+        """
+        Add the counts of another client.
+
+        Args:
+            other: Stats to merge in.
+        """
+        for key, count in other.requests.items():
+            self.requests[key] = self.requests.get(key, 0) + count
+        for operation, count in other.throttled.items():
+            self.throttled[operation] = self.throttled.get(operation, 0) + count
+
+    @property
+    def total(self) -> int:
+        """All requests."""
+        return sum(self.requests.values())
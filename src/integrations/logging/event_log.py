@@ -0,0 +1,122 @@
+"""
+JSON-lines event log.
+
+One JSON object per line, written while the run progresses: a "run_start"
+record, one "email" record as each email completes, and a "run_end" record.
+Every record is flushed immediately, so a crashed run still leaves a
+readable partial log for monitoring.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.core.models import EmailProcessResult, ProcessStatus
+from src.integrations.anthropic.cache import CacheStats
+
+
+class EventLogWriter:
+    """Appends run events to a JSON-lines file."""
+
+    def __init__(
+        self,
+        output_path: str,
+        run_timestamp: datetime,
+        claude_cache_stats: Optional[CacheStats] = None,
+    ):
+        """
+        Create the file and write the "run_start" record.
+
+        Args:
+            output_path: Output file path (parent directories are created).
+            run_timestamp: Timestamp of run start.
+            claude_cache_stats: Claude response cache stats of the run (optional);
+                each email record gets the cache hits since the previous record.
+        """
+        self.output_path = output_path
+        self.run_timestamp = run_timestamp
+        self.claude_cache_stats = claude_cache_stats
+        self.summary = {status.value: 0 for status in ProcessStatus}
+        self.emails = 0
+        self._cache_hits_seen = claude_cache_stats.hits if claude_cache_stats else 0
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(output_path, "w", encoding="utf-8")
+        self._write({"event": "run_start", "run_timestamp": run_timestamp.isoformat(timespec="seconds")})
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def write_email(self, result: EmailProcessResult) -> None:
+        """
+        Append the record of a completed email.
+
+        Args:
+            result: Email processing result.
+        """
+        cache_hits = 0
+        if self.claude_cache_stats is not None:
+            cache_hits = self.claude_cache_stats.hits - self._cache_hits_seen
+            self._cache_hits_seen = self.claude_cache_stats.hits
+
+        self.emails += 1
+        self.summary[result.status.value] += 1
+
+        self._write({
+            "event": "email",
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "message_id": result.email_item.message_id,
+            "sender": result.email_item.sender_address,
+            "subject": result.email_item.subject,
+            "received": result.email_item.received_datetime.isoformat(timespec="seconds"),
+            "status": result.status.value,
+            "error_type": result.error_type.value if result.error_type else None,
+            "error_message": result.error_message,
+            "cases_extracted": result.cases_extracted,
+            "marked_as_read": result.marked_as_read,
+            "sources": result.sources,
+            "conflicts": result.conflicts,
+            "body_chars": result.body_chars,
+            "body_chars_extracted": result.body_chars_extracted,
+            "timings": result.timings,
+            "claude_cache_hits": cache_hits,
+        })
+
+    def close(self, completed: bool = True) -> None:
+        """
+        Write the "run_end" record and close the file.
+
+        Args:
+            completed: False if the run was aborted by an exception.
+        """
+        if self._file.closed:
+            return
+        self._write({
+            "event": "run_end",
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "completed": completed,
+            "total_emails": self.emails,
+            "summary": self.summary,
+        })
+        self._file.close()
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(completed=exc_type is None)
+
+    @staticmethod
+    def generate_filename(run_timestamp: datetime) -> str:
+        """
+        Generate filename for the event log.
+
+        Args:
+            run_timestamp: Timestamp of run.
+
+        Returns:
+            Filename string.
+        """
+        return f"Run_Log_{run_timestamp.strftime('%Y%m%d_%H%M%S')}.jsonl"
@@ -0,0 +1,384 @@
+"""
+Metrics export in Prometheus textfile format.
+
+The node-exporter textfile collector reads *.prom files from a directory, so
+the file is written to a temporary name and moved into place. Each run is a
+separate process, so counters and histograms continue from the values in
+the previous file and keep increasing across runs; gauges describe the last
+run only.
+"""
+
+import math
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.core.models import EmailProcessResult
+from src.integrations.anthropic.cache import CacheStats
+from src.integrations.anthropic.usage import UsageStats
+from src.integrations.graph.stats import GraphRequestStats
+from src.utils.timing import Timings
+
+METRIC_PREFIX = "price_discrepancy_"
+
+# Seconds; stages range from milliseconds (merge) to minutes (OCR of long PDFs)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_SAMPLE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL_PATTERN = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+class MetricsError(Exception):
+    """Metrics export error."""
+    pass
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in key
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _parse_labels(text: Optional[str]) -> dict[str, str]:
+    if not text:
+        return {}
+    return {
+        name: re.sub(r'\\(.)', lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+        for name, value in _LABEL_PATTERN.findall(text)
+    }
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        """
+        Initialize counter.
+
+        Args:
+            name: Full metric name.
+            help_text: HELP line.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Add to the counter of a label set."""
+        key = _label_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[tuple[str, LabelKey, float]]:
+        """(name, labels, value) lines of the exposition."""
+        for key, value in sorted(self.values.items()):
+            yield self.name, key, value
+
+    def load_sample(self, name: str, labels: dict[str, str], value: float) -> None:
+        """Continue from a value of the previous file."""
+        if name == self.name:
+            self.inc(value, **labels)
+
+
+class Gauge(Counter):
+    """Value that describes the last run (not continued across runs)."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        """Set the value of a label set."""
+        self.values[_label_key(labels)] = value
+
+    def load_sample(self, name: str, labels: dict[str, str], value: float) -> None:
+        """Gauges are not continued."""
+        pass
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize histogram.
+
+        Args:
+            name: Full metric name.
+            help_text: HELP line.
+            buckets: Upper bounds in ascending order (+Inf is added).
+        """
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.counts: dict[LabelKey, list[float]] = {}  # Cumulative, one per bucket
+        self.sums: dict[LabelKey, float] = {}
+
+    def _series(self, key: LabelKey) -> list[float]:
+        if key not in self.counts:
+            self.counts[key] = [0] * len(self.buckets)
+            self.sums[key] = 0.0
+        return self.counts[key]
+
+    def observe(self, value: float, **labels) -> None:
+        """Add one observation to a label set."""
+        key = _label_key(labels)
+        counts = self._series(key)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self.sums[key] += value
+
+    def samples(self) -> Iterable[tuple[str, LabelKey, float]]:
+        """(name, labels, value) lines of the exposition."""
+        for key in sorted(self.counts):
+            for bound, count in zip(self.buckets, self.counts[key]):
+                yield f"{self.name}_bucket", key + (("le", _format_value(bound)),), count
+            yield f"{self.name}_sum", key, self.sums[key]
+            yield f"{self.name}_count", key, self.counts[key][-1]
+
+    def load_sample(self, name: str, labels: dict[str, str], value: float) -> None:
+        """Continue from a value of the previous file (unknown bucket bounds are dropped)."""
+        if name == f"{self.name}_bucket":
+            bound = labels.pop("le", None)
+            bounds = [_format_value(b) for b in self.buckets]
+            if bound in bounds:
+                self._series(_label_key(labels))[bounds.index(bound)] += value
+        elif name == f"{self.name}_sum":
+            key = _label_key(labels)
+            self._series(key)
+            self.sums[key] += value
+
+
+class MetricsRegistry:
+    """Named metrics rendered together into one textfile."""
+
+    def __init__(self, prefix: str = METRIC_PREFIX):
+        """
+        Initialize registry.
+
+        Args:
+            prefix: Prepended to every metric name.
+        """
+        self.prefix = prefix
+        self.metrics: list = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        """Register a counter."""
+        return self._add(Counter(self.prefix + name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        """Register a gauge."""
+        return self._add(Gauge(self.prefix + name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Register a histogram."""
+        return self._add(Histogram(self.prefix + name, help_text, buckets))
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text.
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def load(self, path: str) -> None:
+        """
+        Add counter and histogram values from a previously written file.
+
+        A missing file is ignored; lines that are not ours or cannot be
+        parsed are skipped.
+
+        Args:
+            path: Textfile path.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            raise MetricsError(f"Failed to read metrics file {path}: {e}") from e
+
+        for line in lines:
+            match = _SAMPLE_PATTERN.match(line)
+            if line.startswith("#") or not match:
+                continue
+            name, labels, value = match.groups()
+            try:
+                number = float(value)
+            except ValueError:
+                continue
+            for metric in self.metrics:
+                if name.startswith(metric.name):
+                    metric.load_sample(name, _parse_labels(labels), number)
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Write the metrics atomically (temporary file, then rename).
+
+        Args:
+            path: Target .prom file.
+
+        Raises:
+            MetricsError: If the file cannot be written.
+        """
+        target = Path(path)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Same directory, so the rename stays on one filesystem; the
+            # collector ignores files not ending in .prom
+            fd, temp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+                    f.write(self.render())
+                os.replace(temp_name, target)
+            except BaseException:
+                os.unlink(temp_name)
+                raise
+        except OSError as e:
+            raise MetricsError(f"Failed to write metrics file {path}: {e}") from e
+
+
+class RunMetrics:
+    """Application metrics, filled in from the outcome of a run."""
+
+    def __init__(self):
+        """Register all metrics."""
+        registry = self.registry = MetricsRegistry()
+        self.emails = registry.counter(
+            "emails_total", "Emails handled, by status and error type."
+        )
+        self.cases = registry.counter(
+            "cases_extracted_total", "Case rows extracted."
+        )
+        self.ocr_images = registry.counter(
+            "ocr_images_total", "Images run through OCR."
+        )
+        self.ocr_seconds = registry.counter(
+            "ocr_seconds_total", "Seconds spent in OCR."
+        )
+        self.graph_requests = registry.counter(
+            "graph_requests_total", "Microsoft Graph requests, by operation and HTTP status."
+        )
+        self.graph_throttled = registry.counter(
+            "graph_throttled_total", "Microsoft Graph requests answered with 429, by operation."
+        )
+        self.claude_calls = registry.counter(
+            "claude_calls_total", "Claude API calls (cache hits excluded)."
+        )
+        self.claude_cache_hits = registry.counter(
+            "claude_cache_hits_total", "Claude requests answered from the response cache."
+        )
+        self.claude_tokens = registry.counter(
+            "claude_tokens_total", "Claude API tokens, by direction."
+        )
+        self.stage_seconds = registry.histogram(
+            "stage_seconds", "Duration of pipeline stages (upload = SharePoint upload latency)."
+        )
+        self.runs = registry.counter(
+            "runs_total", "Completed runs."
+        )
+        self.last_run_timestamp = registry.gauge(
+            "last_run_timestamp_seconds", "Unix time the last run started."
+        )
+        self.last_run_duration = registry.gauge(
+            "last_run_duration_seconds", "Duration of the last run."
+        )
+
+    def record_run(
+        self,
+        run_timestamp: datetime,
+        results: list[EmailProcessResult],
+        cases_extracted: int,
+        timings: Optional[Timings] = None,
+        graph_stats: Optional[GraphRequestStats] = None,
+        claude_usage_stats: Optional[UsageStats] = None,
+        claude_cache_stats: Optional[CacheStats] = None,
+    ) -> None:
+        """
+        Add the outcome of a run.
+
+        Args:
+            run_timestamp: Timestamp of run start.
+            results: Email processing results.
+            cases_extracted: Case rows extracted in this run.
+            timings: Stage timings of the run (optional).
+            graph_stats: Graph requests of the run (optional).
+            claude_usage_stats: Claude API usage of the run (optional).
+            claude_cache_stats: Claude response cache stats of the run (optional).
+        """
+        self.runs.inc()
+        self.last_run_timestamp.set(run_timestamp.timestamp())
+        self.last_run_duration.set(round((datetime.now() - run_timestamp).total_seconds(), 3))
+
+        for result in results:
+            error_type = result.error_type.value if result.error_type else "NONE"
+            self.emails.inc(status=result.status.value, error_type=error_type)
+        self.cases.inc(cases_extracted)
+
+        if timings is not None:
+            ocr = timings.samples.get("ocr.image", [])
+            self.ocr_images.inc(len(ocr))
+            self.ocr_seconds.inc(round(sum(ocr), 3))
+            for stage, values in timings.samples.items():
+                for seconds in values:
+                    self.stage_seconds.observe(seconds, stage=stage)
+
+        if graph_stats is not None:
+            for (operation, status), count in graph_stats.requests.items():
+                self.graph_requests.inc(count, operation=operation, status=status)
+            for operation, count in graph_stats.throttled.items():
+                self.graph_throttled.inc(count, operation=operation)
+
+        if claude_usage_stats is not None:
+            self.claude_calls.inc(claude_usage_stats.calls)
+            self.claude_tokens.inc(claude_usage_stats.input_tokens, direction="input")
+            self.claude_tokens.inc(claude_usage_stats.output_tokens, direction="output")
+        if claude_cache_stats is not None:
+            self.claude_cache_hits.inc(claude_cache_stats.hits)
+
+    def write(self, path: str) -> None:
+        """
+        Continue from the previous file and replace it atomically.
+
+        Args:
+            path: Target .prom file.
+
+        Raises:
+            MetricsError: If the file cannot be read or written.
+        """
+        self.registry.load(path)
+        self.registry.write_textfile(path)
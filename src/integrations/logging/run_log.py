@@ -1,13 +1,20 @@
 """
 Run log writer.
 
-Writes per-run log file with processing results.
+Writes per-run log file with processing results, plus a JSON companion and
+an optional timing profile.
 """
 
+import json
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 from src.core.models import EmailProcessResult, ProcessStatus
+from src.integrations.anthropic.cache import CacheStats
+from src.integrations.anthropic.fallback import FallbackStats
+from src.integrations.anthropic.usage import UsageStats
+from src.utils.timing import Timings
 
 
 class RunLogWriter:
@@ -22,6 +29,10 @@ class RunLogWriter:
         results: list[EmailProcessResult],
         output_path: str,
         run_timestamp: datetime,
+        claude_cache_stats: Optional[CacheStats] = None,
+        claude_fallback_stats: Optional[FallbackStats] = None,
+        claude_usage_stats: Optional[UsageStats] = None,
+        timings: Optional[Timings] = None,
     ) -> None:
         """
         Write processing log.
@@ -30,6 +41,10 @@ class RunLogWriter:
             results: List of email processing results.
             output_path: Output file path.
             run_timestamp: Timestamp of run start.
+            claude_cache_stats: Claude response cache stats of the run (optional).
+            claude_fallback_stats: Claude fallback outcomes of the run (optional).
+            claude_usage_stats: Claude API tokens and latency of the run (optional).
+            timings: Stage timings of the run (optional).
         """
         with open(output_path, "w", encoding="utf-8") as f:
             # Write header
@@ -53,8 +68,71 @@ class RunLogWriter:
             f.write(f"  Processed: {processed}\n")
             f.write(f"  Skipped (Business Error): {skipped_business}\n")
             f.write(f"  Skipped (Technical Error): {skipped_technical}\n")
+            body_chars, body_chars_extracted = _body_totals(results)
+            if body_chars:
+                f.write(
+                    f"  Body text: {body_chars_extracted} of {body_chars} chars extracted "
+                    f"({body_chars_extracted / body_chars:.0%})\n"
+                )
             f.write("\n")
 
+            if claude_cache_stats is not None:
+                f.write("Claude response cache:\n")
+                f.write(f"  Hits: {claude_cache_stats.hits}\n")
+                f.write(f"  Misses: {claude_cache_stats.misses}\n")
+                f.write(f"  Latency saved: {claude_cache_stats.latency_saved:.1f} s\n")
+                f.write(
+                    f"  Tokens saved: {claude_cache_stats.input_tokens_saved} input, "
+                    f"{claude_cache_stats.output_tokens_saved} output\n"
+                )
+                f.write("\n")
+
+            if claude_fallback_stats is not None:
+                f.write("Claude fallback:\n")
+                f.write(f"  Requests: {claude_fallback_stats.submitted}\n")
+                f.write(f"  Succeeded: {claude_fallback_stats.succeeded}\n")
+                f.write(f"  Failed: {claude_fallback_stats.failed}\n")
+                f.write(f"  Timed out: {claude_fallback_stats.timed_out}\n")
+                f.write(f"  Skipped (circuit open): {claude_fallback_stats.skipped}\n")
+                f.write("\n")
+
+            if claude_usage_stats is not None:
+                f.write("Claude API usage:\n")
+                f.write(f"  Calls: {claude_usage_stats.calls}\n")
+                f.write(
+                    f"  Tokens: {claude_usage_stats.input_tokens} input, "
+                    f"{claude_usage_stats.output_tokens} output "
+                    f"({claude_usage_stats.tokens_per_call:.0f} per call)\n"
+                )
+                f.write(
+                    f"  Prompt cache: {claude_usage_stats.cache_read_input_tokens} tokens read, "
+                    f"{claude_usage_stats.cache_creation_input_tokens} written\n"
+                )
+                f.write(
+                    f"  Latency: {claude_usage_stats.latency_per_call:.1f} s per call, "
+                    f"{claude_usage_stats.max_latency:.1f} s max\n"
+                )
+                if claude_usage_stats.batches:
+                    f.write(
+                        f"  Batches: {claude_usage_stats.batches} with {claude_usage_stats.batch_calls} "
+                        f"requests, {claude_usage_stats.batch_wall_time:.0f} s wall time\n"
+                    )
+                f.write(
+                    f"  Trimmed prompts: {claude_usage_stats.trimmed_prompts} "
+                    f"(~{claude_usage_stats.trimmed_tokens} tokens removed)\n"
+                )
+                f.write("\n")
+
+            if timings is not None and timings.samples:
+                f.write("Stage timings (seconds):\n")
+                f.write(f"  {'Stage':<22}{'Count':>7}{'Total':>10}{'p50':>10}{'p95':>10}{'Max':>10}\n")
+                for name, stage in timings.summary().items():
+                    f.write(
+                        f"  {name:<22}{stage.count:>7}{stage.total:>10.3f}"
+                        f"{stage.p50:>10.3f}{stage.p95:>10.3f}{stage.max:>10.3f}\n"
+                    )
+                f.write("\n")
+
             # Write per-email details
             f.write("=" * 80 + "\n")
             f.write("Email Processing Details\n")
@@ -72,9 +150,16 @@ class RunLogWriter:
                     f.write(f"  Error Message: {result.error_message}\n")
 
                 if result.status == ProcessStatus.PROCESSED:
-                    f.write(f"  Cases Extracted: {len(result.cases)}\n")
+                    f.write(f"  Cases Extracted: {result.cases_extracted}\n")
                     f.write(f"  Marked as Read: {result.marked_as_read}\n")
 
+                if result.body_chars:
+                    f.write(f"  Body Text: {result.body_chars_extracted} of {result.body_chars} chars extracted\n")
+
+                if result.timings:
+                    stages = ", ".join(f"{name} {seconds:.3f}" for name, seconds in result.timings.items())
+                    f.write(f"  Timings (s): {stages}\n")
+
                 f.write("\n")
 
             # Write footer
@@ -82,6 +167,123 @@ class RunLogWriter:
             f.write("End of Log\n")
             f.write("=" * 80 + "\n")
 
+    def write_json(
+        self,
+        results: list[EmailProcessResult],
+        output_path: str,
+        run_timestamp: datetime,
+        claude_cache_stats: Optional[CacheStats] = None,
+        claude_fallback_stats: Optional[FallbackStats] = None,
+        claude_usage_stats: Optional[UsageStats] = None,
+        timings: Optional[Timings] = None,
+    ) -> None:
+        """
+        Write the processing log as JSON (machine-readable companion of write_log).
+
+        Args:
+            results: List of email processing results.
+            output_path: Output file path.
+            run_timestamp: Timestamp of run start.
+            claude_cache_stats: Claude response cache stats of the run (optional).
+            claude_fallback_stats: Claude fallback outcomes of the run (optional).
+            claude_usage_stats: Claude API tokens and latency of the run (optional).
+            timings: Stage timings of the run (optional).
+        """
+        summary = {status.value: 0 for status in ProcessStatus}
+        for result in results:
+            summary[result.status.value] += 1
+        body_chars, body_chars_extracted = _body_totals(results)
+
+        document = {
+            "run_timestamp": run_timestamp.isoformat(timespec="seconds"),
+            "total_emails": len(results),
+            "summary": summary,
+            "body_chars": body_chars,
+            "body_chars_extracted": body_chars_extracted,
+            "claude_cache": claude_cache_stats.as_dict() if claude_cache_stats else None,
+            "claude_fallback": claude_fallback_stats.as_dict() if claude_fallback_stats else None,
+            "claude_usage": claude_usage_stats.as_dict() if claude_usage_stats else None,
+            "timings": _timings_summary(timings),
+            "emails": [
+                {
+                    "message_id": result.email_item.message_id,
+                    "sender": result.email_item.sender_address,
+                    "subject": result.email_item.subject,
+                    "received": result.email_item.received_datetime.isoformat(timespec="seconds"),
+                    "status": result.status.value,
+                    "error_type": result.error_type.value if result.error_type else None,
+                    "error_message": result.error_message,
+                    "cases_extracted": result.cases_extracted,
+                    "marked_as_read": result.marked_as_read,
+                    "body_chars": result.body_chars,
+                    "body_chars_extracted": result.body_chars_extracted,
+                    "timings": result.timings,
+                }
+                for result in results
+            ],
+        }
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+
+    def write_profile(
+        self,
+        results: list[EmailProcessResult],
+        output_path: str,
+        run_timestamp: datetime,
+        timings: Timings,
+    ) -> None:
+        """
+        Write the timing profile of a run as JSON.
+
+        Args:
+            results: List of email processing results.
+            output_path: Output file path.
+            run_timestamp: Timestamp of run start.
+            timings: Stage timings of the run.
+        """
+        document = {
+            "run_timestamp": run_timestamp.isoformat(timespec="seconds"),
+            "stages": _timings_summary(timings),
+            "emails": [
+                {
+                    "message_id": result.email_item.message_id,
+                    "status": result.status.value,
+                    "timings": result.timings,
+                }
+                for result in results
+            ],
+        }
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def generate_profile_filename(run_timestamp: datetime) -> str:
+        """
+        Generate filename for the timing profile.
+
+        Args:
+            run_timestamp: Timestamp of run.
+
+        Returns:
+            Filename string.
+        """
+        return f"Run_Profile_{run_timestamp.strftime('%Y%m%d_%H%M%S')}.json"
+
+    @staticmethod
+    def generate_json_filename(run_timestamp: datetime) -> str:
+        """
+        Generate filename for the JSON log file.
+
+        Args:
+            run_timestamp: Timestamp of run.
+
+        Returns:
+            Filename string.
+        """
+        return f"Run_Log_{run_timestamp.strftime('%Y%m%d_%H%M%S')}.json"
+
     @staticmethod
     def generate_filename(run_timestamp: datetime) -> str:
         """
@@ -94,3 +296,18 @@ class RunLogWriter:
             Filename string.
         """
         return f"Run_Log_{run_timestamp.strftime('%Y%m%d_%H%M%S')}.txt"
+
+
+def _timings_summary(timings: Optional[Timings]) -> Optional[dict]:
+    """Per-stage count/total/p50/p95/max as JSON-ready dicts."""
+    if timings is None:
+        return None
+    return {name: stage.as_dict() for name, stage in timings.summary().items()}
+
+
+def _body_totals(results: list[EmailProcessResult]) -> tuple[int, int]:
+    """Full and extracted body text characters over all emails."""
+    return (
+        sum(result.body_chars for result in results),
+        sum(result.body_chars_extracted for result in results),
+    )
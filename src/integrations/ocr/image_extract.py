@@ -8,14 +8,16 @@ from typing import Optional
 from src.config import Config
 from src.core.models import EmailAttachment, EmailItem
 from src.integrations.ocr.pdf_render import PDFRenderer
+from src.utils.blob import Blob
 
 
 @dataclass
 class ImageSource:
     """Represents an image with its source metadata."""
-    content: bytes
+    content: Blob
     source_name: str  # e.g., "inline:image1.png", "attachment:report.pdf:page1"
     original_filename: Optional[str] = None
+    rendered: bool = False  # True for PDF pages; the blob belongs to this source
 
 
 class ImageExtractor:
@@ -104,6 +106,7 @@ class ImageExtractor:
                                 content=page_img,
                                 source_name=f"attachment:{att.filename}:page{i}",
                                 original_filename=att.filename,
+                                rendered=True,
                             )
                         )
                 except Exception as e:
@@ -8,6 +8,7 @@ from src.config import Config
 from src.core.models import EmailItem
 from src.integrations.ocr.image_extract import ImageExtractor, ImageSource
 from src.integrations.ocr.tesseract import TesseractOCR
+from src.utils.timing import span
 
 
 @dataclass
@@ -54,7 +55,8 @@ class OCRPipeline:
 
         for img_source in images:
             try:
-                text = self.tesseract.extract_text(img_source.content)
+                with span("ocr.image"):
+                    text = self.tesseract.extract_text(img_source.content)
                 results.append(
                     OCRResult(
                         source_name=img_source.source_name,
@@ -71,6 +73,10 @@ class OCRPipeline:
                         error=str(e),
                     )
                 )
+            finally:
+                # Rendered pages are temp files; attachments are released by the caller
+                if img_source.rendered:
+                    img_source.content.close()
 
         return results
 
@@ -1,5 +1,9 @@
 """
 PDF rendering to images using Poppler (pdftoppm).
+
+pdftoppm reads the PDF straight from the attachment blob's file and the
+rendered pages are handed over as file-backed blobs, so no page image is
+loaded into memory here.
 """
 
 import subprocess
@@ -9,6 +13,8 @@ from pathlib import Path
 from typing import Optional
 
 from src.config import Config
+from src.utils.blob import Blob, BlobLike, as_blob
+from src.utils.timing import span
 
 
 class PDFRenderError(Exception):
@@ -36,29 +42,29 @@ class PDFRenderer:
 
     def render_pdf_to_images(
         self,
-        pdf_content: bytes,
+        pdf_content: BlobLike,
         dpi: int = 300,
-    ) -> list[bytes]:
+    ) -> list[Blob]:
         """
         Render all pages of PDF to PNG images.
 
         Args:
-            pdf_content: PDF file content as bytes.
+            pdf_content: PDF file content (bytes or blob).
             dpi: Resolution for rendering (default 300).
 
         Returns:
-            List of PNG image bytes (one per page).
+            List of PNG image blobs (one per page).
 
         Raises:
             PDFRenderError: If rendering fails.
         """
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with (
+            span("pdf.render"),
+            tempfile.TemporaryDirectory() as temp_dir,
+            as_blob(pdf_content).as_path(".pdf") as pdf_file,
+        ):
             temp_path = Path(temp_dir)
 
-            # Write PDF to temp file
-            pdf_file = temp_path / "input.pdf"
-            pdf_file.write_bytes(pdf_content)
-
             # Output prefix for rendered images
             output_prefix = temp_path / "page"
 
@@ -92,40 +98,36 @@ class PDFRenderer:
             if not png_files:
                 raise PDFRenderError("No pages rendered from PDF")
 
-            # Read all PNG files
-            images = []
-            for png_file in png_files:
-                images.append(png_file.read_bytes())
-
-            return images
+            # Hand the PNG files over to blobs (moved, not read)
+            return [Blob.adopt_file(png_file) for png_file in png_files]
 
     def render_pdf_page(
         self,
-        pdf_content: bytes,
+        pdf_content: BlobLike,
         page_number: int,
         dpi: int = 300,
-    ) -> Optional[bytes]:
+    ) -> Optional[Blob]:
         """
         Render a single page of PDF to PNG.
 
         Args:
-            pdf_content: PDF file content as bytes.
+            pdf_content: PDF file content (bytes or blob).
             page_number: Page number (1-indexed).
             dpi: Resolution for rendering.
 
         Returns:
-            PNG image bytes, or None if page doesn't exist.
+            PNG image blob, or None if page doesn't exist.
 
         Raises:
             PDFRenderError: If rendering fails.
         """
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with (
+            span("pdf.render"),
+            tempfile.TemporaryDirectory() as temp_dir,
+            as_blob(pdf_content).as_path(".pdf") as pdf_file,
+        ):
             temp_path = Path(temp_dir)
 
-            # Write PDF to temp file
-            pdf_file = temp_path / "input.pdf"
-            pdf_file.write_bytes(pdf_content)
-
             # Output prefix for rendered image
             output_prefix = temp_path / "page"
 
@@ -159,4 +161,4 @@ class PDFRenderer:
             if not png_files:
                 return None
 
-            return png_files[0].read_bytes()
+            return Blob.adopt_file(png_files[0])
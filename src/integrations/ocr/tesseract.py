@@ -7,6 +7,7 @@ import tempfile
 from pathlib import Path
 
 from src.config import Config
+from src.utils.blob import BlobLike, as_blob
 
 
 class TesseractError(Exception):
@@ -32,12 +33,13 @@ class TesseractOCR:
 
         self.languages = "+".join(config.ocr_languages)
 
-    def extract_text(self, image_content: bytes) -> str:
+    def extract_text(self, image_content: BlobLike) -> str:
         """
         Extract text from image using OCR.
 
         Args:
-            image_content: Image file content as bytes.
+            image_content: Image file content (bytes or blob); a spilled blob
+                is passed to Tesseract by path without being read.
 
         Returns:
             Extracted text (may be empty if no text found).
@@ -45,13 +47,9 @@ class TesseractOCR:
         Raises:
             TesseractError: If OCR fails.
         """
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory() as temp_dir, as_blob(image_content).as_path(".png") as image_file:
             temp_path = Path(temp_dir)
 
-            # Write image to temp file
-            image_file = temp_path / "image.png"
-            image_file.write_bytes(image_content)
-
             # Output text file
             output_base = temp_path / "output"
 
@@ -88,12 +86,12 @@ class TesseractOCR:
 
             return text.strip()
 
-    def extract_text_batch(self, images: list[bytes]) -> list[str]:
+    def extract_text_batch(self, images: list[BlobLike]) -> list[str]:
         """
         Extract text from multiple images.
 
         Args:
-            images: List of image contents as bytes.
+            images: List of image contents (bytes or blobs).
 
         Returns:
             List of extracted texts (same order as input).
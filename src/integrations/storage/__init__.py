@@ -0,0 +1 @@
+# Local persistent state
@@ -0,0 +1,206 @@
+"""
+Local case store for incremental reports.
+
+Keeps every case of a report period in SQLite, so a rolling report can be
+rebuilt from disk after each run instead of downloading and re-parsing the
+previous file from SharePoint. Cases are de-duplicated per period.
+"""
+
+import hashlib
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from src.core.models import CaseMetadata, CaseRow
+
+
+class CaseStoreError(Exception):
+    """Case store error."""
+    pass
+
+
+# CaseRow fields in column order
+CASE_FIELDS = (
+    "unit_store",
+    "ean_code",
+    "document_creation_date",
+    "delivery_date",
+    "order_creation_date",
+    "supplier_price",
+    "internal_price",
+    "supplier_name",
+    "supplier_invoice_number",
+    "email_sender_address",
+    "email_link",
+    "comments",
+)
+
+# CaseRow fields that come from the shared CaseMetadata
+META_FIELDS = tuple(CaseMetadata.__dataclass_fields__)
+
+DATE_FIELDS = frozenset({"document_creation_date", "delivery_date", "order_creation_date"})
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS cases (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    period TEXT NOT NULL,
+    case_key TEXT NOT NULL,
+    {", ".join(f"{name} {'REAL' if name.endswith('_price') else 'TEXT'}" for name in CASE_FIELDS)},
+    UNIQUE (period, case_key)
+)
+"""
+
+
+def case_key(case: CaseRow) -> str:
+    """
+    Identity of a case within a period (all fields).
+
+    Args:
+        case: Case row.
+
+    Returns:
+        Hex digest.
+    """
+    raw = "\x1f".join("" if getattr(case, name) is None else str(getattr(case, name)) for name in CASE_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class CaseStore:
+    """SQLite-backed store of report cases, grouped by period."""
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the store.
+
+        Changes are only persisted by commit(); closing without it rolls
+        them back, which is what dry runs rely on.
+
+        Args:
+            path: SQLite database file.
+
+        Raises:
+            CaseStoreError: If the database cannot be opened.
+        """
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path)
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            raise CaseStoreError(f"Failed to open case store {path}: {e}") from e
+
+    def add_cases(self, period: str, cases: Iterable[CaseRow]) -> int:
+        """
+        Add cases to a period, skipping ones already stored.
+
+        All cases of one call are added or, if adding fails, none of them.
+
+        Args:
+            period: Report period key.
+            cases: Case rows.
+
+        Returns:
+            Number of new cases.
+        """
+        placeholders = ", ".join("?" for _ in range(len(CASE_FIELDS) + 2))
+        sql = f"INSERT OR IGNORE INTO cases (period, case_key, {', '.join(CASE_FIELDS)}) VALUES ({placeholders})"
+
+        # Open the transaction explicitly, so releasing the savepoint never commits
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+        self._conn.execute("SAVEPOINT add_cases")
+
+        added = 0
+        try:
+            for case in cases:
+                values = [
+                    getattr(case, name).isoformat() if name in DATE_FIELDS and getattr(case, name) else getattr(case, name)
+                    for name in CASE_FIELDS
+                ]
+                cursor = self._conn.execute(sql, [period, case_key(case), *values])
+                added += cursor.rowcount
+        except Exception:
+            self._conn.execute("ROLLBACK TO add_cases")
+            raise
+        finally:
+            self._conn.execute("RELEASE add_cases")
+        return added
+
+    def iter_cases(self, period: str) -> Iterator[CaseRow]:
+        """
+        Yield the cases of a period in the order they were added.
+
+        Args:
+            period: Report period key.
+
+        Yields:
+            CaseRow objects.
+        """
+        cursor = self._conn.execute(
+            f"SELECT {', '.join(CASE_FIELDS)} FROM cases WHERE period = ? ORDER BY seq",
+            (period,),
+        )
+        meta = None
+        meta_values = None
+        for row in cursor:
+            values = {
+                name: date.fromisoformat(value) if name in DATE_FIELDS and value else value
+                for name, value in zip(CASE_FIELDS, row)
+            }
+            # Rows of one email are stored together; share their metadata again
+            row_meta_values = tuple(values[name] for name in META_FIELDS)
+            if row_meta_values != meta_values:
+                meta_values = row_meta_values
+                meta = CaseMetadata.interned(**dict(zip(META_FIELDS, meta_values)))
+            yield CaseRow(
+                unit_store=values["unit_store"],
+                ean_code=values["ean_code"],
+                supplier_price=values["supplier_price"],
+                internal_price=values["internal_price"],
+                meta=meta,
+            )
+
+    def count(self, period: str) -> int:
+        """Number of cases stored for a period."""
+        return self._conn.execute("SELECT COUNT(*) FROM cases WHERE period = ?", (period,)).fetchone()[0]
+
+    def commit(self) -> None:
+        """Persist changes made since the last commit."""
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the store; uncommitted changes are discarded."""
+        self._conn.close()
+
+    def __enter__(self) -> "CaseStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class CaseStoreAppender:
+    """Report-stream-like sink that adds cases to one period of a store."""
+
+    def __init__(self, store: CaseStore, period: str, commit_each: bool = False):
+        """
+        Initialize appender.
+
+        Args:
+            store: Open case store.
+            period: Report period key.
+            commit_each: Commit after every extend (one email), so its cases
+                are persisted before the email is marked as read.
+        """
+        self.store = store
+        self.period = period
+        self.commit_each = commit_each
+        self.rows_written = 0  # New cases only
+
+    def extend(self, cases: Iterable[CaseRow]) -> None:
+        """Add cases; duplicates of stored cases are ignored."""
+        added = self.store.add_cases(self.period, cases)
+        if self.commit_each:
+            self.store.commit()
+        self.rows_written += added
@@ -6,11 +6,14 @@ Usage:
     python -m src.main --date-from 2024-01-15 --date-to 2024-01-20
     python -m src.main --auto  (last 24 hours)
     python -m src.main --date 2024-01-15 --dry-run
+    python -m src.main --date 2024-01-15 --dry-run --profile [--profile-memory]
 """
 
 import argparse
 import sys
+from contextlib import nullcontext
 from datetime import date, datetime, timedelta
+from typing import Optional
 
 from src.config import load_config, ConfigError
 
@@ -49,6 +52,17 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Dry run mode: no mark-as-read, no SharePoint upload",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run with cProfile; writes Run_Log_*.prof and a hotspot "
+             "summary (Run_Log_*_hotspots.txt) next to the event log",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile: also trace memory with tracemalloc at stage boundaries (slower)",
+    )
 
     args = parser.parse_args()
 
@@ -59,6 +73,9 @@ def parse_args() -> argparse.Namespace:
     if (args.date_from and not args.date_to) or (args.date_to and not args.date_from):
         parser.error("Both --date-from and --date-to must be specified together")
 
+    if args.profile_memory and not args.profile:
+        parser.error("--profile-memory requires --profile")
+
     return args
 
 
@@ -120,19 +137,28 @@ def main() -> int:
     print("=" * 60)
     print(f"Date range: {date_from} to {date_to} (inclusive)")
     print(f"Dry run: {args.dry_run}")
+    if args.profile:
+        print(f"Profiling: cpu{' + memory' if args.profile_memory else ''}")
     print(f"Mailbox: {config.mailbox_user_id}")
     print("=" * 60)
 
     # Run pipeline (stub for now)
     from src.core.pipeline import run_pipeline
 
+    profiler = None
+    if args.profile:
+        from src.utils.profiling import RunProfiler
+        profiler = RunProfiler(memory=args.profile_memory)
+
+    result = None
     try:
-        result = run_pipeline(
-            config=config,
-            date_from=date_from,
-            date_to=date_to,
-            dry_run=args.dry_run,
-        )
+        with profiler or nullcontext():
+            result = run_pipeline(
+                config=config,
+                date_from=date_from,
+                date_to=date_to,
+                dry_run=args.dry_run,
+            )
         print(f"\nProcessing complete.")
         print(f"Emails processed: {result.emails_processed}")
         print(f"Emails skipped: {result.emails_skipped}")
@@ -143,6 +169,22 @@ def main() -> int:
         print(f"Pipeline error: {e}", file=sys.stderr)
         return 1
 
+    finally:
+        # Also written for a failed run: that is often the one worth profiling
+        if profiler is not None:
+            write_profile(profiler, config.event_log_dir, result.run_timestamp if result else None)
+
+
+def write_profile(profiler, output_dir: str, run_timestamp: Optional[datetime]) -> None:
+    """Write profiler output; a failure here must not change the exit code."""
+    try:
+        raw_path, summary_path = profiler.write(output_dir, run_timestamp)
+    except OSError as e:
+        print(f"Profile not written: {e}", file=sys.stderr)
+        return
+    print(f"Profile: {raw_path}")
+    print(f"Hotspots: {summary_path}")
+
 
 if __name__ == "__main__":
     sys.exit(main())
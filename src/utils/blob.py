@@ -0,0 +1,318 @@
+"""
+Attachment payload storage.
+
+Small payloads stay in memory; anything above BLOB_MEMORY_LIMIT is spilled to
+a temporary file. Consumers read through a file object, a memory map or a
+file path, so a payload is never duplicated into a second bytes object:
+- openpyxl, python-calamine, pandas and pdfplumber take the file object
+- pdftoppm and Tesseract take the path of the spilled file directly
+"""
+
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+
+# Payloads larger than this are kept in a temporary file
+BLOB_MEMORY_LIMIT = 1024 * 1024
+
+# Prefix of spilled temporary files
+BLOB_FILE_PREFIX = "blob-"
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class Blob:
+    """Read-only binary payload held in memory or in a temporary file."""
+
+    __slots__ = ("_data", "_path", "_size", "_finalizer", "__weakref__")
+
+    def __init__(self) -> None:
+        """Create an empty blob; use the from_* constructors instead."""
+        self._data: Optional[bytes] = b""
+        self._path: Optional[str] = None
+        self._size = 0
+        self._finalizer: Optional[weakref.finalize] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes, memory_limit: int = BLOB_MEMORY_LIMIT) -> "Blob":
+        """
+        Wrap a payload that is already in memory.
+
+        Args:
+            data: Payload bytes.
+            memory_limit: Size above which the payload is written to disk,
+                so the caller's copy can be released.
+
+        Returns:
+            Blob holding the payload.
+        """
+        blob = cls()
+        if len(data) <= memory_limit:
+            blob._data = bytes(data)
+            blob._size = len(data)
+            return blob
+
+        fd, path = tempfile.mkstemp(prefix=BLOB_FILE_PREFIX)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        blob._adopt(path, len(data))
+        return blob
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes], memory_limit: int = BLOB_MEMORY_LIMIT) -> "Blob":
+        """
+        Build a payload from a stream of chunks.
+
+        Args:
+            chunks: Payload pieces in order.
+            memory_limit: Size above which the payload is written to disk.
+
+        Returns:
+            Blob holding the payload.
+        """
+        writer = BlobWriter(memory_limit)
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.finish()
+
+    @classmethod
+    def adopt_file(cls, path: Union[str, Path]) -> "Blob":
+        """
+        Take ownership of an existing file (e.g. a page rendered by pdftoppm).
+
+        The file is moved next to the other spilled blobs and deleted when the
+        blob is closed or garbage collected.
+
+        Args:
+            path: File to adopt.
+
+        Returns:
+            Blob backed by the file.
+        """
+        fd, target = tempfile.mkstemp(prefix=BLOB_FILE_PREFIX)
+        os.close(fd)
+        shutil.move(str(path), target)
+
+        blob = cls()
+        blob._adopt(target, os.path.getsize(target))
+        return blob
+
+    def _adopt(self, path: str, size: int) -> None:
+        self._data = None
+        self._path = path
+        self._size = size
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    @property
+    def size(self) -> int:
+        """Payload size in bytes."""
+        return self._size
+
+    @property
+    def in_memory(self) -> bool:
+        """True if the payload is held in memory rather than on disk."""
+        return self._path is None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        where = "memory" if self.in_memory else self._path
+        return f"Blob(size={self._size}, at={where})"
+
+    def open(self) -> BinaryIO:
+        """
+        Open a new read stream positioned at the start of the payload.
+
+        In-memory payloads are shared with the stream, not copied.
+
+        Returns:
+            Binary file object; the caller closes it.
+        """
+        if self._path is None:
+            return io.BytesIO(self._data)
+        return open(self._path, "rb")
+
+    def head(self, size: int) -> bytes:
+        """
+        Read the first bytes of the payload.
+
+        Args:
+            size: Maximum number of bytes.
+
+        Returns:
+            Leading bytes.
+        """
+        if self._path is None:
+            return self._data[:size]
+        with open(self._path, "rb") as f:
+            return f.read(size)
+
+    def read_bytes(self) -> bytes:
+        """
+        Return the whole payload as bytes.
+
+        Free for in-memory payloads; spilled payloads are read back from disk,
+        so prefer open(), view() or as_path() for those.
+
+        Returns:
+            Payload bytes.
+        """
+        if self._path is None:
+            return self._data
+        with open(self._path, "rb") as f:
+            return f.read()
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        """
+        Expose the payload as a read-only buffer without copying it.
+
+        Spilled payloads are memory-mapped; release the view before leaving
+        the block.
+
+        Yields:
+            memoryview over the payload.
+        """
+        if self._path is None or self._size == 0:
+            with memoryview(self._data or b"") as buffer:
+                yield buffer
+            return
+
+        with open(self._path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            buffer = memoryview(mapped)
+            try:
+                yield buffer
+            finally:
+                buffer.release()
+
+    @contextmanager
+    def as_path(self, suffix: str = "") -> Iterator[Path]:
+        """
+        Provide the payload as a file on disk, for external programs.
+
+        Spilled payloads are used in place; in-memory payloads are written to
+        a temporary file that is removed afterwards.
+
+        Args:
+            suffix: File name suffix for the temporary file (e.g. ".pdf").
+
+        Yields:
+            Path to a file holding the payload.
+        """
+        if self._path is not None:
+            yield Path(self._path)
+            return
+
+        fd, path = tempfile.mkstemp(prefix=BLOB_FILE_PREFIX, suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._data)
+            yield Path(path)
+        finally:
+            _remove_file(path)
+
+    def close(self) -> None:
+        """Release the payload and delete its temporary file, if any."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._data = b""
+        self._path = None
+        self._size = 0
+
+
+class BlobWriter:
+    """
+    Incremental Blob builder for producers that push data (e.g. a decoder).
+
+    Chunks are buffered in memory until memory_limit is exceeded, then the
+    buffer and all following chunks go to a temporary file.
+    """
+
+    def __init__(self, memory_limit: int = BLOB_MEMORY_LIMIT):
+        """
+        Initialize writer.
+
+        Args:
+            memory_limit: Size above which the payload is written to disk.
+        """
+        self.memory_limit = memory_limit
+        self.size = 0
+        self._buffer = io.BytesIO()
+        self._file: Optional[BinaryIO] = None
+        self._path: Optional[str] = None
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk to the payload."""
+        if not chunk:
+            return
+        self.size += len(chunk)
+        if self._file is None and self.size > self.memory_limit:
+            fd, self._path = tempfile.mkstemp(prefix=BLOB_FILE_PREFIX)
+            self._file = os.fdopen(fd, "wb")
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = io.BytesIO()
+        (self._file or self._buffer).write(chunk)
+
+    def finish(self) -> Blob:
+        """
+        Complete the payload.
+
+        Returns:
+            Blob holding everything written so far.
+        """
+        blob = Blob()
+        if self._file is None:
+            blob._data = self._buffer.getvalue()
+            blob._size = self.size
+        else:
+            self._file.close()
+            blob._adopt(self._path, self.size)
+        self._buffer = io.BytesIO()
+        self._file = None
+        self._path = None
+        return blob
+
+    def abort(self) -> None:
+        """Discard the payload and its temporary file."""
+        if self._file is not None:
+            self._file.close()
+            _remove_file(self._path)
+        self._buffer = io.BytesIO()
+        self._file = None
+        self._path = None
+
+
+# Payload accepted by consumers: raw bytes or a blob
+BlobLike = Union[bytes, Blob]
+
+
+def as_blob(content: BlobLike) -> Blob:
+    """
+    Wrap raw bytes in a Blob; blobs are returned unchanged.
+
+    Args:
+        content: Payload bytes or blob.
+
+    Returns:
+        Blob for the payload.
+    """
+    if isinstance(content, Blob):
+        return content
+    return Blob.from_bytes(content, memory_limit=max(len(content), BLOB_MEMORY_LIMIT))
@@ -0,0 +1,239 @@
+"""
+Streaming HTML body extraction.
+
+Walks the markup once with the stdlib event-based parser and emits visible
+text and table rows together, without building a DOM. Content of <style>,
+<script> and <head> is dropped; quoted reply history can be dropped too, in
+which case the same pass still measures the full text.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Optional
+
+
+# Elements whose content is never visible
+HIDDEN_TAGS = frozenset({"style", "script", "head", "title", "template", "noscript"})
+
+# Elements that start a new line of text
+BLOCK_TAGS = frozenset({
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "footer",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "ol", "p", "pre",
+    "section", "table", "tbody", "thead", "tfoot", "tr", "ul",
+})
+
+# Containers that wrap quoted history (Gmail, Yahoo, Thunderbird, Apple Mail)
+QUOTE_CLASS_PATTERN = re.compile(r'gmail_quote|yahoo_quoted|moz-cite-prefix|AppleOriginalContents', re.IGNORECASE)
+
+# Markers after which Outlook places the quoted history as sibling elements
+QUOTE_START_IDS = frozenset({"divrplyfwdmsg", "appendonsend", "mail-editor-reference-message-container"})
+
+_WHITESPACE = re.compile(r'[ \t\r\f\v\u00a0]+')
+
+
+@dataclass
+class HtmlBody:
+    """Visible content of an HTML body."""
+    text: str
+    tables: list[list[list[str]]] = field(default_factory=list)  # table -> rows -> cell texts
+    quoted_skipped: bool = False  # True if quoted history was left out
+    full_text_length: int = 0  # Characters of the text with quoted history included
+
+
+class _BodyParser(HTMLParser):
+    """
+    Event handler collecting text and table cells in one pass.
+
+    Quoted history is left out of the kept text and tables, but still goes
+    into a text-only copy of the full body (_full_parts), so the full text
+    can be measured without a second parse.
+    """
+
+    def __init__(self, skip_quoted: bool):
+        super().__init__(convert_charrefs=True)
+        self.skip_quoted = skip_quoted
+        self.quoted_skipped = False
+
+        self._parts: list[str] = []
+        self._full_parts: list[str] = []
+        self._full_table_depth = 0
+        self.tables: list[list[list[str]]] = []
+        self._table_stack: list[list[list[str]]] = []
+        self._cell: Optional[list[str]] = None
+
+        # Hidden element being skipped and its nesting depth
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+
+        # Quoted element being left out and its nesting depth; _stopped once
+        # everything that follows is history
+        self._quote_tag: Optional[str] = None
+        self._quote_depth = 0
+        self._stopped = False
+
+    @property
+    def _quoted(self) -> bool:
+        return self._stopped or self._quote_tag is not None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+
+        if tag in HIDDEN_TAGS:
+            self._skip_tag = tag
+            self._skip_depth = 1
+            return
+
+        if self._quote_tag is not None:
+            if tag == self._quote_tag:
+                self._quote_depth += 1
+        elif self.skip_quoted and not self._stopped:
+            self._check_quote_start(tag, attrs)
+
+        self._full_starttag(tag)
+        if self._quoted:
+            return
+
+        if tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+        if tag == "table":
+            table: list[list[str]] = []
+            self.tables.append(table)
+            self._table_stack.append(table)
+        elif tag == "tr" and self._table_stack:
+            self._close_cell()
+            self._table_stack[-1].append([])
+        elif tag in ("td", "th") and self._table_stack:
+            self._close_cell()
+            rows = self._table_stack[-1]
+            if not rows:
+                rows.append([])
+            self._cell = []
+            rows[-1].append("")
+            self._parts.append("\t")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+
+        self._full_endtag(tag)
+
+        if self._quote_tag is not None:
+            if tag == self._quote_tag:
+                self._quote_depth -= 1
+                if self._quote_depth == 0:
+                    self._quote_tag = None
+            return
+
+        if self._stopped:
+            return
+
+        if tag in ("td", "th"):
+            self._close_cell()
+        elif tag == "tr":
+            self._close_cell()
+            self._parts.append("\n")
+        elif tag == "table" and self._table_stack:
+            self._close_cell()
+            self._table_stack.pop()
+            self._parts.append("\n")
+        elif tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_tag is not None:
+            return
+
+        self._full_parts.append(data)
+        if self._quoted:
+            return
+
+        self._parts.append(data)
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _full_starttag(self, tag: str) -> None:
+        """Text layout of the full body (what skip_quoted=False would emit)."""
+        if tag in BLOCK_TAGS:
+            self._full_parts.append("\n")
+        if tag == "table":
+            self._full_table_depth += 1
+        elif tag in ("td", "th") and self._full_table_depth:
+            self._full_parts.append("\t")
+
+    def _full_endtag(self, tag: str) -> None:
+        if tag == "tr" or tag in BLOCK_TAGS:
+            self._full_parts.append("\n")
+        if tag == "table" and self._full_table_depth:
+            self._full_table_depth -= 1
+
+    def _check_quote_start(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        """Start leaving content out if this element opens quoted history."""
+        attr_map = {name: value or "" for name, value in attrs}
+
+        if attr_map.get("id", "").lower() in QUOTE_START_IDS:
+            # Everything from here on is history
+            self._stopped = True
+            self.quoted_skipped = True
+        elif tag == "blockquote" or QUOTE_CLASS_PATTERN.search(attr_map.get("class", "")):
+            self._quote_tag = tag
+            self._quote_depth = 1
+            self.quoted_skipped = True
+
+    def _close_cell(self) -> None:
+        if self._cell is not None and self._table_stack and self._table_stack[-1]:
+            row = self._table_stack[-1][-1]
+            row[-1] = " ".join("".join(self._cell).split())
+        self._cell = None
+
+    def get_text(self) -> str:
+        """Visible text with one line per block and tab-separated cells."""
+        return _layout(self._parts)
+
+    def get_full_text(self) -> str:
+        """Visible text including quoted history."""
+        return _layout(self._full_parts)
+
+
+def _layout(parts: list[str]) -> str:
+    """Join text parts into lines with collapsed whitespace."""
+    lines = []
+    for line in "".join(parts).split("\n"):
+        line = _WHITESPACE.sub(lambda m: "\t" if "\t" in m.group() else " ", line).strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_html_body(html: str, skip_quoted: bool = True) -> HtmlBody:
+    """
+    Extract visible text and table rows from an HTML body in one pass.
+
+    Args:
+        html: HTML markup.
+        skip_quoted: If True, leave out quoted reply/forward history.
+
+    Returns:
+        HtmlBody with text and tables (rows with at least one cell).
+    """
+    parser = _BodyParser(skip_quoted)
+    parser.feed(html)
+    parser.close()
+
+    tables = [[row for row in table if row] for table in parser.tables]
+    text = parser.get_text()
+
+    return HtmlBody(
+        text=text,
+        tables=[table for table in tables if table],
+        quoted_skipped=parser.quoted_skipped,
+        full_text_length=len(parser.get_full_text()) if parser.quoted_skipped else len(text),
+    )
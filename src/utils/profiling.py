@@ -0,0 +1,168 @@
+"""
+CPU and memory profiling of a whole run (CLI --profile).
+
+cProfile covers the main thread; Claude fallback worker threads are not
+profiled, their wait time shows up under the caller. With memory=True,
+tracemalloc is read at stage boundaries (end of the "graph.list", "email"
+and "upload" spans) and the allocations that grew most over the run are
+listed. tracemalloc slows the run down noticeably; use it for diagnosis,
+not for timing.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from src.utils.timing import observing
+
+# Spans whose end counts as a stage boundary for memory readings
+MEMORY_BOUNDARIES = frozenset({"graph.list", "email", "upload"})
+
+# Stack depth kept by tracemalloc per allocation
+TRACEMALLOC_FRAMES = 10
+
+MIB = 1024 * 1024
+
+
+@dataclass
+class MemoryReading:
+    """Traced memory at one stage boundary (bytes)."""
+    stage: str
+    current: int
+    peak: int  # Peak since the previous boundary
+
+
+class RunProfiler:
+    """Context manager profiling the enclosed block."""
+
+    def __init__(self, memory: bool = False, top: int = 40):
+        """
+        Initialize profiler.
+
+        Args:
+            memory: Also trace memory allocations with tracemalloc.
+            top: Number of functions / allocation sites in the summary.
+        """
+        self.memory = memory
+        self.top = top
+        self.started = datetime.now()
+        self.wall_time = 0.0
+        self.readings: list[MemoryReading] = []
+        self._profile = cProfile.Profile()
+        self._start_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._end_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._observing = None
+        self._perf_start = 0.0
+
+    def __enter__(self) -> "RunProfiler":
+        self.started = datetime.now()
+        if self.memory:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._start_snapshot = tracemalloc.take_snapshot()
+            self._observing = observing(self._on_span)
+            self._observing.__enter__()
+        self._perf_start = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._profile.disable()
+        self.wall_time = time.perf_counter() - self._perf_start
+        if self.memory:
+            self._observing.__exit__(None, None, None)
+            self._read_memory("end")
+            self._end_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def _on_span(self, name: str, seconds: float) -> None:
+        if name in MEMORY_BOUNDARIES:
+            self._read_memory(name)
+
+    def _read_memory(self, stage: str) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.readings.append(MemoryReading(stage=stage, current=current, peak=peak))
+
+    def summary(self) -> str:
+        """
+        Human-readable hotspot summary.
+
+        Returns:
+            Top functions by cumulative and by own time, plus the memory
+            section when memory tracing was on.
+        """
+        lines = [
+            f"Run profile - {self.started.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Wall time: {self.wall_time:.2f} s",
+            "",
+        ]
+
+        for title, sort_key in (("cumulative time", "cumulative"), ("own time", "tottime")):
+            buffer = io.StringIO()
+            pstats.Stats(self._profile, stream=buffer).strip_dirs().sort_stats(sort_key).print_stats(self.top)
+            lines.append(f"=== Top {self.top} functions by {title} ===")
+            lines.append(buffer.getvalue().strip())
+            lines.append("")
+
+        if self.readings:
+            lines.append("=== Traced memory at stage boundaries (MiB) ===")
+            lines.append(f"{'#':>5}  {'Stage':<12} {'Current':>9} {'Peak':>9}")
+            for index, reading in enumerate(self.readings, 1):
+                lines.append(
+                    f"{index:>5}  {reading.stage:<12} "
+                    f"{reading.current / MIB:>9.2f} {reading.peak / MIB:>9.2f}"
+                )
+            highest = max(self.readings, key=lambda reading: reading.peak)
+            lines.append(f"Highest peak: {highest.peak / MIB:.2f} MiB (before boundary #{self.readings.index(highest) + 1})")
+            lines.append("")
+
+        if self._start_snapshot is not None and self._end_snapshot is not None:
+            lines.append(f"=== Top {self.top} allocation sites by growth over the run ===")
+            growth = self._end_snapshot.compare_to(self._start_snapshot, "lineno")
+            for stat in growth[:self.top]:
+                lines.append(str(stat))
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def write(self, output_dir: str, run_timestamp: Optional[datetime] = None) -> tuple[str, str]:
+        """
+        Write the raw profile and the hotspot summary.
+
+        Args:
+            output_dir: Directory (created if missing).
+            run_timestamp: Timestamp for the filenames (profiler start if None).
+
+        Returns:
+            Tuple of (raw profile path, summary path).
+        """
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = self.generate_filename_stem(run_timestamp or self.started)
+
+        raw_path = directory / f"{stem}.prof"
+        self._profile.dump_stats(str(raw_path))
+
+        summary_path = directory / f"{stem}_hotspots.txt"
+        summary_path.write_text(self.summary() + "\n", encoding="utf-8")
+
+        return str(raw_path), str(summary_path)
+
+    @staticmethod
+    def generate_filename_stem(run_timestamp: datetime) -> str:
+        """
+        Generate filename stem matching the run's event log.
+
+        Args:
+            run_timestamp: Timestamp of run.
+
+        Returns:
+            Filename stem (no extension).
+        """
+        return f"Run_Log_{run_timestamp.strftime('%Y%m%d_%H%M%S')}"
@@ -0,0 +1,107 @@
+"""
+Quoted-reply and signature detection for plain-text email bodies.
+"""
+
+import re
+
+from src.utils.text import EAN_PATTERN
+
+
+# Lines that open quoted history; everything from there on is dropped
+QUOTE_SEPARATOR_PATTERNS = [
+    # -----Original Message----- / ---------- Forwarded message ---------
+    re.compile(
+        r'^\s*-{2,}\s*(?:original message|forwarded message|izvirno sporočilo|posredovano sporočilo)\s*-*\s*$',
+        re.IGNORECASE,
+    ),
+    # Outlook plain-text separator line
+    re.compile(r'^\s*_{10,}\s*$'),
+    # "On Mon, 15 Jan 2024 at 10:00, X wrote:" / "V pon., 15. jan. 2024 ob 10:00 je X napisal(a):"
+    re.compile(r'^\s*(?:on|v|dne|am|le)\s.*(?:wrote|napisal(?:\(a\)|a)?|schrieb|écrit)\s*:\s*$', re.IGNORECASE),
+]
+
+# Outlook reply header block: "From:" followed closely by "Sent:"/"Date:"
+REPLY_FROM_PATTERN = re.compile(r'^\s*\*?(?:from|od|von)\s*:\*?\s+\S', re.IGNORECASE)
+REPLY_SENT_PATTERN = re.compile(r'^\s*\*?(?:sent|date|poslano|datum|gesendet)\s*:\*?\s+\S', re.IGNORECASE)
+
+# Lines of a quoted message in "> " style
+QUOTED_LINE_PATTERN = re.compile(r'^\s*>')
+
+# Signature delimiter ("-- ") and common closing phrases
+SIGNATURE_DELIMITER_PATTERN = re.compile(r'^-- ?$')
+CLOSING_PHRASE_PATTERN = re.compile(
+    r'^\s*(?:best regards|kind regards|regards|thanks(?: and regards)?|'
+    r'lep pozdrav|lp|s spoštovanjem|pozdrav|lepo pozdravljeni)\s*[,.!]?\s*$',
+    re.IGNORECASE,
+)
+
+# How far below "From:" the "Sent:" line may appear
+REPLY_HEADER_WINDOW = 4
+
+
+def find_quote_start(lines: list[str]) -> int:
+    """
+    Find the first line of quoted history.
+
+    Args:
+        lines: Body lines.
+
+    Returns:
+        Index of the first quoted line, or len(lines) if there is none.
+    """
+    for i, line in enumerate(lines):
+        if any(pattern.match(line) for pattern in QUOTE_SEPARATOR_PATTERNS):
+            return i
+
+        if REPLY_FROM_PATTERN.match(line) and any(
+            REPLY_SENT_PATTERN.match(following)
+            for following in lines[i + 1:i + 1 + REPLY_HEADER_WINDOW]
+        ):
+            return i
+
+    return len(lines)
+
+
+def find_signature_start(lines: list[str]) -> int:
+    """
+    Find the first line of the signature.
+
+    A "-- " delimiter always starts the signature. A closing phrase
+    ("Best regards", "Lep pozdrav") only does if no EAN-like number follows it.
+
+    Args:
+        lines: Body lines (without quoted history).
+
+    Returns:
+        Index of the first signature line, or len(lines) if there is none.
+    """
+    for i, line in enumerate(lines):
+        if SIGNATURE_DELIMITER_PATTERN.match(line):
+            return i
+
+        if CLOSING_PHRASE_PATTERN.match(line) and not any(
+            EAN_PATTERN.search(following) for following in lines[i + 1:]
+        ):
+            return i
+
+    return len(lines)
+
+
+def strip_quoted_text(text: str) -> tuple[str, bool]:
+    """
+    Remove quoted history, "> " quoted lines and the signature from a body.
+
+    Args:
+        text: Plain-text email body.
+
+    Returns:
+        Tuple of (new content, True if anything was removed).
+    """
+    lines = text.splitlines()
+
+    quote_start = find_quote_start(lines)
+    kept = [line for line in lines[:quote_start] if not QUOTED_LINE_PATTERN.match(line)]
+    kept = kept[:find_signature_start(kept)]
+
+    stripped = "\n".join(kept).strip()
+    return stripped, len(kept) < len(lines)
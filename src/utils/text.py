@@ -1,10 +1,20 @@
 """
 Text extraction utilities with regex patterns.
+
+Scan results are shared between calls on the same text only inside a
+scan_scope() block (the pipeline opens one per email), so no text outlives
+the email it came from.
 """
 
 import re
-from datetime import date, datetime
-from typing import Optional
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Sequence, TypeVar
+
+import numpy as np
 
 
 # EAN patterns (8 or 13 digits)
@@ -26,12 +36,230 @@ DATE_PATTERNS = [
     (re.compile(r'\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})\b', re.IGNORECASE), '%d %b %Y'),
 ]
 
+# Month abbreviations accepted by the "DD MMM YYYY" date pattern
+MONTH_ABBREVIATIONS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# Date role -> keyword alternation that anchors it
+DATE_ROLE_KEYWORDS: dict[str, str] = {
+    'delivery': 'delivery',
+    'order': 'order',
+    'document': 'document|created|date',
+}
+
+# Extended (Slovenian) anchors used for spreadsheet metadata rows
+EXTENDED_DATE_ROLE_KEYWORDS: dict[str, str] = {
+    'delivery': 'delivery|dostava|dobava',
+    'order': 'order|naročilo|naročilnica',
+    'document': 'document|created|date|datum|dokument',
+}
+
+# All anchor words, matched in a single pass. No word is a prefix of another,
+# so each occurrence is attributed to exactly one word.
+DATE_ANCHOR_WORDS: tuple[str, ...] = tuple(sorted({
+    word
+    for role_keywords in (DATE_ROLE_KEYWORDS, EXTENDED_DATE_ROLE_KEYWORDS)
+    for keywords in role_keywords.values()
+    for word in keywords.split('|')
+}))
+DATE_ANCHOR_PATTERN = re.compile(
+    '(?=(?:' + '|'.join(f'({re.escape(word)})' for word in DATE_ANCHOR_WORDS) + '))',
+    re.IGNORECASE,
+)
+
+# Separator allowed between a keyword and its date
+KEYWORD_TAIL_PATTERN = re.compile(r'\s*:?\s*')
+
 # Store/Unit patterns
 STORE_PATTERN = re.compile(r'(?:store|unit|enota|trgovina)\s*:?\s*([A-Z0-9\-]+)', re.IGNORECASE)
 
 # Supplier patterns
 SUPPLIER_PATTERN = re.compile(r'(?:supplier|dobavitelj|prodajalec)\s*:?\s*([A-Za-z0-9\s\-\.]+?)(?:\n|$)', re.IGNORECASE)
 
+T = TypeVar("T")
+
+
+class TextToken(NamedTuple):
+    """Candidate value found in a text, with its character offsets."""
+    kind: str  # "ean", "price", "date", "invoice", "store", "supplier"
+    value: Any
+    start: int
+    end: int
+
+
+class TextScan:
+    """
+    Candidate tokens of a text, scanned lazily per token kind.
+
+    Each field pattern runs over the text the first time its kind is read
+    (one pass per token kind, not one combined pass: the kinds overlap -
+    "15.01" of "15.01.2024" is also a price, an invoice number may be
+    EAN-shaped - and a single alternation would keep only one token per
+    span). The extract_* helpers below are views over this result, so a
+    caller needing one field runs one pattern, and calling several of them
+    on the same text does not rescan it.
+    """
+
+    def __init__(self, text: str):
+        """
+        Prepare a scan of text.
+
+        Args:
+            text: Input text.
+        """
+        self.text = text
+
+    @cached_property
+    def eans(self) -> tuple[TextToken, ...]:
+        """EAN-shaped numbers (unvalidated)."""
+        return _group_tokens(EAN_PATTERN, self.text, "ean")
+
+    @cached_property
+    def prices(self) -> tuple[TextToken, ...]:
+        """Prices as floats."""
+        return _price_tokens(self.text)
+
+    @cached_property
+    def dates(self) -> tuple[TextToken, ...]:
+        """Parseable dates, grouped by pattern in DATE_PATTERNS order."""
+        return _date_tokens(self.text)
+
+    @cached_property
+    def invoices(self) -> tuple[TextToken, ...]:
+        """Invoice numbers."""
+        return _group_tokens(INVOICE_PATTERN, self.text, "invoice", strip=True)
+
+    @cached_property
+    def stores(self) -> tuple[TextToken, ...]:
+        """Store/unit codes."""
+        return _group_tokens(STORE_PATTERN, self.text, "store", strip=True)
+
+    @cached_property
+    def suppliers(self) -> tuple[TextToken, ...]:
+        """Supplier names."""
+        return _group_tokens(SUPPLIER_PATTERN, self.text, "supplier", strip=True)
+
+    @cached_property
+    def valid_eans(self) -> tuple[TextToken, ...]:
+        """EAN candidates that pass is_valid_ean, in text order."""
+        return tuple(token for token in self.eans if is_valid_ean(token.value))
+
+    @cached_property
+    def line_starts(self) -> list[int]:
+        """Sorted start offsets of every line of the text."""
+        return [0] + [match.end() for match in re.finditer('\n', self.text)]
+
+
+# Results shared by identical texts within the active scan_scope()
+_scope_cache: ContextVar[Optional[dict]] = ContextVar("text_scan_cache", default=None)
+
+
+@contextmanager
+def scan_scope() -> Iterator[None]:
+    """
+    Share scan results of identical texts within the block.
+
+    The cache is dropped when the block ends; outside any scope (e.g. in
+    worker threads) every call scans afresh.
+    """
+    token = _scope_cache.set({})
+    try:
+        yield
+    finally:
+        _scope_cache.reset(token)
+
+
+def _scoped(kind: str, text: str, build: Callable[[str], T]) -> T:
+    """Return build(text), reusing the result of the active scope if any."""
+    cache = _scope_cache.get()
+    if cache is None:
+        return build(text)
+    key = (kind, text)
+    if key not in cache:
+        cache[key] = build(text)
+    return cache[key]
+
+
+def scan_text(text: str) -> TextScan:
+    """
+    Scan text for EANs, prices, dates, invoices, stores and suppliers.
+
+    Within a scan_scope(), repeated extraction calls on the same
+    OCR/PDF/body text share a single scan.
+
+    Args:
+        text: Input text.
+
+    Returns:
+        TextScan with positioned tokens.
+    """
+    return _scoped("scan", text, TextScan)
+
+
+def _group_tokens(
+    pattern: re.Pattern,
+    text: str,
+    kind: str,
+    strip: bool = False,
+) -> tuple[TextToken, ...]:
+    """Collect group(1) of every pattern match as tokens."""
+    tokens = []
+    for match in pattern.finditer(text):
+        value = match.group(1)
+        tokens.append(
+            TextToken(kind, value.strip() if strip else value, match.start(1), match.end(1))
+        )
+    return tuple(tokens)
+
+
+def _price_tokens(text: str) -> tuple[TextToken, ...]:
+    """Collect price matches as float tokens."""
+    tokens = []
+    for match in PRICE_PATTERN.finditer(text):
+        # Replace comma with dot for parsing
+        price_str = match.group(1).replace(',', '.')
+        try:
+            price = float(price_str)
+        except ValueError:
+            continue
+        tokens.append(TextToken("price", price, match.start(1), match.end(1)))
+    return tuple(tokens)
+
+
+def _date_tokens(text: str) -> tuple[TextToken, ...]:
+    """Collect parseable dates, grouped by pattern in DATE_PATTERNS order."""
+    tokens = []
+
+    for pattern, date_format in DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            parsed_date = _parse_date_match(match, date_format)
+            if parsed_date is not None:
+                tokens.append(TextToken("date", parsed_date, match.start(), match.end()))
+
+    return tuple(tokens)
+
+
+def _parse_date_match(match: re.Match, date_format: str) -> Optional[date]:
+    """
+    Build a date from a DATE_PATTERNS match without going through strptime.
+
+    Accepts exactly what strptime accepted for the same (regex-shaped) input.
+    """
+    if date_format == '%Y-%m-%d':
+        year, month, day = match.group(1), match.group(2), match.group(3)
+    elif date_format == '%d-%m-%Y':
+        day, month, year = match.group(1), match.group(2), match.group(3)
+    else:
+        day, year = match.group(1), match.group(3)
+        month = MONTH_ABBREVIATIONS[match.group(2).lower()]
+
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
 
 def is_valid_ean(code: str) -> bool:
     """
@@ -92,6 +320,73 @@ def is_valid_ean(code: str) -> bool:
     return True
 
 
+# Checksum weights for the data digits of EAN-13 and EAN-8 codes
+_EAN13_WEIGHTS = np.array([1, 3] * 6, dtype=np.int32)
+_EAN8_WEIGHTS = np.array([3, 1, 3, 1, 3, 1, 3], dtype=np.int32)
+
+
+def validate_ean_batch(codes: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Validate a column of candidate EAN codes at once.
+
+    Applies the same rules as is_valid_ean (length, date-like filters,
+    repeated digits, checksum) with NumPy array operations.
+
+    Args:
+        codes: Candidate digit strings (None or non-digit entries are invalid).
+
+    Returns:
+        Boolean mask, True where the code is a valid EAN.
+    """
+    mask = np.zeros(len(codes), dtype=bool)
+
+    for length in (8, 13):
+        positions = [
+            i for i, code in enumerate(codes)
+            if code is not None and len(code) == length and code.isascii() and code.isdigit()
+        ]
+        if not positions:
+            continue
+
+        joined = "".join(codes[i] for i in positions).encode("ascii")
+        digits = (np.frombuffer(joined, dtype=np.uint8).reshape(-1, length) - 48).astype(np.int32)
+
+        # Filter out all-same-digit numbers
+        valid = ~(digits == digits[:, :1]).all(axis=1)
+
+        if length == 8:
+            # Filter out date-like numbers: YYYYMMDD and DDMMYYYY
+            year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+            month = digits[:, 4] * 10 + digits[:, 5]
+            day = digits[:, 6] * 10 + digits[:, 7]
+            valid &= ~(
+                (year >= 1990) & (year <= 2099)
+                & (month >= 1) & (month <= 12)
+                & (day >= 1) & (day <= 31)
+            )
+
+            day2 = digits[:, 0] * 10 + digits[:, 1]
+            month2 = digits[:, 2] * 10 + digits[:, 3]
+            year2 = digits[:, 4] * 1000 + digits[:, 5] * 100 + digits[:, 6] * 10 + digits[:, 7]
+            valid &= ~(
+                (day2 >= 1) & (day2 <= 31)
+                & (month2 >= 1) & (month2 <= 12)
+                & (year2 >= 1990) & (year2 <= 2099)
+            )
+
+            weights = _EAN8_WEIGHTS
+        else:
+            weights = _EAN13_WEIGHTS
+
+        # Checksum validation
+        check = (10 - (digits[:, :-1] @ weights) % 10) % 10
+        valid &= check == digits[:, -1]
+
+        mask[positions] = valid
+
+    return mask
+
+
 def extract_eans(text: str) -> list[str]:
     """
     Extract EAN codes from text.
@@ -100,12 +395,11 @@ def extract_eans(text: str) -> list[str]:
         text: Input text.
 
     Returns:
-        List of unique EAN codes.
+        List of unique EAN codes, in order of first appearance.
     """
-    matches = EAN_PATTERN.findall(text)
-    # Filter with checksum validation and heuristic filters
-    valid = [m for m in matches if is_valid_ean(m)]
-    return list(set(valid))
+    # Filter with checksum validation and heuristic filters, keep first-seen order
+    valid = [token.value for token in scan_text(text).valid_eans]
+    return list(dict.fromkeys(valid))
 
 
 def extract_prices(text: str) -> list[float]:
@@ -118,19 +412,7 @@ def extract_prices(text: str) -> list[float]:
     Returns:
         List of prices as floats.
     """
-    matches = PRICE_PATTERN.findall(text)
-    prices = []
-
-    for match in matches:
-        # Replace comma with dot for parsing
-        price_str = match.replace(',', '.')
-        try:
-            price = float(price_str)
-            prices.append(price)
-        except ValueError:
-            pass
-
-    return prices
+    return [token.value for token in scan_text(text).prices]
 
 
 def extract_invoice_numbers(text: str) -> list[str]:
@@ -143,8 +425,7 @@ def extract_invoice_numbers(text: str) -> list[str]:
     Returns:
         List of invoice numbers.
     """
-    matches = INVOICE_PATTERN.findall(text)
-    return [m.strip() for m in matches]
+    return [token.value for token in scan_text(text).invoices]
 
 
 def extract_dates(text: str) -> list[date]:
@@ -157,30 +438,7 @@ def extract_dates(text: str) -> list[date]:
     Returns:
         List of date objects.
     """
-    dates_found = []
-
-    for pattern, date_format in DATE_PATTERNS:
-        matches = pattern.findall(text)
-
-        for match in matches:
-            if isinstance(match, tuple):
-                # Reconstruct date string
-                if date_format == '%Y-%m-%d':
-                    date_str = f"{match[0]}-{match[1]}-{match[2]}"
-                elif date_format == '%d-%m-%Y':
-                    date_str = f"{match[0]}-{match[1]}-{match[2]}"
-                elif date_format == '%d %b %Y':
-                    date_str = f"{match[0]} {match[1]} {match[2]}"
-            else:
-                date_str = match
-
-            try:
-                parsed_date = datetime.strptime(date_str, date_format).date()
-                dates_found.append(parsed_date)
-            except ValueError:
-                pass
-
-    return dates_found
+    return [token.value for token in scan_text(text).dates]
 
 
 def extract_stores(text: str) -> list[str]:
@@ -193,8 +451,7 @@ def extract_stores(text: str) -> list[str]:
     Returns:
         List of store identifiers.
     """
-    matches = STORE_PATTERN.findall(text)
-    return [m.strip() for m in matches]
+    return [token.value for token in scan_text(text).stores]
 
 
 def extract_suppliers(text: str) -> list[str]:
@@ -207,8 +464,60 @@ def extract_suppliers(text: str) -> list[str]:
     Returns:
         List of supplier names.
     """
-    matches = SUPPLIER_PATTERN.findall(text)
-    return [m.strip() for m in matches]
+    return [token.value for token in scan_text(text).suppliers]
+
+
+def date_anchor_index(text: str) -> dict[str, tuple[int, ...]]:
+    """
+    Find all date keyword anchors of a text in one pass.
+
+    Shared within a scan_scope() like scan_text.
+
+    Args:
+        text: Input text.
+
+    Returns:
+        Mapping of anchor word (see DATE_ANCHOR_WORDS) to its start offsets.
+    """
+    return _scoped("anchors", text, _build_anchor_index)
+
+
+def _build_anchor_index(text: str) -> dict[str, tuple[int, ...]]:
+    """Collect anchor offsets by word."""
+    positions: dict[str, list[int]] = {}
+    for match in DATE_ANCHOR_PATTERN.finditer(text):
+        word = DATE_ANCHOR_WORDS[match.lastindex - 1]
+        positions.setdefault(word, []).append(match.start())
+    return {word: tuple(starts) for word, starts in positions.items()}
+
+
+@lru_cache(maxsize=64)
+def _compile_keyword_pattern(keyword: str) -> re.Pattern:
+    """Compile (once) a keyword pattern outside the anchor vocabulary."""
+    return re.compile(rf'{keyword}\s*:?\s*', re.IGNORECASE)
+
+
+def _find_keyword_end(text: str, keyword: str) -> Optional[int]:
+    """Return the offset right after the first keyword hit, or None."""
+    words = keyword.split('|')
+
+    if not all(word in DATE_ANCHOR_WORDS for word in words):
+        match = _compile_keyword_pattern(keyword).search(text)
+        return match.end() if match else None
+
+    index = date_anchor_index(text)
+    first_hits = [(index[word][0], word) for word in words if word in index]
+    if not first_hits:
+        return None
+
+    start, word = min(first_hits)
+    end = start + len(word)
+
+    # As in the regex form "a|b\s*:?\s*", the separator belongs to the last word only
+    if word == words[-1]:
+        end = KEYWORD_TAIL_PATTERN.match(text, end).end()
+
+    return end
 
 
 def find_date_by_keyword(text: str, keyword: str) -> Optional[date]:
@@ -222,18 +531,108 @@ def find_date_by_keyword(text: str, keyword: str) -> Optional[date]:
     Returns:
         Date object or None.
     """
-    # Search for keyword
-    keyword_pattern = re.compile(rf'{keyword}\s*:?\s*', re.IGNORECASE)
-    match = keyword_pattern.search(text)
+    start_pos = _find_keyword_end(text, keyword)
 
-    if not match:
+    if start_pos is None:
         return None
 
     # Extract text after keyword (next 50 characters)
-    start_pos = match.end()
     snippet = text[start_pos:start_pos + 50]
 
-    # Try to find date in snippet
-    dates = extract_dates(snippet)
+    # Try to find date in snippet (not cached: snippets are short and one-off)
+    dates = _date_tokens(snippet)
+
+    return dates[0].value if dates else None
+
+
+def find_dates_by_role(
+    text: str,
+    role_keywords: dict[str, str] = DATE_ROLE_KEYWORDS,
+) -> dict[str, Optional[date]]:
+    """
+    Find the delivery, order and document dates of a text.
 
-    return dates[0] if dates else None
+    Args:
+        text: Input text.
+        role_keywords: Date role -> keyword alternation.
+
+    Returns:
+        Mapping of date role to date (or None).
+    """
+    return {
+        role: find_date_by_keyword(text, keyword)
+        for role, keyword in role_keywords.items()
+    }
+
+
+def associate_by_position(
+    scan: TextScan,
+    anchors: Sequence[TextToken],
+    values: Sequence[TextToken],
+) -> dict[str, Any]:
+    """
+    Link each anchor token (EAN) to the nearest value token (price, store).
+
+    An anchor's row runs from the previous anchor to the next one. Within it,
+    the nearest value on the anchor's own line wins (ties go to the value after
+    the anchor); otherwise the first value on a following line of the row is
+    used. Lookups use sorted offsets and binary search, so the cost grows
+    linearly with the number of anchors.
+
+    Args:
+        scan: Scan of the text both token lists come from.
+        anchors: Anchor tokens in text order.
+        values: Value tokens in text order.
+
+    Returns:
+        Mapping of anchor value to the associated token value.
+    """
+    associated: dict[str, Any] = {}
+
+    if not anchors or not values:
+        return associated
+
+    text_len = len(scan.text)
+    line_starts = scan.line_starts
+    value_starts = [token.start for token in values]
+
+    for i, anchor in enumerate(anchors):
+        if anchor.value in associated:
+            continue
+
+        # Row bounds: between the neighbouring anchors
+        row_start = anchors[i - 1].end if i > 0 else 0
+        row_end = anchors[i + 1].start if i + 1 < len(anchors) else text_len
+
+        # Line bounds of the anchor
+        line_idx = bisect_right(line_starts, anchor.start) - 1
+        line_end = line_starts[line_idx + 1] if line_idx + 1 < len(line_starts) else text_len
+        lo = bisect_left(value_starts, max(row_start, line_starts[line_idx]))
+        hi = bisect_left(value_starts, min(row_end, line_end))
+
+        best = None
+        best_key = None
+
+        # Nearest value after the anchor
+        j = max(bisect_left(value_starts, anchor.end), lo)
+        if j < hi:
+            best = values[j]
+            best_key = values[j].start - anchor.end
+
+        # Nearest value before the anchor (skipping tokens that overlap it)
+        k = min(j, hi) - 1
+        while k >= lo and values[k].end > anchor.start:
+            k -= 1
+        if k >= lo and (best_key is None or anchor.start - values[k].end < best_key):
+            best = values[k]
+
+        # Vertical layout: first value on a following line of the row
+        if best is None and line_end < row_end:
+            j = bisect_left(value_starts, max(line_end, row_start))
+            if j < len(values) and values[j].start < row_end:
+                best = values[j]
+
+        if best is not None:
+            associated[anchor.value] = best.value
+
+    return associated
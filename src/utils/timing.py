@@ -0,0 +1,172 @@
+"""
+Lightweight timing spans for pipeline stages.
+
+Code marks a stage with `with span("ocr.image"):`. Durations go to the
+Timings made active by `recording(...)` in the current context; without one,
+spans cost a context-variable lookup and record nothing. Spans may nest
+(e.g. "pdf.render" inside "extract.ocr"), so stage times do not add up to
+the email total.
+
+Worker threads (Claude fallback) do not inherit the active Timings; the
+time an email waits for them is recorded by the caller.
+
+Observers registered with observing() are called as each span recorded
+into any Timings ends (the profiler takes memory readings at stage boundaries this way).
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+
+@dataclass
+class StageSummary:
+    """Duration statistics of one stage (seconds)."""
+    count: int
+    total: float
+    p50: float
+    p95: float
+    max: float
+
+    def as_dict(self) -> dict:
+        """Summary as a JSON-ready dict."""
+        return {
+            "count": self.count,
+            "total": round(self.total, 4),
+            "p50": round(self.p50, 4),
+            "p95": round(self.p95, 4),
+            "max": round(self.max, 4),
+        }
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        sorted_values: Values in ascending order (not empty).
+        fraction: Percentile as a fraction (0.95 for p95).
+
+    Returns:
+        The percentile value.
+    """
+    rank = max(1, math.ceil(len(sorted_values) * fraction))
+    return sorted_values[rank - 1]
+
+
+class Timings:
+    """Span durations by stage name."""
+
+    __slots__ = ("samples",)
+
+    def __init__(self):
+        """Initialize empty timings."""
+        self.samples: dict[str, list[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Record one span.
+
+        Args:
+            name: Stage name.
+            seconds: Duration.
+        """
+        self.samples.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one span of a stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.add(name, seconds)
+            for observer in _observers:
+                observer(name, seconds)
+
+    def merge(self, other: "Timings") -> None:
+        """
+        Add all spans of another Timings.
+
+        Args:
+            other: Timings to merge in.
+        """
+        for name, values in other.samples.items():
+            self.samples.setdefault(name, []).extend(values)
+
+    def totals(self) -> dict[str, float]:
+        """Total seconds per stage, rounded to milliseconds."""
+        return {name: round(sum(values), 3) for name, values in self.samples.items()}
+
+    def summary(self) -> dict[str, StageSummary]:
+        """Count, total, p50, p95 and max per stage, in stage name order."""
+        result = {}
+        for name in sorted(self.samples):
+            values = sorted(self.samples[name])
+            result[name] = StageSummary(
+                count=len(values),
+                total=sum(values),
+                p50=percentile(values, 0.5),
+                p95=percentile(values, 0.95),
+                max=values[-1],
+            )
+        return result
+
+
+_active: ContextVar[Optional[Timings]] = ContextVar("timings", default=None)
+
+# Called as observer(name, seconds) after each recorded span
+_observers: list[Callable[[str, float], None]] = []
+
+
+@contextmanager
+def recording(timings: Timings) -> Iterator[Timings]:
+    """
+    Make timings the target of span() in this context.
+
+    Args:
+        timings: Timings to record into.
+
+    Yields:
+        The same timings.
+    """
+    token = _active.set(timings)
+    try:
+        yield timings
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block into the active Timings (if any).
+
+    Args:
+        name: Stage name, e.g. "graph.fetch" or "ocr.image".
+    """
+    timings = _active.get()
+    if timings is None:
+        yield
+        return
+    with timings.span(name):
+        yield
+
+
+@contextmanager
+def observing(observer: Callable[[str, float], None]) -> Iterator[None]:
+    """
+    Call observer(name, seconds) after each Timings span ending in this block.
+
+    Args:
+        observer: Callback; must be cheap, it runs inside the pipeline.
+    """
+    _observers.append(observer)
+    try:
+        yield
+    finally:
+        _observers.remove(observer)
@@ -0,0 +1,93 @@
+"""
+Tests for streaming attachment response decoding.
+"""
+
+import base64
+import json
+import os
+
+import pytest
+
+from src.integrations.graph.attachment_stream import (
+    AttachmentStreamError,
+    AttachmentStreamParser,
+    iter_file_attachments,
+    parse_attachment_stream,
+)
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _response(*items) -> bytes:
+    return json.dumps({"@odata.context": "x", "value": list(items)}).encode()
+
+
+def test_payloads_decoded_across_chunk_boundaries():
+    """Test decoding with chunks that split base64 quads, keys and escapes."""
+    payload = os.urandom(1000)
+    body = _response(
+        {
+            "@odata.type": "#microsoft.graph.fileAttachment",
+            "name": "prices \"final\".xlsx",
+            "contentType": "application/pdf",
+            "size": 1000,
+            "contentBytes": base64.b64encode(payload).decode(),
+        },
+        {"@odata.type": "#microsoft.graph.itemAttachment", "name": "Fwd"},
+        {"@odata.type": "#microsoft.graph.fileAttachment", "name": "empty.txt", "contentBytes": ""},
+    ).replace(b"/", b"\\/")  # Escaped slashes, as some serializers emit
+
+    for size in (1, 7, 4096):
+        data = parse_attachment_stream(_chunks(body, size), memory_limit=100)
+        files = list(iter_file_attachments(data))
+
+        assert files[0]["contentType"] == "application/pdf"
+        assert [item["name"] for item in files] == ["prices \"final\".xlsx", "empty.txt"]
+        assert files[0]["contentBytes"].read_bytes() == payload
+        assert not files[0]["contentBytes"].in_memory
+        assert files[1]["contentBytes"].size == 0
+
+
+def test_invalid_payload_raises():
+    """Test that broken base64 and truncated responses are reported."""
+    with pytest.raises(AttachmentStreamError):
+        parse_attachment_stream([b'{"value": [{"contentBytes": "QUJD\\u0041"}]}'])
+
+    with pytest.raises(AttachmentStreamError):
+        parse_attachment_stream([b'{"value": [{"contentBytes": "QUJD'])
+
+
+def test_unicode_escaped_base64_characters_are_decoded():
+    """Test "\\u002B"-style escapes of base64 characters, also split across chunks."""
+    payload = bytes([0xFB, 0xEF, 0xBE]) * 50  # Encodes to "++++..."
+    encoded = base64.b64encode(payload).decode()
+    assert "+" in encoded
+    body = _response(
+        {"@odata.type": "#microsoft.graph.fileAttachment", "name": "a.pdf", "contentBytes": encoded}
+    ).replace(b"+", b"\\u002B")
+
+    for size in (1, 3, 4096):
+        files = list(iter_file_attachments(parse_attachment_stream(_chunks(body, size))))
+
+        assert files[0]["contentBytes"].read_bytes() == payload
+
+    with pytest.raises(AttachmentStreamError):
+        parse_attachment_stream([b'{"value": [{"contentBytes": "QUJD\\u00e9"}]}'])
+
+
+def test_decoded_payloads_released_when_response_is_invalid(tmp_path, monkeypatch):
+    """Test that spooled payloads are deleted when the metadata does not parse."""
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    payload = base64.b64encode(os.urandom(1000))
+
+    parser = AttachmentStreamParser(memory_limit=100)
+    parser.feed(b'{"value": [{"contentBytes": "' + payload + b'"} oops')
+    assert len(list(tmp_path.iterdir())) == 1
+
+    with pytest.raises(AttachmentStreamError):
+        parser.close()
+
+    assert list(tmp_path.iterdir()) == []
+    assert parser.blobs == []
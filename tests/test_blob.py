@@ -0,0 +1,78 @@
+"""
+Tests for attachment payload blobs.
+"""
+
+import io
+import os
+
+import openpyxl
+
+from src.core.csv_extractor import extract_structured_from_csv
+from src.core.models import EmailAttachment
+from src.integrations.excel.readers import OpenpyxlReader
+from src.utils.blob import Blob
+
+
+def test_small_payload_stays_in_memory():
+    """Test that small payloads are shared, not copied or spilled."""
+    data = b"x" * 100
+    blob = Blob.from_bytes(data, memory_limit=1024)
+
+    assert blob.in_memory
+    assert blob.read_bytes() is data
+    assert blob.head(3) == b"xxx"
+
+    with blob.as_path(".bin") as path:
+        assert path.read_bytes() == data
+    assert not path.exists()
+
+
+def test_large_payload_spills_to_disk_and_is_removed_on_close():
+    """Test spilling above the memory limit, reading back, and cleanup."""
+    blob = Blob.from_chunks([b"abc"] * 10, memory_limit=8)
+
+    assert not blob.in_memory
+    assert blob.size == 30
+    with blob.open() as stream:
+        assert stream.read() == b"abc" * 10
+    with blob.view() as buffer:
+        assert bytes(buffer[:6]) == b"abcabc"
+
+    with blob.as_path() as path:
+        assert path.exists()  # Used in place, no extra copy
+    blob.close()
+    assert not os.path.exists(path)
+
+
+def test_adopt_file_moves_ownership(tmp_path):
+    """Test that an adopted file is moved and deleted with the blob."""
+    source = tmp_path / "page-1.png"
+    source.write_bytes(b"png")
+
+    blob = Blob.adopt_file(source)
+
+    assert not source.exists()
+    assert blob.read_bytes() == b"png"
+    with blob.as_path() as path:
+        pass
+    del blob
+    assert not os.path.exists(path)
+
+
+def test_attachment_wraps_bytes_and_consumers_read_spilled_blobs():
+    """Test that readers and the CSV extractor work on disk-backed content."""
+    attachment = EmailAttachment(filename="a.csv", content_type="text/csv", content=b"EAN\n12345670\n", size=13)
+    assert isinstance(attachment.content, Blob)
+
+    csv_blob = Blob.from_bytes(b"EAN;Cena\n12345670;10,50\n", memory_limit=0)
+    result = extract_structured_from_csv(csv_blob, "prices.csv")
+    assert result.supplier_prices == {"12345670": 10.50}
+
+    workbook = openpyxl.Workbook()
+    workbook.active.append(["EAN", 12345670])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    xlsx_blob = Blob.from_bytes(buffer.getvalue(), memory_limit=0)
+
+    (name, rows), = [(name, list(rows)) for name, rows in OpenpyxlReader().iter_sheets(xlsx_blob)]
+    assert rows == [("EAN", 12345670)]
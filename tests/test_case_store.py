@@ -0,0 +1,95 @@
+"""
+Tests for the local case store.
+"""
+
+from datetime import date
+
+from src.core.models import CaseMetadata, CaseRow
+from src.integrations.storage.case_store import CaseStore, CaseStoreAppender
+
+
+def _case(ean: str, price: float = 10.5) -> CaseRow:
+    return CaseRow(
+        unit_store="S01",
+        ean_code=ean,
+        supplier_price=price,
+        internal_price=None,
+        meta=CaseMetadata(
+            document_creation_date=None,
+            delivery_date=date(2024, 1, 15),
+            order_creation_date=None,
+            supplier_name=None,
+            supplier_invoice_number=None,
+            email_sender_address="test@example.com",
+            email_link="https://outlook.com/test",
+            comments="Sources: body",
+        ),
+    )
+
+
+def test_add_cases_skips_duplicates(tmp_path):
+    """Test that only new cases are appended, in order, per period."""
+    path = str(tmp_path / "store.sqlite3")
+
+    with CaseStore(path) as store:
+        appender = CaseStoreAppender(store, "Price_Discrepancies_2024-01-15")
+        appender.extend([_case("12345670"), _case("87654325")])
+        appender.extend([_case("12345670"), _case("12345670", price=11.0)])
+        store.add_cases("Price_Discrepancies_2024-01-16", [_case("12345670")])
+        store.commit()
+
+        assert appender.rows_written == 3
+
+    with CaseStore(path) as store:
+        cases = list(store.iter_cases("Price_Discrepancies_2024-01-15"))
+
+        assert [(c.ean_code, c.supplier_price) for c in cases] == [
+            ("12345670", 10.5), ("87654325", 10.5), ("12345670", 11.0),
+        ]
+        assert cases[0] == _case("12345670")
+        assert store.count("Price_Discrepancies_2024-01-16") == 1
+
+
+def test_uncommitted_cases_are_discarded(tmp_path):
+    """Test that closing without commit (dry run) leaves the store unchanged."""
+    path = str(tmp_path / "store.sqlite3")
+
+    with CaseStore(path) as store:
+        store.add_cases("period", [_case("12345670")])
+        assert store.count("period") == 1
+
+    with CaseStore(path) as store:
+        assert store.count("period") == 0
+
+
+def test_appender_commits_each_email(tmp_path):
+    """Test that cases are persisted per extend, and a failed extend adds nothing."""
+    path = str(tmp_path / "store.sqlite3")
+
+    def failing_cases():
+        yield _case("87654325")
+        raise RuntimeError("extraction bug")
+
+    with CaseStore(path) as store:
+        appender = CaseStoreAppender(store, "period", commit_each=True)
+        appender.extend([_case("12345670")])
+
+        try:
+            appender.extend(failing_cases())
+        except RuntimeError:
+            pass
+
+        # Visible from another connection before the run ends
+        with CaseStore(path) as other:
+            assert [c.ean_code for c in other.iter_cases("period")] == ["12345670"]
+        assert appender.rows_written == 1
+
+    with CaseStore(path) as store:
+        dry_run = CaseStoreAppender(store, "period")
+        dry_run.extend([_case("87654325")])
+        dry_run.extend([_case("1234567890128")])
+
+        assert store.count("period") == 3
+
+    with CaseStore(path) as store:
+        assert store.count("period") == 1
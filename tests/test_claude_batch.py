@@ -0,0 +1,136 @@
+"""
+Tests for Claude batch mode against a local stand-in for the Message Batches API.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+
+from src.integrations.anthropic.cache import ResponseCache
+from src.integrations.anthropic.client import ClaudeClient
+from src.integrations.anthropic.fallback import ClaudeBatchFallback
+
+
+class _BatchServer(ThreadingHTTPServer):
+    """Answers every request with the EANs found in its prompt."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _BatchHandler)
+        self.batches: dict[str, list[dict]] = {}
+        self.polls = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _BatchHandler(BaseHTTPRequestHandler):
+    server: _BatchServer
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: bytes, content_type: str = "application/json"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _batch(self, batch_id: str, ended: bool) -> dict:
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2024-01-15T00:00:00Z",
+            "expires_at": "2024-01-16T00:00:00Z",
+            "ended_at": "2024-01-15T00:01:00Z" if ended else None,
+            "cancel_initiated_at": None,
+            "archived_at": None,
+            "results_url": f"{self.server.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        batch_id = f"msgbatch_{len(self.server.batches) + 1}"
+        self.server.batches[batch_id] = body["requests"]
+        self._send(json.dumps(self._batch(batch_id, ended=False)).encode())
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        batch_id = parts[3]
+        if parts[-1] == "results":
+            lines = []
+            for request in self.server.batches[batch_id]:
+                prompt = request["params"]["messages"][0]["content"][-1]["text"]
+                eans = [word for word in prompt.split() if word.isdigit() and len(word) == 8]
+                message = {
+                    "id": "msg_1",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request["params"]["model"],
+                    "content": [{"type": "text", "text": json.dumps({"ean_codes": eans})}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 100, "output_tokens": 10},
+                }
+                lines.append(json.dumps({
+                    "custom_id": request["custom_id"],
+                    "result": {"type": "succeeded", "message": message},
+                }))
+            self._send("\n".join(lines).encode(), "application/binary")
+        else:
+            self.server.polls += 1
+            self._send(json.dumps(self._batch(batch_id, ended=self.server.polls > 1)).encode())
+
+
+@pytest.fixture
+def batch_server():
+    server = _BatchServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server: _BatchServer, cache=None) -> ClaudeClient:
+    config = Mock()
+    config.anthropic_api_key = "test-key"
+    config.anthropic_base_url = server.url
+    config.claude_input_token_budget = 4000
+    return ClaudeClient(config, cache=cache)
+
+
+def test_batch_fallback_resolves_all_requests_in_one_batch(batch_server, tmp_path):
+    """Test collection, de-duplication, polling and cached re-runs."""
+    with ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=3600, max_entries=100) as cache:
+        fallback = ClaudeBatchFallback(_client(batch_server, cache), poll_interval=0.01, timeout=10)
+        assert fallback._executor is None  # Batch mode starts no worker threads
+        first = fallback.submit("scan 12345670")
+        second = fallback.submit("scan 96385074")
+        duplicate = fallback.submit("scan 12345670")
+
+        assert not first.future.done()
+        fallback.flush()
+
+        assert len(batch_server.batches) == 1
+        assert len(batch_server.batches["msgbatch_1"]) == 2
+        assert fallback.result(first) == {"ean_codes": ["12345670"]}
+        assert fallback.result(second) == {"ean_codes": ["96385074"]}
+        assert fallback.result(duplicate) == {"ean_codes": ["12345670"]}
+
+        # Next run: answered from the cache without a new batch
+        rerun = ClaudeBatchFallback(_client(batch_server, cache), poll_interval=0.01, timeout=10)
+        assert rerun.result(rerun.submit("scan 96385074")) == {"ean_codes": ["96385074"]}
+        assert len(batch_server.batches) == 1
+        assert cache.stats.hits == 1
+        # Batch requests have no latency of their own; the wall time is kept per batch
+        assert cache.stats.latency_saved == 0.0
+        assert fallback.client.usage.batches == 1
+        assert fallback.client.usage.batch_calls == 2
+        assert fallback.client.usage.latency_per_call == 0.0
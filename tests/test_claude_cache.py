@@ -0,0 +1,56 @@
+"""
+Tests for the Claude response cache.
+"""
+
+from unittest.mock import Mock, patch
+
+from src.integrations.anthropic.cache import CachedResponse, ResponseCache, make_cache_key
+
+
+def test_cache_ttl_and_lru_eviction(tmp_path):
+    """Test expiry after the TTL and eviction of least recently used entries."""
+    with ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=100, max_entries=2) as cache:
+        with patch("src.integrations.anthropic.cache.time.time", return_value=1000.0):
+            cache.put("a", "model", CachedResponse("A", input_tokens=10, output_tokens=2, latency=1.5))
+            cache.put("b", "model", CachedResponse("B"))
+        with patch("src.integrations.anthropic.cache.time.time", return_value=1010.0):
+            assert cache.get("a").text == "A"  # "a" is now the most recently used
+            cache.put("c", "model", CachedResponse("C"))
+
+        assert cache.count() == 2
+        assert cache.get("b") is None
+
+        with patch("src.integrations.anthropic.cache.time.time", return_value=1200.0):
+            assert cache.get("a") is None  # Expired
+
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+        assert cache.stats.input_tokens_saved == 10
+        assert cache.stats.latency_saved == 1.5
+
+
+def test_claude_client_answers_repeated_prompt_from_cache(tmp_path):
+    """Test that an identical extraction request calls the API only once."""
+    from src.integrations.anthropic.client import ClaudeClient
+
+    message = Mock()
+    message.content = [Mock(text='{"ean_codes": ["12345670"]}')]
+    message.usage = Mock(input_tokens=500, output_tokens=40)
+
+    config = Mock()
+    config.anthropic_api_key = "key"
+    config.claude_input_token_budget = 4000
+
+    with patch("src.integrations.anthropic.client.anthropic.Anthropic") as mock_anthropic:
+        mock_anthropic.return_value.messages.create.return_value = message
+
+        with ResponseCache(str(tmp_path / "cache.db"), ttl_seconds=3600, max_entries=10) as cache:
+            first = ClaudeClient(config, cache=cache).extract_structured_data("OCR text")
+            second = ClaudeClient(config, cache=cache).extract_structured_data("OCR text")
+
+            assert first == second == {"ean_codes": ["12345670"]}
+            assert mock_anthropic.return_value.messages.create.call_count == 1
+            assert cache.stats.hits == 1
+            assert cache.stats.output_tokens_saved == 40
+
+    assert make_cache_key("m", prompt="x") != make_cache_key("other", prompt="x")
@@ -0,0 +1,179 @@
+"""
+Tests for the Claude fallback executor.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from src.core.extractors import DataExtractor
+from src.integrations.anthropic.fallback import ClaudeFallback
+
+
+class _FakeClient:
+    """Stand-in for ClaudeClient.request_structured_data."""
+
+    def __init__(self, delay=0.0, error=None, data=None):
+        self.delay = delay
+        self.error = error
+        self.data = data if data is not None else {"ean_codes": ["12345670"]}
+        self.calls = 0
+
+    def request_structured_data(self, text, timeout=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.data
+
+
+def test_request_runs_in_background_until_deadline():
+    """Test that submit does not block, and slow requests hit the deadline."""
+    fallback = ClaudeFallback(_FakeClient(delay=0.2), deadline_seconds=1.0)
+    started = time.monotonic()
+    pending = fallback.submit("text")
+    assert time.monotonic() - started < 0.1
+    assert fallback.result(pending) == {"ean_codes": ["12345670"]}
+
+    slow = ClaudeFallback(_FakeClient(delay=0.5), deadline_seconds=0.05)
+    assert slow.result(slow.submit("text")) is None
+    assert slow.stats.timed_out == 1
+    fallback.shutdown()
+    slow.shutdown()
+
+
+def test_circuit_breaker_disables_fallback_after_repeated_failures():
+    """Test that consecutive failures open the circuit for the rest of the run."""
+    client = _FakeClient(error=RuntimeError("overloaded"))
+    fallback = ClaudeFallback(client, failure_threshold=2)
+
+    assert fallback.result(fallback.submit("a")) is None
+    assert fallback.available
+    assert fallback.result(fallback.submit("b")) is None
+    assert not fallback.available
+
+    assert fallback.submit("c") is None
+    assert client.calls == 2
+    assert fallback.stats.failed == 2
+    assert fallback.stats.skipped == 1
+    fallback.shutdown()
+
+
+def test_concurrency_cap():
+    """Test that no more than max_concurrency requests run at once."""
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    class _Client:
+        def request_structured_data(self, text, timeout=None):
+            with lock:
+                running.append(text)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(text)
+            return {}
+
+    fallback = ClaudeFallback(_Client(), max_concurrency=2, deadline_seconds=5.0)
+    pending = [fallback.submit(str(i)) for i in range(6)]
+    assert all(fallback.result(p) == {} for p in pending)
+    assert max(peak) == 2
+    fallback.shutdown()
+
+
+@patch("src.core.extractors.OCRPipeline")
+def test_ocr_extraction_merges_background_claude_result(mock_ocr_pipeline):
+    """Test that Claude data submitted at OCR time is merged when finished."""
+    mock_ocr_pipeline.return_value.get_combined_ocr_text.return_value = "scanned text without codes"
+    fallback = ClaudeFallback(_FakeClient())
+    extractor = DataExtractor(Mock(), claude_fallback=fallback)
+
+    ocr = extractor.start_ocr_extraction(Mock())
+    assert ocr.claude_request is not None
+
+    extracted = extractor.finish_ocr_extraction(ocr)
+    assert extracted.eans == ["12345670"]
+    fallback.shutdown()
+
+
+def test_queued_request_gets_remaining_time_and_no_retries():
+    """Test that a worker only gets the time left, and a request queued past its deadline is not sent."""
+    timeouts = []
+
+    class _Client:
+        def request_structured_data(self, text, timeout=None):
+            timeouts.append(timeout)
+            time.sleep(0.2)
+            return {}
+
+    fallback = ClaudeFallback(_Client(), max_concurrency=1, deadline_seconds=0.1)
+    first, queued = fallback.submit("a"), fallback.submit("b")
+    assert fallback.result(first) is None
+    assert fallback.result(queued) is None
+    time.sleep(0.3)
+
+    assert len(timeouts) == 1 and timeouts[0] <= 0.1
+    fallback.shutdown()
+
+    from src.integrations.anthropic.fallback import build_claude_fallback
+
+    config = Mock(
+        anthropic_api_key="key",
+        anthropic_base_url=None,
+        claude_mode="realtime",
+        claude_max_concurrency=2,
+        claude_deadline_seconds=30.0,
+        claude_failure_threshold=3,
+    )
+    built = build_claude_fallback(config)
+    assert built.client.client.max_retries == 0
+    built.shutdown()
+
+
+@patch("src.core.extractors.OCRPipeline")
+def test_pipeline_keeps_claude_requests_of_several_emails_in_flight(mock_ocr_pipeline):
+    """Test that emails waiting on Claude do not block the next ones, and results keep input order."""
+    from datetime import datetime
+
+    from src.core.models import EmailItem, ProcessStatus
+    from src.core.pipeline import process_messages
+
+    mock_ocr_pipeline.return_value.get_combined_ocr_text.return_value = "Delivery Date: 2024-01-15\nscan"
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    class _Client:
+        def request_structured_data(self, text, timeout=None):
+            with lock:
+                running.append(text)
+                peak.append(len(running))
+            time.sleep(0.3)
+            with lock:
+                running.remove(text)
+            return {"ean_codes": ["12345670"]}
+
+    mail_client = Mock()
+    mail_client.get_email_item.side_effect = lambda meta: EmailItem(
+        message_id=meta["id"],
+        sender_address="test@example.com",
+        subject=meta["subject"],
+        received_datetime=datetime(2024, 1, 15),
+        body_html=None,
+        body_text=None,
+    )
+    messages = [{"id": f"msg-{i}", "subject": f"Scan {i}"} for i in range(4)]
+    fallback = ClaudeFallback(_Client(), max_concurrency=3, deadline_seconds=5.0)
+
+    started = time.monotonic()
+    results = process_messages(mail_client, messages, Mock(), claude_fallback=fallback)
+    elapsed = time.monotonic() - started
+    fallback.shutdown()
+
+    assert [r.email_item.message_id for r in results] == ["msg-0", "msg-1", "msg-2", "msg-3"]
+    assert all(r.status == ProcessStatus.PROCESSED and r.cases_extracted == 1 for r in results)
+    assert max(peak) == 3
+    assert elapsed < 0.9  # Two rounds of 0.3 s, not four
+    # Waiting for free request slots is not charged to the email that filled them
+    assert all(r.timings["email"] < 0.2 for r in results)
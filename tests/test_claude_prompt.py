@@ -0,0 +1,110 @@
+"""
+Tests for Claude prompt construction: prompt-cache markers, trimming and usage.
+"""
+
+from unittest.mock import Mock, patch
+
+from src.integrations.anthropic.prompts import STRUCTURED_EXTRACTION_INSTRUCTIONS
+from src.integrations.anthropic.trimming import GAP_MARKER, estimate_tokens, trim_to_budget
+from src.integrations.anthropic.usage import UsageStats
+
+
+def test_trim_keeps_relevant_lines_within_budget():
+    """Test that lines near EANs, prices and anchors survive, boilerplate goes."""
+    boilerplate = ["General terms and conditions apply to all deliveries of goods."] * 200
+    text = "\n".join(
+        ["[OCR from scan.pdf]"]
+        + boilerplate[:100]
+        + ["Artikel Nr.", "EAN 1234567890128", "Cena: 12,50 EUR"]
+        + boilerplate[100:]
+        + ["Datum dobave: 15.01.2024"]
+    )
+
+    trimmed = trim_to_budget(text, token_budget=100)
+
+    assert trimmed.trimmed
+    assert trimmed.tokens <= 100 < trimmed.original_tokens
+    lines = trimmed.text.splitlines()
+    assert lines[0] == "[OCR from scan.pdf]"
+    assert "EAN 1234567890128" in lines
+    assert "Cena: 12,50 EUR" in lines
+    assert "Datum dobave: 15.01.2024" in lines
+    assert GAP_MARKER in lines
+    # Original order is kept
+    assert lines.index("Artikel Nr.") < lines.index("EAN 1234567890128")
+
+    short = "EAN 1234567890128"
+    assert trim_to_budget(short, token_budget=100).text == short
+    assert trim_to_budget(text, token_budget=0).text == text
+    assert estimate_tokens("abcde") == 2
+
+
+def _structured_request(text: str):
+    """Send one structured request through a mocked SDK; return (client, request kwargs)."""
+    from src.integrations.anthropic.client import ClaudeClient
+
+    message = Mock()
+    message.content = [Mock(text='{"ean_codes": []}')]
+    message.usage = Mock(
+        input_tokens=300, output_tokens=20, cache_creation_input_tokens=0, cache_read_input_tokens=900
+    )
+
+    config = Mock()
+    config.anthropic_api_key = "key"
+    config.claude_input_token_budget = 50
+
+    with patch("src.integrations.anthropic.client.anthropic.Anthropic") as mock_anthropic:
+        mock_anthropic.return_value.messages.create.return_value = message
+        client = ClaudeClient(config)
+        client.request_structured_data(text)
+
+        return client, mock_anthropic.return_value.messages.create.call_args.kwargs
+
+
+def test_structured_request_trims_source_and_reports_usage():
+    """Test source-text trimming and token/latency accounting."""
+    client, request = _structured_request("footer text\n" * 100 + "EAN 1234567890128")
+
+    instructions, source = request["messages"][0]["content"]
+    assert instructions["text"] == STRUCTURED_EXTRACTION_INSTRUCTIONS
+    assert "EAN 1234567890128" in source["text"]
+    assert source["text"].count("footer text") == 1  # Only the neighbour of the EAN line
+
+    assert client.usage.calls == 1
+    assert client.usage.trimmed_prompts == 1
+    assert client.usage.as_dict()["cache_read_input_tokens"] == 900
+    assert client.usage.tokens_per_call == 320
+
+
+def test_short_prompt_prefix_is_sent_without_cache_marker():
+    """Test that no cache marker is sent while the static prefix is too short to cache."""
+    _, request = _structured_request("EAN 1234567890128")
+
+    assert all("cache_control" not in block for block in request["system"])
+    assert all("cache_control" not in block for block in request["messages"][0]["content"])
+
+
+def test_long_prompt_prefix_gets_one_cache_marker():
+    """Test the single cache breakpoint at the end of a cacheable prefix."""
+    long_instructions = STRUCTURED_EXTRACTION_INSTRUCTIONS + "\n" + "x" * 5000
+
+    with patch("src.integrations.anthropic.prompts.STRUCTURED_EXTRACTION_INSTRUCTIONS", long_instructions):
+        _, request = _structured_request("EAN 1234567890128")
+
+    assert all("cache_control" not in block for block in request["system"])
+    instructions, source = request["messages"][0]["content"]
+    assert instructions["text"] == long_instructions
+    assert instructions["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in source
+
+
+def test_usage_stats_ignore_missing_counters():
+    """Test that responses without prompt-cache counters are counted as 0."""
+    stats = UsageStats()
+    stats.record_call(Mock(spec=["input_tokens", "output_tokens"], input_tokens=10, output_tokens=5), 2.0)
+    stats.record_call(Mock(spec=["input_tokens", "output_tokens"], input_tokens=30, output_tokens=5), 4.0)
+
+    assert stats.cache_read_input_tokens == 0
+    assert stats.latency_per_call == 3.0
+    assert stats.max_latency == 4.0
+    assert stats.tokens_per_call == 25
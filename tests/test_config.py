@@ -83,3 +83,31 @@ POPPLER_PATH=/invalid/path/poppler
                 load_config()
 
             assert "Tesseract not found" in str(exc_info.value)
+
+
+def test_config_invalid_report_format():
+    """Test that an unknown REPORT_FORMATS entry raises ConfigError."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env_path = Path(temp_dir) / ".env"
+        env_path.write_text("")
+
+        env = {
+            "AZURE_TENANT_ID": "test-tenant",
+            "AZURE_CLIENT_ID": "test-client",
+            "AZURE_CLIENT_SECRET": "test-secret",
+            "MAILBOX_USER_ID": "test@example.com",
+            "SHAREPOINT_SITE_ID": "test-site",
+            "SHAREPOINT_DRIVE_ID": "test-drive",
+            "SHAREPOINT_FOLDER_PATH": "/test",
+            "TESSERACT_PATH": "/invalid/path/tesseract.exe",
+            "POPPLER_PATH": "/invalid/path/poppler",
+            "REPORT_FORMATS": "xlsx,json",
+        }
+
+        with patch.dict(os.environ, env), patch("src.config.Path") as mock_path:
+            mock_path.return_value.parent.parent = Path(temp_dir)
+
+            with pytest.raises(ConfigError) as exc_info:
+                load_config()
+
+            assert "Invalid REPORT_FORMATS entry: json" in str(exc_info.value)
@@ -0,0 +1,56 @@
+"""
+Tests for structured CSV extraction.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+from src.core import csv_extractor
+from src.core.csv_extractor import extract_structured_from_csv
+
+
+def test_csv_row_associations_across_chunks():
+    """Test semicolon CSV with preamble, decimal commas and several chunks."""
+    content = (
+        "Dobava: 15.01.2024\n"
+        "EAN koda;Naziv;Nabavna cena;MPC;Enota\n"
+        "12345670;Mleko;10,50;12.99;S01\n"
+        "20240115;Datum;1,00;2.00;S02\n"
+        "EAN: 1234567890128;Kruh;€ 1.234,50;;S03\n"
+    ).encode("cp1250")
+
+    with patch.object(csv_extractor, "CSV_CHUNK_ROWS", 1):
+        result = extract_structured_from_csv(content, "prices.csv")
+
+    assert result is not None
+    assert result.eans == ["12345670", "1234567890128"]
+    assert result.supplier_prices == {"12345670": 10.50, "1234567890128": 1234.50}
+    assert result.internal_prices == {"12345670": 12.99}
+    assert result.stores == {"12345670": "S01", "1234567890128": "S03"}
+    assert result.delivery_date == date(2024, 1, 15)
+
+
+def test_tsv_without_header_returns_none():
+    """Test that delimited text without a recognizable header is not structured."""
+    content = b"foo\tbar\n12345670\t10.50\n"
+
+    assert extract_structured_from_csv(content, "data.tsv") is None
+
+
+def test_csv_quoted_line_breaks_above_header():
+    """Test that multi-line quoted cells above the header do not shift data rows."""
+    content = (
+        'Opomba;"Dobava: 15.01.2024\nvse enote\nbrez popusta"\n'
+        "EAN;Cena\n"
+        "12345670;10,50\n"
+        "87654325;2,00\n"
+        "12345670;11,00\n"
+    ).encode("utf-8")
+
+    with patch.object(csv_extractor, "CSV_CHUNK_ROWS", 1):
+        result = extract_structured_from_csv(content, "prices.csv")
+
+    assert result is not None
+    assert result.eans == ["12345670", "87654325", "12345670"]
+    assert result.supplier_prices == {"12345670": 11.0, "87654325": 2.0}
+    assert result.delivery_date == date(2024, 1, 15)
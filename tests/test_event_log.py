@@ -0,0 +1,68 @@
+"""
+Tests for the JSON-lines event log.
+"""
+
+import json
+from datetime import datetime
+
+from src.core.models import EmailItem, EmailProcessResult, ErrorType, ProcessStatus
+from src.integrations.anthropic.cache import CacheStats
+from src.integrations.logging.event_log import EventLogWriter
+
+
+def _result(message_id: str, status: ProcessStatus, **kwargs) -> EmailProcessResult:
+    email = EmailItem(
+        message_id=message_id,
+        sender_address="test@example.com",
+        subject="Prices",
+        received_datetime=datetime(2024, 1, 15, 10, 0, 0),
+        body_html="<p>large body</p>",
+        body_text="large body",
+    )
+    return EmailProcessResult(email_item=email, status=status, **kwargs)
+
+
+def test_records_are_flushed_as_each_email_completes(tmp_path):
+    """Test that a partial log is readable before the run ends."""
+    run_timestamp = datetime(2024, 1, 15, 12, 0, 0)
+    path = tmp_path / "logs" / EventLogWriter.generate_filename(run_timestamp)
+    cache_stats = CacheStats(hits=2)
+
+    writer = EventLogWriter(str(path), run_timestamp, cache_stats)
+    cache_stats.hits += 1
+    writer.write_email(_result(
+        "msg-1", ProcessStatus.PROCESSED,
+        sources=["Attachment: prices.xlsx", "Email body"],
+        conflicts=["delivery_date: ..."],
+        timings={"merge": 0.01},
+    ))
+
+    # Still open: the record is already on disk
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert path.name == "Run_Log_20240115_120000.jsonl"
+    assert [line["event"] for line in lines] == ["run_start", "email"]
+    assert lines[1]["sources"] == ["Attachment: prices.xlsx", "Email body"]
+    assert lines[1]["claude_cache_hits"] == 1
+    assert lines[1]["timings"] == {"merge": 0.01}
+
+    failed = _result("msg-2", ProcessStatus.SKIPPED_TECHNICAL_ERROR, error_type=ErrorType.TECHNICAL)
+    with writer:
+        writer.write_email(failed)
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert lines[2]["error_type"] == "TECHNICAL"
+    assert lines[2]["claude_cache_hits"] == 0
+    assert lines[3]["event"] == "run_end"
+    assert lines[3]["completed"] is True
+    assert lines[3]["summary"]["PROCESSED"] == 1
+
+
+def test_release_keeps_counts():
+    """Test that released results drop rows and bodies but keep what the logs need."""
+    result = _result("msg-1", ProcessStatus.PROCESSED, cases=[object(), object()])
+    result.release()
+
+    assert result.cases == []
+    assert result.cases_extracted == 2
+    assert result.email_item.body_html is None
+    assert result.email_item.message_id == "msg-1"
@@ -0,0 +1,182 @@
+"""
+Tests for the Excel report writer.
+"""
+
+import csv
+from datetime import date
+from decimal import Decimal
+
+import openpyxl
+import pytest
+
+from src.core.models import CaseMetadata, CaseRow
+from src.integrations.excel.writer import ExcelWriter, ReportWriterError
+
+
+def _case(ean: str) -> CaseRow:
+    return CaseRow(
+        unit_store="S01",
+        ean_code=ean,
+        supplier_price=10.5,
+        internal_price=None,
+        meta=CaseMetadata(
+            document_creation_date=None,
+            delivery_date=date(2024, 1, 15),
+            order_creation_date=None,
+            supplier_name="ACME",
+            supplier_invoice_number=None,
+            email_sender_address="test@example.com",
+            email_link=None,
+            comments="Sources: body",
+        ),
+    )
+
+
+def test_streamed_report_layout(tmp_path):
+    """Test header order/styling and rows appended one by one."""
+    output = tmp_path / "report.xlsx"
+    writer = ExcelWriter()
+
+    with writer.open_stream(str(output)) as report:
+        report.append(_case("12345670"))
+        report.extend([_case("87654325")])
+
+    assert report.rows_written == 2
+
+    sheet = openpyxl.load_workbook(output).active
+    rows = list(sheet.iter_rows(values_only=True))
+
+    assert sheet.title == "Price Discrepancies"
+    assert list(rows[0]) == ExcelWriter.HEADERS
+    assert sheet.cell(row=1, column=1).font.bold is True
+    assert sheet.column_dimensions["L"].width == 20
+    assert rows[1] == (
+        "S01", "12345670", None, "2024-01-15", None, 10.5, None,
+        "ACME", None, "test@example.com", None, "Sources: body",
+    )
+    assert rows[2][1] == "87654325"
+
+
+def test_write_report_empty(tmp_path):
+    """Test that an empty report still has the header row."""
+    output = tmp_path / "empty.xlsx"
+    ExcelWriter().write_report([], str(output), date(2024, 1, 15), date(2024, 1, 15))
+
+    rows = list(openpyxl.load_workbook(output).active.iter_rows(values_only=True))
+    assert rows == [tuple(ExcelWriter.HEADERS)]
+
+
+def test_columnar_copies(tmp_path):
+    """Test CSV and Parquet copies with typed dates and prices."""
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    output = tmp_path / "report.xlsx"
+    with ExcelWriter().open_stream(str(output), ["xlsx", "csv", "parquet"]) as report:
+        report.append(_case("12345670"))
+
+    assert report.paths == {
+        "xlsx": str(output),
+        "csv": str(tmp_path / "report.csv"),
+        "parquet": str(tmp_path / "report.parquet"),
+    }
+
+    with open(report.paths["csv"], encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ExcelWriter.HEADERS
+    assert rows[1][:7] == ["S01", "12345670", "", "2024-01-15", "", "10.50", ""]
+
+    table = pq.read_table(report.paths["parquet"])
+    assert table.column_names == ExcelWriter.HEADERS
+    record = table.to_pylist()[0]
+    assert record["Delivery Date"] == date(2024, 1, 15)
+    assert record["Supplier Price"] == Decimal("10.50")
+    assert record["Internal (Own) Price"] is None
+
+
+def test_unknown_format_rejected(tmp_path):
+    """Test that an unknown output format raises ReportWriterError."""
+    with pytest.raises(ReportWriterError):
+        ExcelWriter().open_stream(str(tmp_path / "report.xlsx"), ["xlsx", "json"])
+
+
+def test_failed_sink_closes_opened_sinks(tmp_path, monkeypatch):
+    """Test that sinks opened before a failing one are closed before the error propagates."""
+    from src.integrations.excel import writer
+
+    closed = []
+
+    class RecordingCsvSink(writer._CsvSink):
+        def close(self):
+            super().close()
+            closed.append(self._file.closed)
+
+    class FailingSink:
+        def __init__(self, output_path, headers):
+            raise ReportWriterError("Parquet output requires pyarrow")
+
+    monkeypatch.setitem(writer.REPORT_SINKS, "csv", (".csv", RecordingCsvSink))
+    monkeypatch.setitem(writer.REPORT_SINKS, "parquet", (".parquet", FailingSink))
+
+    with pytest.raises(ReportWriterError):
+        ExcelWriter().open_stream(str(tmp_path / "report.xlsx"), ["xlsx", "csv", "parquet"])
+
+    assert closed == [True]
+
+
+def test_failed_sink_close_still_closes_the_others(tmp_path, monkeypatch):
+    """Test that one sink failing to save does not leave the later sinks open."""
+    from src.integrations.excel import writer
+
+    closed = []
+
+    class FailingXlsxSink(writer._XlsxSink):
+        def close(self):
+            super().close()
+            closed.append("xlsx")
+            raise OSError("disk full")
+
+    class RecordingCsvSink(writer._CsvSink):
+        def close(self):
+            super().close()
+            closed.append("csv")
+
+    monkeypatch.setitem(writer.REPORT_SINKS, "xlsx", (".xlsx", FailingXlsxSink))
+    monkeypatch.setitem(writer.REPORT_SINKS, "csv", (".csv", RecordingCsvSink))
+
+    stream = ExcelWriter().open_stream(str(tmp_path / "report.xlsx"), ["xlsx", "csv"])
+    stream.append(_case("12345670"))
+    with pytest.raises(OSError, match="disk full"):
+        stream.close()
+    stream.close()  # Not retried (e.g. by __exit__)
+
+    assert closed == ["xlsx", "csv"]
+    assert len((tmp_path / "report.csv").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_case_row_keyword_constructor_and_assignment():
+    """Test that rows can still be built and edited with the per-email columns."""
+    row = CaseRow(
+        unit_store="S01",
+        ean_code="12345670",
+        document_creation_date=None,
+        delivery_date=date(2024, 1, 15),
+        order_creation_date=None,
+        supplier_price=10.5,
+        internal_price=None,
+        supplier_name="ACME",
+        supplier_invoice_number=None,
+        email_sender_address="test@example.com",
+        email_link=None,
+        comments="Sources: body",
+    )
+    assert row == _case("12345670")
+
+    shared = _case("87654325")
+    other = CaseRow("S02", "1234567890128", supplier_price=None, internal_price=None, meta=shared.meta)
+    shared.comments = "Edited"
+
+    assert shared.comments == "Edited"
+    assert other.comments == "Sources: body"  # The other row keeps the shared metadata
+
+    with pytest.raises(TypeError):
+        CaseRow("S01", "12345670", delivery_date=date(2024, 1, 15), meta=shared.meta)
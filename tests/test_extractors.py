@@ -7,6 +7,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from src.core.excel_structured_extractor import extract_structured_from_excel
 from src.core.extractors import DataExtractor
 from src.core.models import DataSource, EmailAttachment, EmailItem
 
@@ -146,19 +147,13 @@ def test_extract_from_body_html_stripping(mock_ocr_pipeline, mock_config):
 
 
 @patch("src.core.extractors.OCRPipeline")
-@patch("src.core.extractors.ExcelParser")
-def test_extract_from_excel_attachment(mock_parser_class, mock_ocr_pipeline, mock_config):
-    """Test extracting from Excel attachment."""
+def test_extract_from_excel_attachment(mock_ocr_pipeline, mock_config):
+    """Test extracting from Excel attachment (no header row: plain-text fallback)."""
     # Mock OCR Pipeline
     mock_ocr = Mock()
     mock_ocr.get_combined_ocr_text.return_value = ""
     mock_ocr_pipeline.return_value = mock_ocr
 
-    # Mock ExcelParser
-    mock_parser = Mock()
-    mock_parser.extract_text_from_xlsx.return_value = "EAN: 12345670\nDelivery Date: 2024-01-15"
-    mock_parser_class.return_value = mock_parser
-
     email = EmailItem(
         message_id="test",
         sender_address="test@example.com",
@@ -170,7 +165,7 @@ def test_extract_from_excel_attachment(mock_parser_class, mock_ocr_pipeline, moc
             EmailAttachment(
                 filename="report.xlsx",
                 content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                content=b"fake-excel-data",
+                content=_build_xlsx([["EAN: 12345670"], ["Delivery Date: 2024-01-15"]]),
                 size=100,
             )
         ],
@@ -182,3 +177,206 @@ def test_extract_from_excel_attachment(mock_parser_class, mock_ocr_pipeline, moc
     assert len(results) >= 1
     assert results[0].source == DataSource.ATTACHMENT
     assert "12345670" in results[0].eans
+    assert results[0].delivery_date == date(2024, 1, 15)
+
+
+@patch("src.core.extractors.OCRPipeline")
+def test_structured_excel_enrichment_streams_workbook(mock_ocr_pipeline, mock_config):
+    """Test that enrichment text comes from read-only streaming, not a full workbook load."""
+    import openpyxl
+
+    load_workbook = openpyxl.load_workbook
+    read_only_flags = []
+
+    def tracking_load(*args, **kwargs):
+        read_only_flags.append(kwargs.get("read_only", False))
+        return load_workbook(*args, **kwargs)
+
+    email = EmailItem(
+        message_id="test",
+        sender_address="test@example.com",
+        subject="Test",
+        received_datetime=datetime.now(),
+        body_text="",
+        body_html=None,
+        attachments=[
+            EmailAttachment(
+                filename="prices.xlsx",
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                content=_build_xlsx([
+                    ["EAN", "Cena"],
+                    ["12345670", 10.5],
+                    ["12345670", 11.0],
+                    ["Delivery Date: 2024-01-15"],
+                ]),
+                size=100,
+            )
+        ],
+    )
+
+    with patch("openpyxl.load_workbook", side_effect=tracking_load):
+        results = DataExtractor(mock_config).extract_from_attachments(email)
+
+    assert results[0].eans == ["12345670", "12345670"]  # One entry (case) per row
+    assert results[0].supplier_prices == {"12345670": 11.0}
+    assert results[0].delivery_date == date(2024, 1, 15)  # From the row below the data
+    assert read_only_flags and all(read_only_flags)
+
+
+def _build_xlsx(rows):
+    """Build an in-memory XLSX file from a list of rows."""
+    import io
+
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_structured_excel_row_associations():
+    """Test header-based Excel extraction keeps EAN-price-store rows together."""
+    content = _build_xlsx([
+        ["Dobava: 15.01.2024"],
+        ["EAN koda", "Nabavna cena", "MPC", "Enota"],
+        ["12345670", "10,50", 12.99, "S01"],
+        ["20240115", "1,00", 2.00, "S02"],  # Date-like, rejected
+        ["EAN: 1234567890128", "€ 20.00", None, "S03"],
+    ])
+
+    result = extract_structured_from_excel(content, "prices.xlsx")
+
+    assert result is not None
+    assert result.eans == ["12345670", "1234567890128"]
+    assert result.supplier_prices == {"12345670": 10.50, "1234567890128": 20.00}
+    assert result.internal_prices == {"12345670": 12.99}
+    assert result.stores == {"12345670": "S01", "1234567890128": "S03"}
+    assert result.delivery_date == date(2024, 1, 15)
+
+
+def test_structured_excel_scans_all_sheets():
+    """Test that every sheet with a header contributes rows, across row batches."""
+    import io
+
+    import openpyxl
+
+    from src.core import excel_structured_extractor
+
+    workbook = openpyxl.Workbook()
+    notes = workbook.active
+    notes.append(["Notes only"])
+    first = workbook.create_sheet("Prices")
+    first.append(["EAN", "Cena"])
+    first.append(["12345670", 10.5])
+    second = workbook.create_sheet("More")
+    second.append(["Dobava: 15.01.2024"])
+    second.append(["EAN", "Cena"])
+    second.append(["87654325", 20.0])
+    second.append(["1234567890128", 30.0])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    with patch.object(excel_structured_extractor, "HEADER_SCAN_ROWS", 2), \
+            patch.object(excel_structured_extractor, "ROW_BATCH_SIZE", 1):
+        result = extract_structured_from_excel(buffer.getvalue(), "prices.xlsx")
+
+    assert result is not None
+    assert result.eans == ["12345670", "87654325", "1234567890128"]
+    assert result.supplier_prices == {"12345670": 10.5, "87654325": 20.0, "1234567890128": 30.0}
+    assert result.delivery_date == date(2024, 1, 15)
+
+
+@patch("src.core.extractors.OCRPipeline")
+def test_extract_from_legacy_excel_attachment(mock_ocr_pipeline, mock_config):
+    """Test that .xls attachments reach the structured extractor."""
+    pytest.importorskip("python_calamine")
+
+    email = EmailItem(
+        message_id="test",
+        sender_address="test@example.com",
+        subject="Test",
+        received_datetime=datetime.now(),
+        body_text="",
+        body_html=None,
+        attachments=[
+            EmailAttachment(
+                filename="export.xls",
+                content_type="application/vnd.ms-excel",
+                # Calamine detects the real format from the content
+                content=_build_xlsx([["EAN", "Cena"], [12345670, 10.5]]),
+                size=100,
+            )
+        ],
+    )
+
+    extractor = DataExtractor(mock_config)
+    results = extractor.extract_from_attachments(email)
+
+    assert len(results) == 1
+    assert results[0].eans == ["12345670"]
+    assert results[0].supplier_prices == {"12345670": 10.5}
+
+
+@patch("src.core.extractors.OCRPipeline")
+def test_extract_from_body_html_table(mock_ocr_pipeline, mock_config):
+    """Test row-level extraction from an HTML table in the body."""
+    email = EmailItem(
+        message_id="test",
+        sender_address="test@example.com",
+        subject="Test",
+        received_datetime=datetime.now(),
+        body_text=None,
+        body_html=(
+            "<p>Delivery: 2024-01-15</p>"
+            "<table><tr><th>Barcode</th><th>Our price</th><th>Cost price</th><th>Store</th></tr>"
+            "<tr><td>12345670</td><td>12,99</td><td>10,50</td><td>S01</td></tr>"
+            "<tr><td>87654325</td><td>25,00</td><td>20,00</td><td>S02</td></tr></table>"
+        ),
+    )
+
+    extractor = DataExtractor(mock_config)
+    result = extractor.extract_from_body(email)
+
+    assert result.source_details == "Email body (HTML table)"
+    assert result.eans == ["12345670", "87654325"]
+    assert result.supplier_prices == {"12345670": 10.50, "87654325": 20.00}
+    assert result.internal_prices == {"12345670": 12.99, "87654325": 25.00}
+    assert result.stores == {"12345670": "S01", "87654325": "S02"}
+    assert result.delivery_date == date(2024, 1, 15)
+
+
+@patch("src.core.extractors.OCRPipeline")
+def test_extract_from_body_html_uses_quoted_part_only_as_fallback(mock_ocr_pipeline, mock_config):
+    """Test that quoted history is ignored unless it is the only EAN source."""
+    reply = EmailItem(
+        message_id="test",
+        sender_address="test@example.com",
+        subject="RE: Test",
+        received_datetime=datetime.now(),
+        body_text=None,
+        body_html=(
+            "<p>Corrected: EAN 12345670 Price 10.50 EUR</p>"
+            "<blockquote><p>EAN 87654325 Price 20.00 EUR</p></blockquote>"
+        ),
+    )
+    forward = EmailItem(
+        message_id="test",
+        sender_address="test@example.com",
+        subject="FW: Test",
+        received_datetime=datetime.now(),
+        body_text=None,
+        body_html=(
+            "<p>Please check.</p>"
+            "<div id=\"divRplyFwdMsg\">From: supplier</div>"
+            "<p>EAN 87654325 Price 20.00 EUR</p>"
+        ),
+    )
+
+    extractor = DataExtractor(mock_config)
+
+    assert extractor.extract_from_body(reply).eans == ["12345670"]
+    assert extractor.extract_from_body(forward).eans == ["87654325"]
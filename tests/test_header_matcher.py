@@ -0,0 +1,56 @@
+"""
+Tests for shared table header matching.
+"""
+
+from src.core.header_matcher import HEADER_MATCHER, HeaderMatcher
+
+
+def test_map_columns_exact_headers():
+    """Test mapping of a Slovenian header row."""
+    column_map = HEADER_MATCHER.map_columns(
+        ["Šifra artikla", "EAN koda", "Naziv", "Nabavna cena", "MPC", "Enota"]
+    )
+
+    assert column_map["article_code"] == 0
+    assert column_map["ean"] == 1
+    assert column_map["article_name"] == 2
+    assert column_map["supplier_price"] == 3
+    assert column_map["internal_price"] == 4
+    assert column_map["store"] == 5
+
+
+def test_map_columns_prefers_best_score():
+    """Test that 'Prodajna cena' is not taken as supplier price via 'cena'."""
+    column_map = HEADER_MATCHER.map_columns(["EAN", "Prodajna cena", "Nabavna cena"])
+
+    assert column_map["internal_price"] == 1
+    assert column_map["supplier_price"] == 2
+
+
+def test_map_columns_partial_headers():
+    """Test variant-in-cell and cell-in-variant matches."""
+    column_map = HEADER_MATCHER.map_columns(["  Bar ", "Nabavna cena (EUR)", ""])
+
+    assert column_map == {"ean": 0, "supplier_price": 1}
+
+
+def test_find_header_row():
+    """Test header row detection and the minimum field requirement."""
+    rows = [
+        ["Dobavitelj: ACME"],
+        None,
+        ["EAN", "Cena"],
+        ["12345670", "10.50"],
+    ]
+
+    assert HEADER_MATCHER.find_header_row(rows) == (2, {"ean": 0, "supplier_price": 1})
+    assert HEADER_MATCHER.find_header_row([["EAN"]], min_fields=2) is None
+    assert HEADER_MATCHER.find_header_row([["EAN"]], min_fields=1) == (0, {"ean": 0})
+    assert HEADER_MATCHER.find_header_row(rows, scan_limit=2) is None
+
+
+def test_custom_mappings():
+    """Test a matcher compiled from custom vocabularies."""
+    matcher = HeaderMatcher({"ean": ["gtin"], "supplier_price": ["net"]})
+
+    assert matcher.map_columns(["GTIN-13", "Net"]) == {"ean": 0, "supplier_price": 1}
@@ -0,0 +1,62 @@
+"""
+Tests for streaming HTML body extraction.
+"""
+
+from src.utils.html import parse_html_body
+
+
+def test_parse_html_body_text_and_tables():
+    """Test that text and table rows come out of one pass."""
+    html = (
+        "<html><head><style>td {color: red}</style><script>var x = 1;</script></head>"
+        "<body><p>Delivery:&nbsp;2024-01-15</p>"
+        "<table><tr><th>EAN</th><th>Cena</th></tr>"
+        "<tr><td> 12345670 </td><td>10,50</td></tr></table>"
+        "<div>Supplier: <b>ACME</b></div></body></html>"
+    )
+    body = parse_html_body(html)
+
+    assert body.text == "Delivery: 2024-01-15\nEAN\tCena\n12345670\t10,50\nSupplier: ACME"
+    assert body.tables == [[["EAN", "Cena"], ["12345670", "10,50"]]]
+    assert body.quoted_skipped is False
+
+
+def test_parse_html_body_unclosed_cells():
+    """Test tolerance for omitted </td> and </tr> tags."""
+    body = parse_html_body("<table><tr><td>EAN<td>Cena<tr><td>12345670<td>10,50</table>")
+
+    assert body.tables == [[["EAN", "Cena"], ["12345670", "10,50"]]]
+
+
+def test_parse_html_body_skips_quoted_history():
+    """Test that Outlook and Gmail quoted history is left out."""
+    outlook = (
+        "<div>New EAN 12345670</div>"
+        "<div id=\"divRplyFwdMsg\">From: someone</div>"
+        "<div>Old EAN 87654325</div>"
+    )
+    body = parse_html_body(outlook)
+    assert body.text == "New EAN 12345670"
+    assert body.quoted_skipped is True
+
+    gmail = "<div>Reply</div><div class=\"gmail_quote\"><div>Old</div><div>text</div></div><p>Tail</p>"
+    assert parse_html_body(gmail).text == "Reply\nTail"
+
+    full = parse_html_body(outlook, skip_quoted=False)
+    assert "87654325" in full.text
+    assert full.quoted_skipped is False
+
+
+def test_parse_html_body_measures_full_text_in_the_same_pass():
+    """Test that the full text length matches a parse that keeps quoted history."""
+    html = (
+        "<table><tr><td>EAN</td><td>12345670</td></tr></table>"
+        "<blockquote><p>Old</p><table><tr><td>a</td><td>b</td></tr></table></blockquote>"
+        "<div id=\"appendonsend\"></div><div>From: someone</div>"
+    )
+    body = parse_html_body(html)
+
+    assert body.text == "EAN\t12345670"
+    assert body.tables == [[["EAN", "12345670"]]]
+    assert body.full_text_length == len(parse_html_body(html, skip_quoted=False).text)
+    assert body.full_text_length > len(body.text)
@@ -0,0 +1,77 @@
+"""
+Tests for Prometheus textfile metrics.
+"""
+
+from datetime import datetime
+
+from src.core.models import EmailItem, EmailProcessResult, ErrorType, ProcessStatus
+from src.integrations.graph.stats import GraphRequestStats
+from src.integrations.logging.metrics import MetricsRegistry, RunMetrics
+from src.utils.timing import Timings
+
+
+def _result(status: ProcessStatus, error_type=None) -> EmailProcessResult:
+    email = EmailItem(
+        message_id="msg-1",
+        sender_address="test@example.com",
+        subject="Prices",
+        received_datetime=datetime(2024, 1, 15, 10, 0, 0),
+        body_html=None,
+        body_text=None,
+    )
+    return EmailProcessResult(email_item=email, status=status, error_type=error_type)
+
+
+def _samples(path) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in path.read_text(encoding="utf-8").splitlines()
+        if not line.startswith("#")
+    }
+
+
+def test_run_metrics_accumulate_across_runs(tmp_path):
+    """Test counters and histograms continuing from the previous file, gauges replaced."""
+    path = tmp_path / "textfile" / "price_discrepancy.prom"
+    graph_stats = GraphRequestStats()
+    graph_stats.record("get_message", 200)
+    graph_stats.record("get_message", 429)
+    timings = Timings()
+    timings.add("ocr.image", 0.3)
+    timings.add("ocr.image", 2.0)
+    timings.add("upload", 0.8)
+
+    for _ in range(2):
+        metrics = RunMetrics()
+        metrics.record_run(
+            datetime(2024, 1, 15, 12, 0, 0),
+            [_result(ProcessStatus.PROCESSED), _result(ProcessStatus.SKIPPED_BUSINESS_ERROR, ErrorType.BUSINESS)],
+            cases_extracted=3,
+            timings=timings,
+            graph_stats=graph_stats,
+        )
+        metrics.write(str(path))
+
+    samples = _samples(path)
+    assert samples['price_discrepancy_emails_total{error_type="BUSINESS",status="SKIPPED_BUSINESS_ERROR"}'] == 2
+    assert samples["price_discrepancy_cases_extracted_total"] == 6
+    assert samples["price_discrepancy_ocr_images_total"] == 4
+    assert samples["price_discrepancy_ocr_seconds_total"] == 4.6
+    assert samples['price_discrepancy_graph_requests_total{operation="get_message",status="429"}'] == 2
+    assert samples['price_discrepancy_graph_throttled_total{operation="get_message"}'] == 2
+    assert samples['price_discrepancy_stage_seconds_bucket{stage="upload",le="1"}'] == 2
+    assert samples['price_discrepancy_stage_seconds_bucket{stage="upload",le="0.5"}'] == 0
+    assert samples['price_discrepancy_stage_seconds_count{stage="ocr.image"}'] == 4
+    assert samples["price_discrepancy_runs_total"] == 2
+    assert samples["price_discrepancy_last_run_timestamp_seconds"] == datetime(2024, 1, 15, 12).timestamp()
+
+    # Only the .prom file remains (temporary file renamed into place)
+    assert [p.name for p in path.parent.iterdir()] == ["price_discrepancy.prom"]
+
+
+def test_label_values_are_escaped():
+    """Test escaping of quotes, backslashes and newlines in label values."""
+    registry = MetricsRegistry(prefix="")
+    registry.counter("errors_total", "Errors.").inc(message='say "hi"\\\n')
+
+    assert 'errors_total{message="say \\"hi\\"\\\\\\n"} 1' in registry.render()
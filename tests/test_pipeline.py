@@ -15,7 +15,7 @@ from src.core.models import (
     ExtractedData,
     ProcessStatus,
 )
-from src.core.pipeline import generate_case_rows, process_single_email
+from src.core.pipeline import generate_case_rows, process_messages, process_single_email
 
 
 @pytest.fixture
@@ -115,7 +115,7 @@ def test_process_email_technical_error(mock_config):
     # Mock extractor to raise exception
     with patch("src.core.pipeline.DataExtractor") as mock_extractor_class:
         mock_extractor = Mock()
-        mock_extractor.extract_from_ocr.side_effect = Exception("OCR failed")
+        mock_extractor.start_ocr_extraction.side_effect = Exception("OCR failed")
         mock_extractor_class.return_value = mock_extractor
 
         result = process_single_email(email, mock_config, dry_run=True)
@@ -190,6 +190,8 @@ def test_generate_case_rows_multiple_eans():
     assert cases[1].ean_code == "87654325"
     assert cases[0].order_creation_date == date(2024, 1, 10)
     assert cases[1].order_creation_date == date(2024, 1, 10)  # Shared date
+    assert cases[0].meta is cases[1].meta  # Per-email metadata is not copied per row
+    assert not hasattr(cases[0], "__dict__")
 
 
 def test_generate_case_rows_no_eans():
@@ -258,3 +260,90 @@ def test_non_dry_run_mode(mock_config, sample_email):
     # In non-dry-run, marked_as_read should be True if processed successfully
     if result.status == ProcessStatus.PROCESSED:
         assert result.marked_as_read is True
+
+
+def test_report_write_failure_keeps_email_unread(mock_config, sample_email):
+    """Test that a failed report write yields one technical error and no mark-as-read."""
+    mail_client = Mock()
+    mail_client.get_email_item.return_value = sample_email
+    report = Mock()
+    report.extend.side_effect = OSError("disk full")
+
+    results = process_messages(mail_client, [{"id": "test-123", "subject": "Prices"}], mock_config, report=report)
+
+    assert len(results) == 1
+    assert results[0].status == ProcessStatus.SKIPPED_TECHNICAL_ERROR
+    assert "disk full" in results[0].error_message
+    assert results[0].cases_extracted == 0
+    mail_client.mark_as_read.assert_not_called()
+
+
+@patch("src.core.extractors.OCRPipeline")
+def test_failed_email_after_claude_batch_does_not_abort_others(mock_ocr_pipeline, mock_config):
+    """Test that an error while finishing a deferred email only affects that email."""
+    from src.core import pipeline
+    from src.integrations.anthropic.fallback import ClaudeBatchFallback
+
+    mock_ocr_pipeline.return_value.get_combined_ocr_text.return_value = "Delivery Date: 2024-01-15\nscan"
+    client = Mock()
+    client.run_batch.side_effect = lambda texts, **kwargs: {
+        custom_id: {"ean_codes": ["12345670"]} for custom_id in texts
+    }
+    mail_client = Mock()
+    mail_client.get_email_item.side_effect = lambda meta: EmailItem(
+        message_id=meta["id"],
+        sender_address="test@example.com",
+        subject="Scan",
+        received_datetime=datetime(2024, 1, 15),
+        body_html=None,
+        body_text=None,
+    )
+    finish_email = pipeline.finish_email
+
+    def failing_first(email, extraction, dry_run=False):
+        if email.message_id == "msg-0":
+            raise RuntimeError("merge bug")
+        return finish_email(email, extraction, dry_run)
+
+    with patch.object(pipeline, "finish_email", side_effect=failing_first):
+        results = process_messages(
+            mail_client,
+            [{"id": "msg-0", "subject": "Scan"}, {"id": "msg-1", "subject": "Scan"}],
+            mock_config,
+            claude_fallback=ClaudeBatchFallback(client),
+        )
+
+    assert results[0].status == ProcessStatus.SKIPPED_TECHNICAL_ERROR
+    assert "merge bug" in results[0].error_message
+    assert results[1].status == ProcessStatus.PROCESSED
+    mail_client.mark_as_read.assert_called_once_with("msg-1")
+
+
+def test_failed_run_releases_claude_resources_and_ends_event_log(mock_config, tmp_path):
+    """Test that a crash mid-run still shuts down the fallback, closes the cache and logs completed: false."""
+    import json
+
+    from src.core.pipeline import run_pipeline
+
+    mock_config.anthropic_api_key = "key"
+    mock_config.event_log_dir = str(tmp_path)
+    mock_config.report_mode = "run"
+    mock_config.report_formats = ["xlsx"]
+    cache = Mock()
+    fallback = Mock()
+
+    with patch("src.core.pipeline.GraphAuthClient"), \
+            patch("src.core.pipeline.GraphMailClient") as mail_client, \
+            patch("src.core.pipeline.ResponseCache.from_config", return_value=cache), \
+            patch("src.core.pipeline.build_claude_fallback", return_value=fallback), \
+            patch("src.core.pipeline.process_messages", side_effect=RuntimeError("boom")):
+        mail_client.return_value.list_unread_messages.return_value = []
+        with pytest.raises(RuntimeError):
+            run_pipeline(mock_config, date(2024, 1, 15), date(2024, 1, 15), dry_run=True)
+
+    fallback.shutdown.assert_called_once()
+    cache.close.assert_called_once()
+    (log_path,) = tmp_path.glob("*.jsonl")
+    last = json.loads(log_path.read_text(encoding="utf-8").splitlines()[-1])
+    assert last["event"] == "run_end"
+    assert last["completed"] is False
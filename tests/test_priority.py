@@ -4,7 +4,7 @@ Tests for priority merge module.
 
 from datetime import date
 
-from src.core.models import DataSource, ExtractedData
+from src.core.models import DataSource, ExtractedData, MergeConflict
 from src.core.priority import PriorityMerger
 
 
@@ -86,7 +86,10 @@ def test_priority_merge_dict_fields():
     # Attachment price should be present for 87654321
     assert merged.supplier_prices["87654321"] == 20.00
     # Should have conflict for 12345678
-    assert any("12345678" in c for c in conflicts)
+    assert conflicts == [
+        MergeConflict("supplier_prices", "12345678", "OCR", 10.50, "Excel", 15.00),
+    ]
+    assert str(conflicts[0]) == "supplier_prices[12345678]: 10.5 (from OCR) vs 15.0 (from Excel)"
 
 
 def test_priority_merge_empty_extractions():
@@ -97,3 +100,35 @@ def test_priority_merge_empty_extractions():
     assert merged.source == DataSource.BODY
     assert merged.eans == []
     assert len(conflicts) == 0
+
+
+def test_priority_merge_conflict_records():
+    """Test structured conflict records for scalar fields, grouped by field."""
+    ocr_data = ExtractedData(
+        source=DataSource.OCR,
+        source_details="OCR",
+        supplier_name="A",
+    )
+    body_data = ExtractedData(
+        source=DataSource.BODY,
+        source_details="Body",
+        delivery_date=date(2024, 1, 15),
+        supplier_name="B",
+    )
+    attachment_data = ExtractedData(
+        source=DataSource.ATTACHMENT,
+        source_details="Excel",
+        delivery_date=date(2024, 1, 20),
+        supplier_name="A",
+    )
+
+    merger = PriorityMerger()
+    merged, conflicts = merger.merge_all([body_data, ocr_data, attachment_data])
+
+    assert merged.source_details == "OCR, Excel, Body"
+    assert merged.delivery_date == date(2024, 1, 20)
+    assert conflicts == [
+        MergeConflict("delivery_date", None, "Excel", date(2024, 1, 20), "Body", date(2024, 1, 15)),
+        MergeConflict("supplier_name", None, "OCR", "A", "Body", "B"),
+    ]
+    assert str(conflicts[1]) == "Body: B (overridden by OCR)"
@@ -0,0 +1,48 @@
+"""
+Tests for the run profiler (CLI --profile).
+"""
+
+import pstats
+
+from src.utils.profiling import RunProfiler
+from src.utils.timing import Timings, recording, span
+
+
+def _busy(n: int) -> list[str]:
+    return [str(i) * 10 for i in range(n)]
+
+
+def test_profiler_writes_raw_profile_and_hotspots(tmp_path):
+    """Test raw profile, hotspot summary and memory readings at stage boundaries."""
+    kept = []
+    with RunProfiler(memory=True, top=10) as profiler:
+        with recording(Timings()):
+            with span("graph.list"):
+                pass
+            for _ in range(2):
+                with span("email"), span("ocr.image"):
+                    kept.append(_busy(20000))
+
+    assert [reading.stage for reading in profiler.readings] == ["graph.list", "email", "email", "end"]
+    assert profiler.readings[2].current > profiler.readings[0].current
+
+    raw_path, summary_path = profiler.write(str(tmp_path / "logs"))
+
+    assert raw_path.endswith(".prof") and "Run_Log_" in raw_path
+    assert any(name == "_busy" for _, _, name in pstats.Stats(raw_path).stats)
+
+    summary = (tmp_path / "logs" / summary_path.split("/")[-1]).read_text(encoding="utf-8")
+    assert "functions by cumulative time" in summary
+    assert "_busy" in summary
+    assert "Traced memory at stage boundaries" in summary
+    assert "allocation sites by growth" in summary
+
+
+def test_profiler_without_memory_tracing(tmp_path):
+    """Test that CPU-only profiling records no memory section."""
+    with RunProfiler() as profiler:
+        with recording(Timings()), span("email"):
+            _busy(100)
+
+    assert profiler.readings == []
+    assert "Traced memory" not in profiler.summary()
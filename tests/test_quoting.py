@@ -0,0 +1,122 @@
+"""
+Tests for quoted-reply trimming and email body reduction.
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from src.core.body_reduction import reduce_email_body
+from src.core.models import EmailItem
+from src.utils import html
+from src.utils.quoting import strip_quoted_text
+
+
+def _email(body_text=None, body_html=None, **kwargs) -> EmailItem:
+    return EmailItem(
+        message_id="test",
+        sender_address="test@example.com",
+        subject="Test",
+        received_datetime=datetime.now(),
+        body_html=body_html,
+        body_text=body_text,
+        **kwargs,
+    )
+
+
+def test_strip_outlook_reply_header():
+    """Test that an Outlook From/Sent block starts the quoted history."""
+    text = (
+        "EAN 12345670 Price: 10.50 EUR\n"
+        "\n"
+        "From: Supplier <s@example.com>\n"
+        "Sent: Monday, January 15, 2024 10:00\n"
+        "Subject: Prices\n"
+        "EAN 87654325 Price: 20.00 EUR"
+    )
+    stripped, removed = strip_quoted_text(text)
+
+    assert stripped == "EAN 12345670 Price: 10.50 EUR"
+    assert removed is True
+
+
+def test_strip_wrote_line_quoted_lines_and_signature():
+    """Test "On ... wrote:", "> " lines and closing phrases."""
+    text = (
+        "EAN 12345670 Price: 10.50 EUR\n"
+        "> EAN 11111115\n"
+        "Lep pozdrav,\n"
+        "Janez\n"
+        "On Mon, 15 Jan 2024 at 10:00, Supplier wrote:\n"
+        "EAN 87654325"
+    )
+    stripped, removed = strip_quoted_text(text)
+
+    assert stripped == "EAN 12345670 Price: 10.50 EUR"
+    assert removed is True
+
+
+def test_strip_keeps_closing_phrase_before_data():
+    """Test that a greeting followed by EANs is not treated as a signature."""
+    text = "Regards,\nEAN 12345670 Price: 10.50 EUR"
+    stripped, removed = strip_quoted_text(text)
+
+    assert stripped == text
+    assert removed is False
+
+
+def test_reduce_prefers_unique_body():
+    """Test that uniqueBody is used and the text volume drops."""
+    history = "\n".join(f"Old line {i} EAN 87654325" for i in range(50))
+    email = _email(
+        body_text=f"EAN 12345670 Price: 10.50 EUR\n{history}",
+        unique_body_text="EAN 12345670 Price: 10.50 EUR",
+    )
+    body = reduce_email_body(email)
+
+    assert body.source == "unique"
+    assert body.text == "EAN 12345670 Price: 10.50 EUR"
+    assert body.reduced_length < body.original_length
+    assert body.original_length == len(email.body_text)
+
+
+def test_reduce_measures_html_bodies_as_text():
+    """Test that both lengths count visible text, not HTML markup."""
+    email = _email(
+        body_html='<div style="font-family: Calibri">EAN 12345670 Price: 10.50 EUR</div>'
+                  '<blockquote><p>Old EAN 87654325</p></blockquote>',
+        unique_body_html='<div style="font-family: Calibri">EAN 12345670 Price: 10.50 EUR</div>',
+    )
+    body = reduce_email_body(email)
+
+    assert body.reduced_length == len("EAN 12345670 Price: 10.50 EUR")
+    assert body.reduced_length < body.original_length < len(email.body_html) - 40
+
+
+def test_reduce_falls_back_for_forwarded_lists():
+    """Test that a forward with EANs only in the quoted part keeps the full body."""
+    text = (
+        "FYI, see below.\n"
+        "---------- Forwarded message ---------\n"
+        "EAN 12345670 Price: 10.50 EUR"
+    )
+    body = reduce_email_body(_email(body_text=text))
+
+    assert body.source == "full"
+    assert "12345670" in body.text
+
+
+def test_reduce_without_body():
+    """Test that an email without a body yields None."""
+    assert reduce_email_body(_email()) is None
+
+
+def test_reduce_parses_html_only_body_once():
+    """Test that the full text length comes from the trimming pass, not a second parse."""
+    email = _email(body_html="<div>EAN 12345670</div><blockquote><p>Old EAN 87654325</p></blockquote>")
+
+    with patch("src.core.body_reduction.parse_html_body", wraps=html.parse_html_body) as parse:
+        body = reduce_email_body(email)
+
+    assert parse.call_count == 1
+    assert body.source == "trimmed"
+    assert body.original_length == len(html.parse_html_body(email.body_html, skip_quoted=False).text)
@@ -0,0 +1,103 @@
+"""
+Tests for the run log writer.
+"""
+
+import json
+from datetime import datetime
+
+from src.core.models import EmailItem, EmailProcessResult, ErrorType, ProcessStatus
+from src.integrations.anthropic.cache import CacheStats
+from src.integrations.logging.run_log import RunLogWriter
+from src.utils.timing import Timings
+
+
+def test_write_json(tmp_path):
+    """Test the machine-readable run log."""
+    email = EmailItem(
+        message_id="msg-1",
+        sender_address="test@example.com",
+        subject="Prices",
+        received_datetime=datetime(2024, 1, 15, 10, 0, 0),
+        body_html=None,
+        body_text=None,
+    )
+    results = [
+        EmailProcessResult(
+            email_item=email,
+            status=ProcessStatus.SKIPPED_BUSINESS_ERROR,
+            error_type=ErrorType.BUSINESS,
+            error_message="No dates",
+            body_chars=1200,
+            body_chars_extracted=300,
+        )
+    ]
+    run_timestamp = datetime(2024, 1, 15, 12, 0, 0)
+    output = tmp_path / RunLogWriter.generate_json_filename(run_timestamp)
+
+    RunLogWriter().write_json(results, str(output), run_timestamp)
+
+    document = json.loads(output.read_text(encoding="utf-8"))
+    assert output.name == "Run_Log_20240115_120000.json"
+    assert document["total_emails"] == 1
+    assert document["summary"][ProcessStatus.SKIPPED_BUSINESS_ERROR.value] == 1
+    assert document["emails"][0]["message_id"] == "msg-1"
+    assert document["emails"][0]["error_type"] == ErrorType.BUSINESS.value
+    assert document["emails"][0]["received"] == "2024-01-15T10:00:00"
+    assert document["emails"][0]["body_chars_extracted"] == 300
+    assert (document["body_chars"], document["body_chars_extracted"]) == (1200, 300)
+
+
+def test_logs_include_claude_cache_stats(tmp_path):
+    """Test that cache hits and savings are reported in both log formats."""
+    stats = CacheStats(hits=3, misses=1, latency_saved=4.25, input_tokens_saved=1200, output_tokens_saved=90)
+    run_timestamp = datetime(2024, 1, 15, 12, 0, 0)
+    writer = RunLogWriter()
+
+    writer.write_log([], str(tmp_path / "log.txt"), run_timestamp, stats)
+    writer.write_json([], str(tmp_path / "log.json"), run_timestamp, stats)
+
+    text = (tmp_path / "log.txt").read_text(encoding="utf-8")
+    assert "Hits: 3" in text
+    assert "Tokens saved: 1200 input, 90 output" in text
+    document = json.loads((tmp_path / "log.json").read_text(encoding="utf-8"))
+    assert document["claude_cache"]["hits"] == 3
+    assert document["claude_cache"]["latency_saved"] == 4.25
+
+
+def test_logs_and_profile_include_stage_timings(tmp_path):
+    """Test per-email and aggregate stage timings in the logs and the profile."""
+    email = EmailItem(
+        message_id="msg-1",
+        sender_address="test@example.com",
+        subject="Prices",
+        received_datetime=datetime(2024, 1, 15, 10, 0, 0),
+        body_html=None,
+        body_text=None,
+    )
+    results = [
+        EmailProcessResult(
+            email_item=email,
+            status=ProcessStatus.PROCESSED,
+            timings={"graph.fetch": 0.25, "ocr.image": 1.5},
+        )
+    ]
+    timings = Timings()
+    timings.add("graph.fetch", 0.25)
+    timings.add("ocr.image", 0.5)
+    timings.add("ocr.image", 1.0)
+    run_timestamp = datetime(2024, 1, 15, 12, 0, 0)
+    writer = RunLogWriter()
+
+    writer.write_log(results, str(tmp_path / "log.txt"), run_timestamp, timings=timings)
+    writer.write_json(results, str(tmp_path / "log.json"), run_timestamp, timings=timings)
+    profile = tmp_path / writer.generate_profile_filename(run_timestamp)
+    writer.write_profile(results, str(profile), run_timestamp, timings)
+
+    text = (tmp_path / "log.txt").read_text(encoding="utf-8")
+    assert "Stage timings (seconds):" in text
+    assert "Timings (s): graph.fetch 0.250, ocr.image 1.500" in text
+    document = json.loads((tmp_path / "log.json").read_text(encoding="utf-8"))
+    assert document["timings"]["ocr.image"] == {"count": 2, "total": 1.5, "p50": 0.5, "p95": 1.0, "max": 1.0}
+    assert document["emails"][0]["timings"]["ocr.image"] == 1.5
+    assert profile.name == "Run_Profile_20240115_120000.json"
+    assert json.loads(profile.read_text(encoding="utf-8"))["stages"]["graph.fetch"]["count"] == 1
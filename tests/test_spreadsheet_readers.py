@@ -0,0 +1,67 @@
+"""
+Tests for spreadsheet readers.
+"""
+
+import io
+
+import openpyxl
+import pytest
+
+from src.integrations.excel.readers import (
+    CalamineReader,
+    CsvReader,
+    OpenpyxlReader,
+    SpreadsheetReaderError,
+    get_spreadsheet_reader,
+    sniff_csv_format,
+)
+
+
+def _xlsx_bytes(rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_get_spreadsheet_reader_routing():
+    """Test that the extension wins over the content type."""
+    assert isinstance(get_spreadsheet_reader("a.xlsx"), OpenpyxlReader)
+    assert isinstance(get_spreadsheet_reader("a.XLS"), CalamineReader)
+    assert isinstance(get_spreadsheet_reader("a.xlsb"), CalamineReader)
+    assert isinstance(get_spreadsheet_reader("a.ods"), CalamineReader)
+    assert isinstance(get_spreadsheet_reader("a.csv", "application/vnd.ms-excel"), CsvReader)
+    assert isinstance(get_spreadsheet_reader("noext", "application/vnd.ms-excel"), CalamineReader)
+    assert get_spreadsheet_reader("a.pdf", "application/pdf") is None
+
+
+def test_calamine_reader_normalizes_values():
+    """Test that calamine cells look like openpyxl cells."""
+    pytest.importorskip("python_calamine")
+
+    content = _xlsx_bytes([["EAN", "Cena"], [12345670, 10.5], ["87654325", None]])
+    sheets = list(CalamineReader().iter_sheets(content))
+
+    assert len(sheets) == 1
+    name, rows = sheets[0]
+    assert name == "Sheet"
+    assert list(rows) == [("EAN", "Cena"), (12345670, 10.5), ("87654325", None)]
+
+
+def test_csv_reader_sniffs_dialect_and_encoding():
+    """Test semicolon-separated cp1250 content."""
+    content = "EAN;Količina;Cena\n12345670;2;10,50\n".encode("cp1250")
+
+    assert sniff_csv_format(content)[0] == "cp1250"
+
+    (name, rows), = CsvReader().iter_sheets(content)
+    assert list(rows) == [("EAN", "Količina", "Cena"), ("12345670", "2", "10,50")]
+
+
+def test_reader_error_on_invalid_content():
+    """Test that unreadable content raises SpreadsheetReaderError."""
+    with pytest.raises(SpreadsheetReaderError):
+        list(OpenpyxlReader().iter_sheets(b"not a workbook"))
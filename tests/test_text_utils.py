@@ -3,14 +3,21 @@ Tests for text extraction utilities.
 """
 
 from datetime import date
+from unittest.mock import patch
 
 from src.utils.text import (
+    associate_by_position,
     extract_dates,
     extract_eans,
     extract_invoice_numbers,
     extract_prices,
+    EXTENDED_DATE_ROLE_KEYWORDS,
     find_date_by_keyword,
+    find_dates_by_role,
     is_valid_ean,
+    scan_scope,
+    scan_text,
+    validate_ean_batch,
 )
 
 
@@ -71,6 +78,23 @@ def test_find_date_by_keyword():
     assert no_date is None
 
 
+def test_find_dates_by_role():
+    """Test resolving all date roles from the shared anchor index."""
+    text = "Order: 2024-01-10\nDelivery: 15.01.2024\nCreated 12 Jan 2024"
+    dates = find_dates_by_role(text)
+    assert dates == {
+        "delivery": date(2024, 1, 15),
+        "order": date(2024, 1, 10),
+        "document": date(2024, 1, 12),
+    }
+
+    slovenian = "Datum dokumenta: 01.02.2024\nDostava: 05.02.2024\nNaročilo: 31.02.2024"
+    dates = find_dates_by_role(slovenian, EXTENDED_DATE_ROLE_KEYWORDS)
+    assert dates["delivery"] == date(2024, 2, 5)
+    assert dates["document"] == date(2024, 2, 1)
+    assert dates["order"] is None  # Invalid calendar date
+
+
 def test_is_valid_ean_checksum():
     """Test EAN checksum validation."""
     # Valid EAN-8
@@ -106,6 +130,19 @@ def test_is_valid_ean_filters_obvious_non_eans():
     assert is_valid_ean("9999999999999") is False
 
 
+def test_validate_ean_batch_matches_scalar():
+    """Test that batch validation agrees with is_valid_ean element-wise."""
+    codes = [
+        "12345670", "1234567890128", "12345678", "1234567890123",
+        "20240115", "15012024", "11111111", "9999999999999",
+        "123", "1234abcd", "", None,
+    ]
+    mask = validate_ean_batch(codes)
+
+    assert mask.tolist() == [code is not None and is_valid_ean(code) for code in codes]
+    assert mask.tolist()[:2] == [True, True]
+
+
 def test_extract_eans_filters_invalid():
     """Test that extract_eans filters out invalid EANs."""
     # Mix of valid and invalid: 12345670 is valid, 20240115 is a date, 99999999 has bad checksum
@@ -114,3 +151,75 @@ def test_extract_eans_filters_invalid():
     assert "12345670" in eans
     assert "20240115" not in eans  # date-like
     assert "99999999" not in eans  # all same digits
+
+
+def test_scan_text_tokens_with_positions():
+    """Test that the scanner emits all token kinds with their offsets."""
+    text = "Supplier: Acme d.o.o.\nInvoice: INV-7\nStore: S01 EAN 12345670 Price 10.50 EUR\nDate: 2024-01-15"
+    scan = scan_text(text)
+
+    assert [t.value for t in scan.eans] == ["12345670"]
+    ean = scan.eans[0]
+    assert text[ean.start:ean.end] == "12345670"
+
+    assert [t.value for t in scan.prices] == [10.50]
+    assert text[scan.prices[0].start:scan.prices[0].end] == "10.50"
+
+    assert [t.value for t in scan.dates] == [date(2024, 1, 15)]
+    assert [t.value for t in scan.invoices] == ["INV-7"]
+    assert [t.value for t in scan.stores] == ["S01"]
+    assert [t.value for t in scan.suppliers] == ["Acme d.o.o."]
+
+
+def test_scan_text_is_shared_by_extractors():
+    """Test that repeated extract_* calls on the same text reuse one scan within a scope only."""
+    text = "EAN 12345670 costs 10.50 EUR, store: S01"
+
+    with scan_scope():
+        scan = scan_text(text)
+        assert scan_text(text) is scan
+        assert extract_eans(text) == ["12345670"]
+        assert extract_prices(text) == [10.50]
+
+    # Nothing is kept once the scope (email) ends
+    assert scan_text(text) is not scan
+
+
+def test_scan_text_runs_only_the_patterns_read():
+    """Test that a caller needing one field does not scan for the others."""
+    with patch("src.utils.text._price_tokens") as price_tokens, \
+            patch("src.utils.text._date_tokens") as date_tokens:
+        assert extract_eans("EAN 12345670 costs 10.50 EUR on 2024-01-15") == ["12345670"]
+
+    price_tokens.assert_not_called()
+    date_tokens.assert_not_called()
+
+
+def test_extract_eans_keeps_text_order():
+    """Test that extracted EANs are unique and in order of appearance."""
+    text = "1234567890128 12345670 1234567890128 87654325"
+    assert extract_eans(text) == ["1234567890128", "12345670", "87654325"]
+
+
+def test_associate_by_position_same_line():
+    """Test that prices link to the EAN on the same line, not by list index."""
+    text = (
+        "EAN 12345670 no price here\n"
+        "EAN 87654325 Price: 20.00 EUR\n"
+        "Price: 10.50 EUR for 1234567890128"
+    )
+    scan = scan_text(text)
+    prices = associate_by_position(scan, scan.valid_eans, scan.prices)
+
+    assert "12345670" not in prices
+    assert prices["87654325"] == 20.00
+    assert prices["1234567890128"] == 10.50
+
+
+def test_associate_by_position_vertical_layout():
+    """Test that a value on a following line belongs to the EAN above it."""
+    text = "EAN: 12345670\nPrice: 10.50 EUR\nEAN: 87654325\nPrice: 20.00 EUR"
+    scan = scan_text(text)
+    prices = associate_by_position(scan, scan.valid_eans, scan.prices)
+
+    assert prices == {"12345670": 10.50, "87654325": 20.00}
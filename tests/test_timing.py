@@ -0,0 +1,46 @@
+"""
+Tests for timing spans.
+"""
+
+from unittest.mock import patch
+
+from src.utils.timing import Timings, percentile, recording, span
+
+
+def test_spans_record_into_active_timings_only():
+    """Test that spans go to the innermost recording and are no-ops without one."""
+    run, email = Timings(), Timings()
+
+    with span("ignored"):
+        pass
+
+    with recording(run):
+        with span("graph.list"):
+            pass
+        with recording(email):
+            with span("ocr.image"):
+                pass
+        with span("upload"):
+            pass
+
+    assert set(run.samples) == {"graph.list", "upload"}
+    assert set(email.samples) == {"ocr.image"}
+
+    run.merge(email)
+    assert set(run.totals()) == {"graph.list", "upload", "ocr.image"}
+
+
+def test_summary_percentiles():
+    """Test count, total, p50, p95 and max per stage."""
+    timings = Timings()
+    for seconds in range(1, 21):
+        timings.add("ocr.image", float(seconds))
+
+    stage = timings.summary()["ocr.image"]
+    assert (stage.count, stage.total, stage.p50, stage.p95, stage.max) == (20, 210.0, 10.0, 19.0, 20.0)
+    assert percentile([3.0], 0.95) == 3.0
+
+    with patch("src.utils.timing.time.perf_counter", side_effect=[1.0, 3.5]):
+        with timings.span("merge"):
+            pass
+    assert timings.totals()["merge"] == 2.5